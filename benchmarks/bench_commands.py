@@ -0,0 +1,91 @@
+"""
+Command construction and subprocess overhead benchmarks.
+"""
+
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
+from benchmarks.harness import BenchmarkRunner
+from src.gcp_test_client import gcp_client
+from src.gcp_test_client.gcp_client import GcpStorage
+from src.helpers.base_helpers import GCLOUD_EXECUTABLE_ENV, run_subprocess
+from src.helpers.data_helper import GCPCommandResponse
+
+_EMPTY_RESPONSE = GCPCommandResponse(status_code=0, output="", error="")
+
+
+@contextmanager
+def _construction_only() -> Iterator[None]:
+    """Build commands without running them."""
+    original = gcp_client.run_subprocess
+    gcp_client.run_subprocess = lambda cmd: _EMPTY_RESPONSE
+    try:
+        yield
+    finally:
+        gcp_client.run_subprocess = original
+
+
+@contextmanager
+def _stub_executable() -> Iterator[None]:
+    """Point gcloud at a no-op script, leaving only process overhead."""
+    previous = os.environ.get(GCLOUD_EXECUTABLE_ENV)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        script = os.path.join(temp_dir, "gcloud")
+        with open(script, "w") as script_file:
+            script_file.write("#!/bin/sh\nexit 0\n")
+        os.chmod(script, os.stat(script).st_mode | stat.S_IXUSR)
+        os.environ[GCLOUD_EXECUTABLE_ENV] = script
+        try:
+            yield
+        finally:
+            if previous is None:
+                os.environ.pop(GCLOUD_EXECUTABLE_ENV, None)
+            else:
+                os.environ[GCLOUD_EXECUTABLE_ENV] = previous
+
+
+def register(runner: BenchmarkRunner) -> None:
+    with _construction_only():
+        runner.bench(
+            "commands/build/delete_object",
+            lambda: GcpStorage.delete_object(
+                "bench-bucket",
+                "dir/object.txt",
+                project="bench-project",
+                additional_headers={"x-goog-meta-a": "1", "x-goog-meta-b": "2"},
+                recursive=True,
+                if_generation_match="123",
+            ),
+        )
+        runner.bench(
+            "commands/build/cat_file_from_url",
+            lambda: GcpStorage.cat_file_from_url(
+                [f"gs://bench-bucket/file-{i}.txt" for i in range(10)],
+                additional_headers={"x-goog-meta-a": "1"},
+                display_url=True,
+                range_value="0-1023",
+            ),
+        )
+        runner.bench(
+            "commands/build/sign_url",
+            lambda: GcpStorage.sign_url(
+                "gs://bench-bucket/object.txt",
+                "bench-project",
+                "sa@bench-project.iam.gserviceaccount.com",
+                region="us-central1",
+            ),
+        )
+        runner.bench(
+            "commands/build/create_bucket",
+            lambda: GcpStorage.create_bucket(
+                "bench-bucket", "bench-project", "us-central1", "STANDARD"
+            ),
+        )
+    with _stub_executable():
+        runner.bench(
+            "commands/run_subprocess/noop",
+            lambda: run_subprocess(["gcloud", "storage", "ls", "gs://bench-bucket"]),
+        )
@@ -0,0 +1,81 @@
+"""
+End-to-end GcpStorage method benchmarks against the local gcloud stand-in.
+"""
+
+import os
+import tempfile
+
+from benchmarks.harness import BenchmarkRunner
+from src.gcp_test_client.gcp_client import GcpStorage
+from src.stand_in.backend import StandInBackend
+
+PROJECT = "bench-project"
+BUCKET = "bench-bucket"
+OBJECT = "object.txt"
+OBJECT_URL = f"gs://{BUCKET}/{OBJECT}"
+SERVICE_ACCOUNT = f"bench@{PROJECT}.iam.gserviceaccount.com"
+OBJECT_SIZE = 64 * 1024
+
+
+def _checked(response):
+    assert response.status_code == 0, response.error
+    return response
+
+
+def register(runner: BenchmarkRunner) -> None:
+    backend = StandInBackend()
+    try:
+        with backend.activate(), tempfile.TemporaryDirectory() as temp_dir:
+            local_file = os.path.join(temp_dir, OBJECT)
+            with open(local_file, "w") as sample:
+                sample.write("x" * OBJECT_SIZE)
+            _checked(GcpStorage.create_gcp_project(PROJECT))
+            _checked(GcpStorage.create_bucket(BUCKET, PROJECT))
+
+            def upload():
+                _checked(GcpStorage.copy_file_to_bucket(local_file, BUCKET, OBJECT))
+
+            upload()
+            runner.bench("methods/copy_file_to_bucket", upload, size=OBJECT_SIZE)
+            runner.bench(
+                "methods/cat_file_from_url",
+                lambda: _checked(GcpStorage.cat_file_from_url(OBJECT_URL)),
+                size=OBJECT_SIZE,
+            )
+            runner.bench(
+                "methods/cat_file_from_url/range",
+                lambda: _checked(
+                    GcpStorage.cat_file_from_url(OBJECT_URL, range_value="0-1023")
+                ),
+            )
+            runner.bench(
+                "methods/check_file_in_bucket",
+                lambda: _checked(GcpStorage.check_file_in_bucket(BUCKET, OBJECT)),
+            )
+            runner.bench(
+                "methods/describe_object",
+                lambda: _checked(GcpStorage.describe_object(OBJECT_URL)),
+            )
+            runner.bench(
+                "methods/describe_bucket",
+                lambda: _checked(GcpStorage.describe_bucket(f"gs://{BUCKET}")),
+            )
+            runner.bench(
+                "methods/list_buckets",
+                lambda: _checked(GcpStorage.list_buckets(PROJECT)),
+            )
+            runner.bench(
+                "methods/sign_url",
+                lambda: _checked(
+                    GcpStorage.sign_url(
+                        OBJECT_URL, PROJECT, SERVICE_ACCOUNT, region="us-central1"
+                    )
+                ),
+            )
+            runner.bench(
+                "methods/delete_object",
+                lambda: _checked(GcpStorage.delete_object(BUCKET, OBJECT)),
+                setup=upload,
+            )
+    finally:
+        backend.cleanup()
@@ -0,0 +1,68 @@
+"""
+Output parser benchmarks on synthetic gcloud output of growing size.
+"""
+
+from benchmarks.harness import BenchmarkRunner
+from src.helpers.data_helper import extract_bucket_ids, extract_ids, extract_url
+
+RECORD_COUNTS = (10, 100, 1_000, 10_000, 100_000)
+
+
+def projects_table(records: int) -> str:
+    header = "PROJECT_ID                NAME                PROJECT_NUMBER"
+    rows = (
+        f"bench-project-{i:06d}     Bench project {i:<6d} {100000000000 + i}"
+        for i in range(records)
+    )
+    return "\n".join([header, *rows]) + "\n"
+
+
+def buckets_yaml(records: int) -> str:
+    documents = (
+        f"creation_time: 2024-01-01T00:00:00+0000\n"
+        f"default_storage_class: STANDARD\n"
+        f"location: US-CENTRAL1\n"
+        f"name: bench-bucket-{i:06d}\n"
+        f"storage_url: gs://bench-bucket-{i:06d}/\n"
+        for i in range(records)
+    )
+    return "---\n".join(documents)
+
+
+def sign_url_output(records: int) -> str:
+    """`records` lines of noise followed by the signed URL."""
+    noise = (f"WARNING: noisy line {i} of gcloud output" for i in range(records))
+    url = (
+        "https://storage.googleapis.com/bench-bucket/object.txt"
+        "?X-Goog-Algorithm=GOOG4-RSA-SHA256&X-Goog-Signature=" + "ab" * 256
+    )
+    signed = [
+        "---",
+        "expiration: 2024-01-01 01:00:00",
+        "http_verb: GET",
+        "resource: gs://bench-bucket/object.txt",
+        f"signed_url: {url}",
+    ]
+    return "\n".join([*noise, *signed])
+
+
+def register(runner: BenchmarkRunner) -> None:
+    for records in RECORD_COUNTS:
+        output = projects_table(records)
+        runner.bench(
+            f"parsers/extract_ids/{records}",
+            lambda: extract_ids(output),
+            records=records,
+        )
+        output = buckets_yaml(records)
+        runner.bench(
+            f"parsers/extract_bucket_ids/{records}",
+            lambda: extract_bucket_ids(output),
+            records=records,
+        )
+        output = sign_url_output(records)
+        runner.bench(
+            f"parsers/extract_url/{records}",
+            lambda: extract_url(output),
+            records=records,
+        )
@@ -0,0 +1,165 @@
+"""
+Minimal benchmark harness.
+
+Each benchmark is warmed up, then timed until a minimum measuring time or
+iteration count is reached. The harness calibrates the cost of timing an
+empty call and subtracts it from every sample, so very fast benchmarks
+report the work itself rather than timer overhead.
+"""
+
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from src.helpers.command_metrics import percentile
+
+DEFAULT_WARMUP = 3
+DEFAULT_MIN_TIME = 0.5
+DEFAULT_MIN_ITERATIONS = 5
+DEFAULT_MAX_ITERATIONS = 100_000
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Overhead-corrected timing statistics of one benchmark, in seconds.
+    """
+
+    name: str
+    iterations: int
+    min: float
+    median: float
+    mean: float
+    stdev: float
+    p95: float
+    params: Dict[str, object] = field(default_factory=dict)
+
+    @classmethod
+    def from_samples(
+        cls, name: str, samples: List[float], params: Dict[str, object]
+    ) -> "BenchmarkResult":
+        ordered = sorted(samples)
+        return cls(
+            name=name,
+            iterations=len(ordered),
+            min=ordered[0],
+            median=statistics.median(ordered),
+            mean=statistics.mean(ordered),
+            stdev=statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+            p95=percentile(ordered, 95),
+            params=params,
+        )
+
+
+def _time_call(func: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def calibrate_overhead(rounds: int = 10_000) -> float:
+    """Median cost of timing an empty call."""
+    return statistics.median(_time_call(lambda: None) for _ in range(rounds))
+
+
+class BenchmarkRunner:
+    """
+    Runs benchmarks and collects their results.
+    """
+
+    def __init__(
+        self,
+        warmup: int = DEFAULT_WARMUP,
+        min_time: float = DEFAULT_MIN_TIME,
+        min_iterations: int = DEFAULT_MIN_ITERATIONS,
+        max_iterations: int = DEFAULT_MAX_ITERATIONS,
+        name_filter: Optional[str] = None,
+    ):
+        self.warmup = warmup
+        self.min_time = min_time
+        self.min_iterations = min_iterations
+        self.max_iterations = max_iterations
+        self.name_filter = name_filter
+        self.overhead = calibrate_overhead()
+        self.results: List[BenchmarkResult] = []
+
+    def bench(
+        self,
+        name: str,
+        func: Callable[[], object],
+        setup: Optional[Callable[[], object]] = None,
+        **params,
+    ) -> Optional[BenchmarkResult]:
+        """
+        Time `func`; `setup` runs untimed before every call.
+        """
+        if self.name_filter and self.name_filter not in name:
+            return None
+        for _ in range(self.warmup):
+            if setup:
+                setup()
+            func()
+        samples = []
+        deadline = time.perf_counter() + self.min_time
+        while len(samples) < self.max_iterations and (
+            len(samples) < self.min_iterations or time.perf_counter() < deadline
+        ):
+            if setup:
+                setup()
+            samples.append(max(_time_call(func) - self.overhead, 0.0))
+        result = BenchmarkResult.from_samples(name, samples, params)
+        self.results.append(result)
+        print(format_result(result), flush=True)
+        return result
+
+    def to_json(self) -> dict:
+        return {
+            "meta": {
+                "timestamp": time.time(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "timer_overhead": self.overhead,
+            },
+            "results": [asdict(result) for result in self.results],
+        }
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def format_result(result: BenchmarkResult) -> str:
+    return (
+        f"{result.name:<56} median {_format_seconds(result.median):>10}  "
+        f"p95 {_format_seconds(result.p95):>10}  n={result.iterations}"
+    )
+
+
+def load_results(path: str) -> Dict[str, dict]:
+    with open(path) as results_file:
+        return {result["name"]: result for result in json.load(results_file)["results"]}
+
+
+def compare_results(
+    results: List[BenchmarkResult], baseline: Dict[str, dict], threshold: float
+) -> List[str]:
+    """Describe benchmarks whose median is slower than baseline by > threshold."""
+    slower = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if not previous or previous["median"] <= 0:
+            continue
+        ratio = result.median / previous["median"]
+        if ratio > 1 + threshold:
+            slower.append(
+                f"{result.name}: {_format_seconds(previous['median'])} -> "
+                f"{_format_seconds(result.median)} (x{ratio:.2f})"
+            )
+    return slower
@@ -0,0 +1,83 @@
+"""
+Run the microbenchmark suites.
+
+    python -m benchmarks.run [--suite commands|parsers|methods] [--json PATH]
+                             [--baseline PATH] [--threshold 0.1] [--fail]
+"""
+
+import argparse
+import importlib
+import json
+import sys
+from typing import List, Optional
+
+from benchmarks.harness import (
+    DEFAULT_MIN_TIME,
+    DEFAULT_WARMUP,
+    BenchmarkRunner,
+    compare_results,
+    load_results,
+)
+
+SUITES = {
+    "commands": "benchmarks.bench_commands",
+    "parsers": "benchmarks.bench_parsers",
+    "methods": "benchmarks.bench_methods",
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=sorted(SUITES),
+        help="Suite to run; may be repeated (default: all).",
+    )
+    parser.add_argument("-k", dest="name_filter", help="Only run matching names.")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=DEFAULT_MIN_TIME,
+        help="Minimum measuring time per benchmark, in seconds.",
+    )
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON.")
+    parser.add_argument(
+        "--baseline", metavar="PATH", help="Compare medians with a previous JSON."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative median slowdown reported as a regression.",
+    )
+    parser.add_argument(
+        "--fail", action="store_true", help="Exit with 1 on regressions."
+    )
+    args = parser.parse_args(argv)
+
+    runner = BenchmarkRunner(
+        warmup=args.warmup, min_time=args.min_time, name_filter=args.name_filter
+    )
+    for suite in args.suite or SUITES:
+        importlib.import_module(SUITES[suite]).register(runner)
+
+    if args.json:
+        with open(args.json, "w") as results_file:
+            json.dump(runner.to_json(), results_file, indent=2)
+
+    if args.baseline:
+        slower = compare_results(
+            runner.results, load_results(args.baseline), args.threshold
+        )
+        print(f"\n{len(slower)} benchmark(s) slower than baseline", flush=True)
+        for line in slower:
+            print(f"  {line}")
+        if slower and args.fail:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,420 @@
+"""
+Throughput matrix for `gcloud storage cp` (uploads) and `cat` (downloads).
+
+Every combination of object size, object count, client-side parallelism
+(concurrent gcloud processes), gcloud's own process/thread counts and the
+parallel composite upload threshold is uploaded and read back, and reported
+as MB/s and objects/s:
+
+    python -m benchmarks.throughput [--sizes 4KiB,1MiB,16MiB] [--counts 1,16]
+        [--parallel 1,4] [--gcloud-parallelism default,4x8]
+        [--composite-thresholds off,150M] [--repeat 3] [--gcs]
+        [--json PATH] [--baseline PATH] [--threshold 0.1] [--fail]
+
+The matrix runs against the local stand-in unless --gcs is given, in which
+case it uses the configured bucket. The stand-in ignores gcloud's
+process/thread and composite upload settings, so those dimensions only
+matter against GCS.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import secrets
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from itertools import product
+from typing import Dict, Iterator, List, Optional
+
+from src.gcp_test_client.gcp_client import GcpStorage
+from src.helpers.command_metrics import percentile
+from src.helpers.config_helper import get_settings
+from src.helpers.data_helper import GCPCommandError
+from src.helpers.large_object_generator import SeededObject
+from src.stand_in.backend import StandInBackend
+
+UPLOAD = "upload"
+DOWNLOAD = "download"
+DEFAULT_GCLOUD_PARALLELISM = "default"
+COMPOSITE_OFF = "off"
+
+STAND_IN_PROJECT = "throughput-project"
+STAND_IN_BUCKET = "throughput-bucket"
+OBJECT_PREFIX = "bench/throughput"
+
+PROCESS_COUNT_ENV = "CLOUDSDK_STORAGE_PROCESS_COUNT"
+THREAD_COUNT_ENV = "CLOUDSDK_STORAGE_THREAD_COUNT"
+COMPOSITE_ENABLED_ENV = "CLOUDSDK_STORAGE_PARALLEL_COMPOSITE_UPLOAD_ENABLED"
+COMPOSITE_THRESHOLD_ENV = "CLOUDSDK_STORAGE_PARALLEL_COMPOSITE_UPLOAD_THRESHOLD"
+
+_SIZE_UNITS = {
+    "": 1,
+    "B": 1,
+    "KB": 1000,
+    "MB": 1000**2,
+    "GB": 1000**3,
+    "KIB": 1024,
+    "MIB": 1024**2,
+    "GIB": 1024**3,
+}
+
+
+def parse_size(value: str) -> int:
+    """Byte count of values like 512, 4KiB, 16MiB, 1GB."""
+    match = re.fullmatch(r"\s*(\d+)\s*([a-zA-Z]*)\s*", value)
+    unit = match and match.group(2).upper()
+    if not match or unit not in _SIZE_UNITS:
+        raise ValueError(f"Invalid size: {value!r}")
+    return int(match.group(1)) * _SIZE_UNITS[unit]
+
+
+def format_size(size: int) -> str:
+    for unit, scale in (("GiB", 1024**3), ("MiB", 1024**2), ("KiB", 1024)):
+        if size >= scale and size % scale == 0:
+            return f"{size // scale}{unit}"
+    return f"{size}B"
+
+
+@dataclass(frozen=True)
+class Cell:
+    """
+    One point of the matrix.
+    """
+
+    operation: str
+    size: int
+    count: int
+    parallel: int
+    gcloud_parallelism: str = DEFAULT_GCLOUD_PARALLELISM
+    composite_threshold: str = COMPOSITE_OFF
+
+    @property
+    def name(self) -> str:
+        return (
+            f"{self.operation}/{format_size(self.size)}/count={self.count}"
+            f"/parallel={self.parallel}/gcloud={self.gcloud_parallelism}"
+            f"/composite={self.composite_threshold}"
+        )
+
+
+@dataclass
+class ThroughputResult:
+    """
+    Median throughput of a cell over its repetitions.
+    """
+
+    name: str
+    cell: Dict[str, object]
+    repeats: int
+    seconds: float
+    mb_per_s: float
+    objects_per_s: float
+    latency_p50: float
+    latency_p95: float
+    errors: int
+    error_samples: List[str] = field(default_factory=list)
+
+
+def gcloud_env(gcloud_parallelism: str, composite_threshold: str) -> Dict[str, str]:
+    """Environment applying gcloud's parallelism and composite upload settings."""
+    env = {}
+    if gcloud_parallelism != DEFAULT_GCLOUD_PARALLELISM:
+        processes, _, threads = gcloud_parallelism.partition("x")
+        env[PROCESS_COUNT_ENV] = str(int(processes))
+        env[THREAD_COUNT_ENV] = str(int(threads or 1))
+    if composite_threshold == COMPOSITE_OFF:
+        env[COMPOSITE_ENABLED_ENV] = "False"
+    else:
+        env[COMPOSITE_ENABLED_ENV] = "True"
+        env[COMPOSITE_THRESHOLD_ENV] = composite_threshold
+    return env
+
+
+@contextmanager
+def _environment(values: Dict[str, str]) -> Iterator[None]:
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _upload(local_file: str, bucket: str, name: str) -> Optional[str]:
+    response = GcpStorage.copy_file_to_bucket(local_file, bucket, name)
+    if response.status_code == 0:
+        return None
+    return response.output or f"exit {response.status_code}"
+
+
+def _download(bucket: str, name: str, size: int) -> Optional[str]:
+    # Same `gcloud storage cat` as cat_file_from_url, but streamed: buffering
+    # GiB objects in a Python string would measure decoding, not transfer.
+    received = 0
+    try:
+        for chunk in GcpStorage.stream_file_from_url(f"gs://{bucket}/{name}"):
+            received += len(chunk)
+    except GCPCommandError as e:
+        return str(e)
+    return None if received == size else f"received {received} of {size} bytes"
+
+
+class ThroughputMatrix:
+    """
+    Runs matrix cells against one bucket and collects their results.
+    """
+
+    def __init__(self, bucket: str, work_dir: str, repeat: int = 3):
+        self.bucket = bucket
+        self.work_dir = work_dir
+        self.repeat = repeat
+        self.run_id = secrets.token_hex(4)
+        self.results: List[ThroughputResult] = []
+        self._local_files: Dict[int, str] = {}
+
+    def _local_file(self, size: int) -> str:
+        if size not in self._local_files:
+            path = os.path.join(self.work_dir, f"{size}.txt")
+            self._local_files[size] = SeededObject(size, seed=size).write_to(path)
+        return self._local_files[size]
+
+    def _timed(self, parallel: int, jobs) -> tuple:
+        latencies, errors = [], []
+
+        def _run(job):
+            started = time.perf_counter()
+            error = job()
+            latencies.append(time.perf_counter() - started)
+            if error:
+                errors.append(error)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(parallel) as pool:
+            list(pool.map(_run, jobs))
+        return time.perf_counter() - started, latencies, errors
+
+    def run_group(
+        self,
+        size: int,
+        count: int,
+        parallel: int,
+        gcloud_parallelism: str,
+        composite_threshold: str,
+    ) -> List[ThroughputResult]:
+        """Upload then download `count` objects, `repeat` times."""
+        local_file = self._local_file(size)
+        cells = {
+            operation: Cell(
+                operation,
+                size,
+                count,
+                parallel,
+                gcloud_parallelism,
+                composite_threshold,
+            )
+            for operation in (UPLOAD, DOWNLOAD)
+        }
+        samples = {operation: [] for operation in cells}
+        for repetition in range(self.repeat):
+            prefix = f"{OBJECT_PREFIX}/{self.run_id}/{len(self.results)}/{repetition}"
+            names = [f"{prefix}/{index}" for index in range(count)]
+            with _environment(gcloud_env(gcloud_parallelism, composite_threshold)):
+                samples[UPLOAD].append(
+                    self._timed(
+                        parallel,
+                        [
+                            lambda name=name: _upload(local_file, self.bucket, name)
+                            for name in names
+                        ],
+                    )
+                )
+                samples[DOWNLOAD].append(
+                    self._timed(
+                        parallel,
+                        [
+                            lambda name=name: _download(self.bucket, name, size)
+                            for name in names
+                        ],
+                    )
+                )
+            GcpStorage.delete_object(self.bucket, pattern=f"{prefix}/**")
+        results = [
+            self._summarize(cells[operation], samples[operation])
+            for operation in (UPLOAD, DOWNLOAD)
+        ]
+        self.results += results
+        return results
+
+    def _summarize(self, cell: Cell, samples: List[tuple]) -> ThroughputResult:
+        walls = [wall for wall, _, _ in samples]
+        latencies = sorted(latency for _, lats, _ in samples for latency in lats)
+        errors = [error for _, _, errs in samples for error in errs]
+        rates = []
+        for wall, _, errs in samples:
+            succeeded = cell.count - len(errs)
+            rates.append((succeeded * cell.size / 1e6 / wall, succeeded / wall))
+        return ThroughputResult(
+            name=cell.name,
+            cell=asdict(cell),
+            repeats=len(samples),
+            seconds=statistics.median(walls),
+            mb_per_s=statistics.median(mb for mb, _ in rates),
+            objects_per_s=statistics.median(objects for _, objects in rates),
+            latency_p50=percentile(latencies, 50),
+            latency_p95=percentile(latencies, 95),
+            errors=len(errors),
+            error_samples=errors[:3],
+        )
+
+    def to_json(self, backend: str) -> dict:
+        return {
+            "meta": {
+                "timestamp": time.time(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "backend": backend,
+                "repeat": self.repeat,
+            },
+            "results": [asdict(result) for result in self.results],
+        }
+
+
+def format_result(result: ThroughputResult) -> str:
+    line = (
+        f"{result.name:<72} {result.mb_per_s:>9.2f} MB/s "
+        f"{result.objects_per_s:>8.1f} obj/s  p50 {result.latency_p50 * 1000:>7.0f} ms"
+        f"  p95 {result.latency_p95 * 1000:>7.0f} ms"
+    )
+    if result.errors:
+        line += f"  errors={result.errors}"
+    return line
+
+
+def load_results(path: str) -> Dict[str, dict]:
+    with open(path) as results_file:
+        return {result["name"]: result for result in json.load(results_file)["results"]}
+
+
+def compare_results(
+    results: List[ThroughputResult], baseline: Dict[str, dict], threshold: float
+) -> List[str]:
+    """Describe cells whose MB/s dropped below baseline by more than threshold."""
+    slower = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if not previous or previous["mb_per_s"] <= 0:
+            continue
+        ratio = result.mb_per_s / previous["mb_per_s"]
+        if ratio < 1 - threshold:
+            slower.append(
+                f"{result.name}: {previous['mb_per_s']:.2f} -> "
+                f"{result.mb_per_s:.2f} MB/s (x{ratio:.2f})"
+            )
+    return slower
+
+
+def _csv(convert):
+    return lambda value: [convert(item.strip()) for item in value.split(",") if item]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.throughput")
+    parser.add_argument("--sizes", type=_csv(parse_size), default="4KiB,1MiB,16MiB")
+    parser.add_argument("--counts", type=_csv(int), default="1,16")
+    parser.add_argument(
+        "--parallel",
+        type=_csv(int),
+        default="1,4",
+        help="Concurrent gcloud processes per cell.",
+    )
+    parser.add_argument(
+        "--gcloud-parallelism",
+        type=_csv(str),
+        default=DEFAULT_GCLOUD_PARALLELISM,
+        help="gcloud process x thread counts per command, e.g. default,1x1,4x8.",
+    )
+    parser.add_argument(
+        "--composite-thresholds",
+        type=_csv(str),
+        default=COMPOSITE_OFF,
+        help="Parallel composite upload thresholds, e.g. off,150M.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--gcs",
+        action="store_true",
+        help="Run against the configured bucket instead of the local stand-in.",
+    )
+    parser.add_argument("--bucket", help="Bucket for --gcs (default: config).")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON.")
+    parser.add_argument(
+        "--baseline", metavar="PATH", help="Compare MB/s with a previous JSON."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative MB/s drop reported as a regression.",
+    )
+    parser.add_argument(
+        "--fail", action="store_true", help="Exit with 1 on regressions."
+    )
+    args = parser.parse_args(argv)
+
+    with ExitStack() as stack:
+        if args.gcs:
+            bucket = args.bucket or get_settings().default_bucket
+            backend = "gcs"
+        else:
+            stand_in = StandInBackend()
+            stack.callback(stand_in.cleanup)
+            stack.enter_context(stand_in.activate())
+            GcpStorage.create_gcp_project(STAND_IN_PROJECT)
+            GcpStorage.create_bucket(STAND_IN_BUCKET, STAND_IN_PROJECT)
+            bucket, backend = STAND_IN_BUCKET, "stand-in"
+        work_dir = stack.enter_context(
+            tempfile.TemporaryDirectory(prefix="gcs-throughput-")
+        )
+        matrix = ThroughputMatrix(bucket, work_dir, repeat=args.repeat)
+        print(f"throughput matrix against {backend} bucket {bucket}", flush=True)
+        for size, count, parallel, gcloud_parallelism, composite in product(
+            args.sizes,
+            args.counts,
+            args.parallel,
+            args.gcloud_parallelism,
+            args.composite_thresholds,
+        ):
+            for result in matrix.run_group(
+                size, count, parallel, gcloud_parallelism, composite
+            ):
+                print(format_result(result), flush=True)
+
+    if args.json:
+        with open(args.json, "w") as results_file:
+            json.dump(matrix.to_json(backend), results_file, indent=2)
+
+    if args.baseline:
+        slower = compare_results(
+            matrix.results, load_results(args.baseline), args.threshold
+        )
+        print(f"\n{len(slower)} cell(s) slower than baseline", flush=True)
+        for line in slower:
+            print(f"  {line}")
+        if slower and args.fail:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
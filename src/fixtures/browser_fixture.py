@@ -0,0 +1,121 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+from src.helpers.browser_context_pool import BrowserContextPool, ContextPoolStats
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Playwright
+
+DEFAULT_TIMEOUT_MS = 30000
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("browser context pool")
+    group.addoption(
+        "--context-pool-size",
+        type=int,
+        default=2,
+        help="Browser contexts pre-warmed per worker.",
+    )
+    group.addoption(
+        "--context-max-uses",
+        type=int,
+        default=20,
+        help="Leases after which a browser context is recycled.",
+    )
+    group.addoption(
+        "--context-max-heap-mb",
+        type=int,
+        default=64,
+        help="JS heap size (MB) above which a browser context is recycled.",
+    )
+
+
+def _format_pool_stats(label: str, stats: ContextPoolStats) -> str:
+    return (
+        f"{label}: leases={stats.leases} created={stats.created} "
+        f"recycled={stats.recycled}"
+    )
+
+
+def pytest_configure(config):
+    config._context_pool_stats = {}
+
+
+def pytest_sessionfinish(session):
+    """Hand worker pool stats to the xdist controller."""
+    workeroutput = getattr(session.config, "workeroutput", None)
+    stats = session.config._context_pool_stats.get("local")
+    if workeroutput is not None and stats is not None:
+        workeroutput["context_pool_stats"] = stats.to_dict()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect pool stats reported by an xdist worker."""
+    data = getattr(node, "workeroutput", {}).get("context_pool_stats")
+    if data:
+        worker_id = node.workerinput["workerid"]
+        node.config._context_pool_stats[worker_id] = ContextPoolStats(**data)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    pool_stats = config._context_pool_stats
+    if not pool_stats:
+        return
+    terminalreporter.section("browser context pool")
+    for label, stats in sorted(pool_stats.items()):
+        terminalreporter.write_line(_format_pool_stats(label, stats))
+
+
+@pytest.fixture(scope="session")
+def pw():
+    # Imported here so sessions without browser tests never load Playwright.
+    from playwright.sync_api import sync_playwright
+
+    p = sync_playwright().start()
+    yield p
+    p.stop()
+
+
+@pytest.fixture(scope="session")
+def browser(pw: "Playwright"):
+    browser = pw.chromium.launch(
+        headless=True,
+        args=["--disable-web-security"],
+    )
+    yield browser
+    browser.close()
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser, pytestconfig):
+    pool = BrowserContextPool(
+        browser,
+        size=pytestconfig.getoption("context_pool_size"),
+        max_uses=pytestconfig.getoption("context_max_uses"),
+        max_heap_bytes=pytestconfig.getoption("context_max_heap_mb") * 1024 * 1024,
+        default_timeout_ms=DEFAULT_TIMEOUT_MS,
+        ignore_https_errors=True,
+    )
+    pool.warm_up()
+    pytestconfig._context_pool_stats["local"] = pool.stats
+    yield pool
+    pool.close()
+
+
+@pytest.fixture()
+def _context_lease(context_pool):
+    with context_pool.lease() as pooled:
+        yield pooled
+
+
+@pytest.fixture()
+def context(_context_lease):
+    return _context_lease.context
+
+
+@pytest.fixture()
+def page(_context_lease):
+    return _context_lease.page
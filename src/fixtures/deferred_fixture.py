@@ -0,0 +1,171 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+import pytest
+from _pytest.runner import runtestprotocol
+
+from src.helpers.deferred_checks import DeferredCheck, DeferredCheckScheduler
+
+
+@dataclass
+class _HeldItem:
+    """
+    Results of the checks a test deferred, and its phase reports once it has
+    run; the reports are logged when no check of the test is pending.
+    """
+
+    item: Any
+    reports: Optional[List[pytest.TestReport]] = None
+    remaining: int = 0
+    failures: List[tuple] = field(default_factory=list)
+    skip_reason: Optional[str] = None
+    xfail_reason: Optional[str] = None
+    duration: float = 0.0
+
+
+def pytest_configure(config):
+    config._deferred_scheduler = DeferredCheckScheduler()
+    config._deferred_held = {}
+
+
+def _log_reports(config, reports) -> None:
+    if hasattr(config, "workerinput"):
+        # xdist workers may only log reports of the running item, so held
+        # reports travel to the controller with the worker output instead
+        for report in reports:
+            data = config.hook.pytest_report_to_serializable(
+                config=config, report=report
+            )
+            data["worker_id"] = config.workerinput["workerid"]
+            data["testrun_uid"] = config.workerinput.get("testrunuid")
+            config.workeroutput.setdefault("deferred_reports", []).append(data)
+    else:
+        for report in reports:
+            config.hook.pytest_runtest_logreport(report=report)
+
+
+def _release(held: _HeldItem) -> None:
+    """Fold the check results into the call report and log all phases once."""
+    del held.item.config._deferred_held[held.item.nodeid]
+    call = next((r for r in held.reports if r.when == "call"), None)
+    if call is not None:
+        call.deferred = True
+        call.duration += held.duration
+        failures = list(held.failures)
+        if failures and call.passed:
+            call.outcome = "failed"
+            call.longrepr = failures.pop(0)[1]
+        elif call.passed and held.xfail_reason is not None:
+            call.outcome = "skipped"
+            call.wasxfail = held.xfail_reason
+        elif call.passed and held.skip_reason is not None:
+            path, lineno = held.item.reportinfo()[:2]
+            call.outcome = "skipped"
+            call.longrepr = (str(path), (lineno or 0) + 1, held.skip_reason)
+        for description, longrepr in failures:
+            call.sections.append((f"deferred check {description}", str(longrepr)))
+    _log_reports(held.item.config, held.reports)
+
+
+def _run_deferred_check(deferred: DeferredCheck) -> None:
+    """Run a due check and record its result against the test that deferred it."""
+    item = deferred.owner
+    held = item.config._deferred_held.get(item.nodeid)
+    started = time.perf_counter()
+    try:
+        deferred.check()
+    except pytest.skip.Exception as e:
+        if held is not None and held.skip_reason is None:
+            held.skip_reason = f"Skipped: {e.msg}"
+    except pytest.xfail.Exception as e:
+        if held is not None and held.xfail_reason is None:
+            held.xfail_reason = e.msg
+    except (Exception, pytest.fail.Exception):
+        longrepr = item.repr_failure(pytest.ExceptionInfo.from_current())
+        if held is not None:
+            held.failures.append((deferred.description, longrepr))
+    if held is None:
+        return
+    held.duration += time.perf_counter() - started
+    if held.reports is not None:
+        # the test has finished: log it once its last check has run
+        held.remaining -= 1
+        if held.remaining == 0:
+            _release(held)
+
+
+def _run_due_checks(config, block: bool = False) -> None:
+    for deferred in config._deferred_scheduler.pop_due(block=block):
+        _run_deferred_check(deferred)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """
+    Run checks that became due, between tests rather than in a teardown.
+    Reports of a test using `defer` are held until its checks have run, so
+    the test is reported once, with the checks' outcome in its call report.
+    """
+    _run_due_checks(item.config)
+    if "defer" not in getattr(item, "fixturenames", ()):
+        return None
+    held = item.config._deferred_held[item.nodeid] = _HeldItem(item)
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    held.reports = runtestprotocol(item, nextitem=nextitem, log=False)
+    held.remaining = item.config._deferred_scheduler.pending_for(item)
+    if held.remaining == 0:
+        _release(held)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_teardown(item, nextitem):
+    """
+    Wait for the remaining checks before the last test's teardown, while the
+    session fixtures they may use are still set up.
+    """
+    if nextitem is None:
+        _run_due_checks(item.config, block=True)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtestloop(session):
+    """Run checks left by an interrupted run (e.g. --maxfail) at the end."""
+    yield
+    _run_due_checks(session.config, block=True)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Log the held reports collected by an xdist worker."""
+    config = node.config
+    for data in getattr(node, "workeroutput", {}).get("deferred_reports", []):
+        report = config.hook.pytest_report_from_serializable(config=config, data=data)
+        report.node = node
+        config.hook.pytest_runtest_logreport(report=report)
+
+
+def pytest_report_teststatus(report):
+    if getattr(report, "deferred", False) and report.when == "call":
+        if report.passed:
+            return "passed", "d", "DEFERRED PASSED"
+        if report.failed:
+            return "failed", "F", ("DEFERRED FAILED", {"red": True})
+
+
+@pytest.fixture
+def defer(request):
+    """
+    Register a check to run once due, without blocking the worker:
+    defer(check, delay=5) or defer(check, at=epoch_seconds).
+    """
+    scheduler = request.config._deferred_scheduler
+
+    def _defer(check, *, at=None, delay=None, description=""):
+        return scheduler.schedule(
+            check, at=at, delay=delay, owner=request.node, description=description
+        )
+
+    return _defer
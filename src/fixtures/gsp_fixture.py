@@ -1,20 +1,39 @@
+from typing import TYPE_CHECKING
+
 import pytest
-from assertpy import assert_that
 
 from src.gcp_test_client.gcp_client import GcpStorage
-from src.helpers.assert_helper import AssertHelper
-from src.helpers.config_helper import get_config_value
+from src.helpers.config_helper import get_settings
 from src.helpers.data_helper import (
+    DEFAULT_SAMPLE_FILE_CONTENT,
     extract_ids,
     extract_bucket_ids,
     create_sample_text_file,
+    create_seeded_sample_file,
     delete_temp_files,
 )
+from src.helpers.fixture_object_store import FixtureObjectStore
+from src.helpers.trace_recorder import trace_span
+
+if TYPE_CHECKING:
+    from src.helpers.assert_helper import AssertHelper
 
 
 # Pytest hooks
+def pytest_addoption(parser):
+    parser.addoption(
+        "--upload-via-temp-files",
+        action="store_true",
+        default=False,
+        help="Write upload payloads to temp/ and copy them, instead of "
+        "streaming them to 'gcloud storage cp -'.",
+    )
+
+
 def sign_up_preconditions(gcp_client, sample_bucket, sample_project, service_account):
     """Preconditions"""
+    from assertpy import assert_that
+
     sa = service_account
     response = gcp_client.enable_credentials(project=sample_project)
     assert_that(response.status_code).is_equal_to(0)
@@ -34,12 +53,13 @@ def pytest_configure(config):
     """Preconditions hook"""
     if _is_controller(config):
         gcp_client = GcpStorage()
-        sample_bucket = get_config_value("default_bucket")
-        sample_project = get_config_value("default_project")
+        sample_bucket = get_settings().default_bucket
+        sample_project = get_settings().default_project
         service_account = f"url-signer@{sample_project}.iam.gserviceaccount.com"
-        sign_up_preconditions(
-            gcp_client, sample_bucket, sample_project, service_account
-        )
+        with trace_span("sign_up_preconditions"):
+            sign_up_preconditions(
+                gcp_client, sample_bucket, sample_project, service_account
+            )
 
 
 def cleanup_buckets_after_test(gcp_client, sample_project):
@@ -61,9 +81,13 @@ def pytest_unconfigure(config):
     """Teardown hook"""
     if _is_controller(config):
         gcp_client = GcpStorage()
-        sample_project = get_config_value("default_project")
-        cleanup_buckets_after_test(gcp_client, sample_project)
-        cleanup_txt_files_in_sample_bucket(gcp_client, sample_project)
+        settings = get_settings()
+        # a matrix run cleans shared projects once all of its targets finished
+        if settings.get_flag("cleanup_test_buckets", default=True):
+            with trace_span("cleanup_buckets_after_test"):
+                cleanup_buckets_after_test(gcp_client, settings.default_project)
+        with trace_span("cleanup_txt_files_in_sample_bucket"):
+            cleanup_txt_files_in_sample_bucket(gcp_client, settings.default_bucket)
 
 
 # Pytest scope session fixtures
@@ -72,7 +96,7 @@ def pytest_unconfigure(config):
 @pytest.fixture(scope="session")
 def sample_project(gcp_client):
     """Fixture to ensure a sample project exists and return its ID."""
-    project_id = get_config_value("default_project")
+    project_id = get_settings().default_project
 
     result = gcp_client.list_gcp_projects()
     project_ids = extract_ids(result.output)
@@ -85,36 +109,113 @@ def sample_project(gcp_client):
 
 @pytest.fixture(scope="session")
 def sample_bucket(gcp_client, sample_project):
-    bucket_id = get_config_value("default_bucket")
+    bucket_id = get_settings().default_bucket
     result = gcp_client.list_buckets(project=sample_project)
     bucket_ids = extract_bucket_ids(output_data=result.output)
     if bucket_id in bucket_ids:
         return bucket_id
-    gcp_client.create_bucket(project=sample_project, bucket=bucket_id)
+    gcp_client.create_bucket(
+        project=sample_project, bucket=bucket_id, location=get_settings().region
+    )
     return bucket_id
 
 
+def _upload_payload(
+    gcp_client, via_temp_files, bucket, file_name, payload, if_generation_match=None
+):
+    """Stream text, bytes or a SeededObject to the bucket, or copy it via temp/."""
+    seeded = not isinstance(payload, (str, bytes))
+    if not via_temp_files:
+        return gcp_client.upload_stream_to_bucket(
+            payload=payload.iter_chunks() if seeded else payload,
+            bucket=bucket,
+            file_name=file_name,
+            if_generation_match=if_generation_match,
+        )
+    # temp/ is flat: object names such as fixtures/<digest>.txt keep no folders
+    local_file_name = file_name.replace("/", "-")
+    if seeded:
+        local_file_path = create_seeded_sample_file(
+            file_name=local_file_name, seeded_object=payload
+        )
+    else:
+        local_file_path = create_sample_text_file(
+            file_name=local_file_name, file_content=payload
+        )
+    return gcp_client.copy_file_to_bucket(
+        bucket=bucket,
+        local_file_path=local_file_path,
+        file_name=file_name,
+        if_generation_match=if_generation_match,
+    )
+
+
 @pytest.fixture(scope="session")
-def sample_file_to_bucket(gcp_client, sample_bucket):
-    def _upload_file(file_name, file_content=None):
-        result = gcp_client.check_file_in_bucket(
-            bucket=sample_bucket, file_name=file_name
+def upload_to_bucket(gcp_client, sample_bucket, pytestconfig):
+    """
+    Upload text, bytes or a SeededObject without touching the filesystem;
+    with --upload-via-temp-files (or via_temp_files=True) the payload goes
+    through temp/ instead.
+    """
+    from assertpy import assert_that
+
+    default_via_temp_files = pytestconfig.getoption("upload_via_temp_files")
+
+    def _upload(file_name, payload, bucket=None, via_temp_files=None):
+        bucket = bucket or sample_bucket
+        if via_temp_files is None:
+            via_temp_files = default_via_temp_files
+        response = _upload_payload(
+            gcp_client, via_temp_files, bucket, file_name, payload
         )
-        if result.status_code != 0:
-            local_file_path = create_sample_text_file(
-                file_name=file_name, file_content=file_content
-            )
-            response = gcp_client.copy_file_to_bucket(
-                bucket=sample_bucket,
-                local_file_path=local_file_path,
-                file_name=file_name,
-            )
-            assert_that(response.status_code).is_equal_to(0)
-        return f"gs://{sample_bucket}/{file_name}"
+        assert_that(response.status_code).is_equal_to(0)
+        return f"gs://{bucket}/{file_name}"
+
+    return _upload
+
+
+@pytest.fixture(scope="session")
+def fixture_object_store(gcp_client, sample_bucket, pytestconfig):
+    """Content-addressed objects of the sample bucket, indexed per session."""
+    via_temp_files = pytestconfig.getoption("upload_via_temp_files")
+
+    def _upload(file_name, payload, if_generation_match):
+        return _upload_payload(
+            gcp_client,
+            via_temp_files,
+            sample_bucket,
+            file_name,
+            payload,
+            if_generation_match=if_generation_match,
+        )
+
+    return FixtureObjectStore(sample_bucket, _upload)
+
+
+@pytest.fixture(scope="session")
+def sample_file_to_bucket(fixture_object_store):
+    """
+    Store shared text content under a name derived from its digest alone, so
+    equal content is uploaded once. Tests that need a specific object name
+    upload through `upload_to_bucket` instead.
+    """
+
+    def _upload_file(file_content=None):
+        return fixture_object_store.put(file_content or DEFAULT_SAMPLE_FILE_CONTENT)
 
     return _upload_file
 
 
+@pytest.fixture(scope="session")
+def sample_seeded_object_to_bucket(fixture_object_store):
+    def _upload_seeded_object(seeded_object, file_name=None):
+        if not file_name:
+            file_name = f"seeded-{seeded_object.seed}-{seeded_object.size}.txt"
+        return fixture_object_store.put(seeded_object, label=file_name)
+
+    return _upload_seeded_object
+
+
 @pytest.fixture(scope="session")
 def service_account(sample_project):
     return f"url-signer@{sample_project}.iam.gserviceaccount.com"
@@ -122,5 +223,7 @@ def service_account(sample_project):
 
 # Other fixtures
 @pytest.fixture
-def assert_helper() -> AssertHelper:
+def assert_helper() -> "AssertHelper":
+    from src.helpers.assert_helper import AssertHelper
+
     return AssertHelper()
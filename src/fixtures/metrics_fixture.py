@@ -0,0 +1,173 @@
+import json
+from collections import defaultdict
+from dataclasses import asdict
+from html import escape
+
+import pytest
+
+from src.helpers.base_helpers import add_command_listener, remove_command_listener
+from src.helpers.command_metrics import CommandMetrics
+
+LOCAL_WORKER = "local"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--command-metrics-json",
+        metavar="PATH",
+        default=None,
+        help="Write per-command and per-worker gcloud latency of the session "
+        "to PATH as JSON.",
+    )
+
+
+def _format_ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f} ms"
+
+
+def _stats_table_html(metrics: CommandMetrics) -> str:
+    rows = "".join(
+        f"<tr><td>{escape(row.label)}</td><td>{row.count}</td>"
+        f"<td>{_format_ms(row.p50)}</td><td>{_format_ms(row.p95)}</td>"
+        f"<td>{_format_ms(row.p99)}</td><td>{_format_ms(row.total)}</td></tr>"
+        for row in metrics.stats()
+    )
+    return (
+        "<table><tr><th>command</th><th>calls</th><th>p50</th><th>p95</th>"
+        f"<th>p99</th><th>total</th></tr>{rows}</table>"
+    )
+
+
+class CommandTimingCollector:
+    """
+    Collects gcloud command timings of the running test phase and attaches
+    them to the phase report, so they travel from xdist workers to the
+    controller.
+    """
+
+    def __init__(self):
+        self.timings = []
+
+    def __call__(self, record) -> None:
+        self.timings.append((record.label, record.duration))
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self.timings.clear()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        outcome.get_result().command_timings = list(self.timings)
+        self.timings.clear()
+
+
+class CommandMetricsReporter:
+    """
+    Aggregates command timings per test, per worker and per session and
+    renders them in the terminal and pytest-html reports.
+    """
+
+    def __init__(self, json_path=None):
+        self.json_path = json_path
+        self.session_metrics = CommandMetrics()
+        self.test_metrics = defaultdict(CommandMetrics)
+        self.worker_metrics = defaultdict(CommandMetrics)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_logreport(self, report):
+        timings = getattr(report, "command_timings", None)
+        if not timings:
+            return
+        worker_id = getattr(report, "worker_id", LOCAL_WORKER)
+        for metrics in (
+            self.session_metrics,
+            self.test_metrics[report.nodeid],
+            self.worker_metrics[worker_id],
+        ):
+            metrics.extend(timings)
+
+    def pytest_sessionfinish(self, session):
+        if not self.json_path:
+            return
+        data = {
+            "commands": [asdict(row) for row in self.session_metrics.stats()],
+            "workers": {
+                worker_id: {"count": metrics.count, "total": metrics.total}
+                for worker_id, metrics in sorted(self.worker_metrics.items())
+            },
+        }
+        with open(self.json_path, "w") as json_file:
+            json.dump(data, json_file, indent=2)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.session_metrics:
+            return
+        terminalreporter.section("gcloud command latency")
+        terminalreporter.write_line(
+            f"{'command':<48} {'calls':>6} {'p50':>9} {'p95':>9} {'p99':>9} "
+            f"{'total':>10}"
+        )
+        for row in self.session_metrics.stats():
+            terminalreporter.write_line(
+                f"{row.label:<48} {row.count:>6} {_format_ms(row.p50):>9} "
+                f"{_format_ms(row.p95):>9} {_format_ms(row.p99):>9} "
+                f"{_format_ms(row.total):>10}"
+            )
+        for worker_id, metrics in sorted(self.worker_metrics.items()):
+            terminalreporter.write_line(
+                f"{worker_id}: {metrics.count} calls, {_format_ms(metrics.total)}"
+            )
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        if not self.session_metrics:
+            return
+        worker_rows = "".join(
+            f"<tr><td>{escape(worker_id)}</td><td>{metrics.count}</td>"
+            f"<td>{_format_ms(metrics.total)}</td></tr>"
+            for worker_id, metrics in sorted(self.worker_metrics.items())
+        )
+        postfix.extend(
+            [
+                "<h2>gcloud command latency</h2>",
+                _stats_table_html(self.session_metrics),
+                "<h3>per worker</h3>",
+                "<table><tr><th>worker</th><th>calls</th><th>total</th></tr>"
+                f"{worker_rows}</table>",
+            ]
+        )
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_table_header(self, cells):
+        cells.insert(
+            3, '<th class="sortable" data-column-type="gcloudTime">gcloud time</th>'
+        )
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_table_row(self, report, cells):
+        metrics = self.test_metrics.get(report.nodeid)
+        total = metrics.total if metrics else 0.0
+        cells.insert(3, f'<td class="col-gcloudTime">{_format_ms(total)}</td>')
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_table_html(self, report, data):
+        metrics = self.test_metrics.get(report.nodeid)
+        if report.when == "call" and metrics:
+            data.append(_stats_table_html(metrics))
+
+
+def pytest_configure(config):
+    collector = CommandTimingCollector()
+    add_command_listener(collector)
+    config.pluginmanager.register(collector, "command_timing_collector")
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(
+            CommandMetricsReporter(config.getoption("command_metrics_json")),
+            "command_metrics_reporter",
+        )
+
+
+def pytest_unconfigure(config):
+    collector = config.pluginmanager.get_plugin("command_timing_collector")
+    if collector is not None:
+        remove_command_listener(collector)
@@ -0,0 +1,135 @@
+import threading
+from collections import defaultdict
+
+import pytest
+
+from src.helpers.base_helpers import add_command_listener, remove_command_listener
+from src.helpers.operation_accounting import (
+    CLASS_A,
+    OPERATION_CLASSES,
+    OperationCounts,
+    classify_command,
+    exceeded_budget,
+)
+
+BUDGET_MARKER = "operation_budget"
+TOP_TESTS = 10
+
+
+def operation_budget(item) -> dict:
+    """Limits of the operation_budget markers of an item, closest first."""
+    budget = {}
+    for marker in item.iter_markers(BUDGET_MARKER):
+        if marker.args:
+            raise pytest.UsageError(
+                f"{item.nodeid}: {BUDGET_MARKER} takes keyword arguments only"
+            )
+        for operation_class, limit in marker.kwargs.items():
+            if operation_class not in OPERATION_CLASSES:
+                raise pytest.UsageError(
+                    f"{item.nodeid}: unknown operation class {operation_class!r} "
+                    f"in {BUDGET_MARKER}, expected one of {OPERATION_CLASSES}"
+                )
+            budget.setdefault(operation_class, limit)
+    return budget
+
+
+class OperationCollector:
+    """
+    Classifies the gcloud commands of the running test phase, attaches the
+    counts to the phase report and fails a test body that exceeds its
+    operation_budget.
+    """
+
+    def __init__(self):
+        self.counts = OperationCounts()
+        self._lock = threading.Lock()
+
+    def __call__(self, record) -> None:
+        operations = classify_command(record.command, record.label)
+        with self._lock:
+            self.counts.add(record.label, operations)
+
+    def _take(self) -> OperationCounts:
+        with self._lock:
+            counts, self.counts = self.counts, OperationCounts()
+        return counts
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self._take()
+
+    def pytest_collection_modifyitems(self, items):
+        for item in items:
+            operation_budget(item)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        counts = self._take()
+        report.operation_counts = counts.to_dict()
+        if counts:
+            report.user_properties.append(("gcs_operations", counts.format_totals()))
+        if call.when != "call" or not report.passed:
+            return
+        violations = exceeded_budget(counts, operation_budget(item))
+        if violations:
+            report.outcome = "failed"
+            report.longrepr = "Operation budget exceeded:\n  " + "\n  ".join(
+                violations
+            )
+
+
+class OperationReporter:
+    """
+    Aggregates operation counts per test and per session for the terminal.
+    """
+
+    def __init__(self):
+        self.session_counts = OperationCounts()
+        self.test_counts = defaultdict(OperationCounts)
+
+    def pytest_runtest_logreport(self, report):
+        counts = getattr(report, "operation_counts", None)
+        if not counts:
+            return
+        self.session_counts.update(counts)
+        self.test_counts[report.nodeid].update(counts)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.session_counts:
+            return
+        terminalreporter.section("gcloud operations")
+        terminalreporter.write_line(f"session: {self.session_counts.format_totals()}")
+        for operation_class in OPERATION_CLASSES:
+            top = self.session_counts.top_labels(operation_class)
+            if top:
+                terminalreporter.write_line(
+                    f"{operation_class}: "
+                    + ", ".join(f"{label} x{count}" for label, count in top)
+                )
+        busiest = sorted(
+            self.test_counts.items(), key=lambda item: -item[1][CLASS_A]
+        )[:TOP_TESTS]
+        terminalreporter.write_line(f"most {CLASS_A} operations:")
+        for nodeid, counts in busiest:
+            terminalreporter.write_line(f"  {counts[CLASS_A]:>5} {nodeid}")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        f"{BUDGET_MARKER}(class_a=None, class_b=None, iam=None, free=None): "
+        "fail the test when its body runs more gcloud operations of a class",
+    )
+    collector = OperationCollector()
+    add_command_listener(collector)
+    config.pluginmanager.register(collector, "operation_collector")
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(OperationReporter(), "operation_reporter")
+
+
+def pytest_unconfigure(config):
+    collector = config.pluginmanager.get_plugin("operation_collector")
+    if collector is not None:
+        remove_command_listener(collector)
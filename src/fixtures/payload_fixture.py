@@ -0,0 +1,45 @@
+import secrets
+
+import pytest
+
+from src.helpers.payload_generator import PayloadGenerator, UniqueNames
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--payload-seed",
+        type=int,
+        default=0,
+        help="Base seed of generated test payloads.",
+    )
+
+
+def pytest_configure(config):
+    """One run id for the session, shared with every xdist worker."""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        config._payload_run_id = workerinput["payload_run_id"]
+    else:
+        config._payload_run_id = secrets.token_hex(4)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["payload_run_id"] = node.config._payload_run_id
+
+
+@pytest.fixture
+def payloads(request) -> PayloadGenerator:
+    """Payload generator seeded by --payload-seed and the test id."""
+    seed = request.config.getoption("payload_seed")
+    return PayloadGenerator(f"{seed}:{request.node.nodeid}")
+
+
+@pytest.fixture(scope="session")
+def unique_name(pytestconfig) -> UniqueNames:
+    """
+    Object names that cannot collide across workers or runs, for objects a
+    test asserts on by name; shared read fixtures use content addresses.
+    """
+    worker_id = getattr(pytestconfig, "workerinput", {}).get("workerid", "main")
+    return UniqueNames(pytestconfig._payload_run_id, worker_id)
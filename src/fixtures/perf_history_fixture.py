@@ -0,0 +1,99 @@
+from collections import defaultdict
+
+import pytest
+
+from src.gcp_test_client.gcp_client import GcpStorage
+from src.helpers.config_helper import get_settings
+from src.helpers.perf_store import (
+    COMMAND_METRIC,
+    DEFAULT_BASELINE_RUNS,
+    DEFAULT_THRESHOLD,
+    STARTUP_METRIC,
+    TEST_METRIC,
+    PerfStore,
+    git_commit,
+)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("performance history")
+    group.addoption(
+        "--perf-store",
+        metavar="PATH",
+        default=None,
+        help="Record per-test and per-command timings of this run in a SQLite store.",
+    )
+    group.addoption(
+        "--perf-baseline-runs",
+        type=int,
+        default=DEFAULT_BASELINE_RUNS,
+        help="Number of previous runs forming the rolling baseline.",
+    )
+    group.addoption(
+        "--perf-fail-threshold",
+        type=float,
+        default=None,
+        help="Fail the session when a metric is significantly slower than its "
+        "baseline by more than this fraction (e.g. 0.2 for 20%%).",
+    )
+
+
+class PerfHistoryRecorder:
+    """
+    Stores the run's timings at session end and compares them with the
+    rolling baseline.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.test_durations = defaultdict(float)
+        self.command_samples = []
+        self.regressions = []
+
+    def pytest_runtest_logreport(self, report):
+        self.test_durations[report.nodeid] += report.duration
+        for label, duration in getattr(report, "command_timings", None) or []:
+            self.command_samples.append((COMMAND_METRIC, label, duration))
+
+    def pytest_sessionfinish(self, session):
+        if not self.test_durations:
+            return
+        samples = self.command_samples + [
+            (TEST_METRIC, nodeid, duration)
+            for nodeid, duration in self.test_durations.items()
+        ]
+        for report in getattr(self.config, "_startup_reports", {}).values():
+            samples.append((STARTUP_METRIC, "boot", report.boot))
+            samples.append((STARTUP_METRIC, "imports", report.imports))
+        version = GcpStorage.gcloud_version()
+        threshold = self.config.getoption("perf_fail_threshold")
+        settings = get_settings()
+        with PerfStore(self.config.getoption("perf_store")) as store:
+            run_id = store.add_run(
+                samples,
+                git_commit=git_commit(),
+                gcloud_version=version.output if version.status_code == 0 else None,
+                project=settings.default_project,
+                region=settings.region,
+            )
+            self.regressions = store.find_regressions(
+                run_id,
+                baseline_count=self.config.getoption("perf_baseline_runs"),
+                threshold=threshold if threshold is not None else DEFAULT_THRESHOLD,
+            )
+        if threshold is not None and self.regressions:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.regressions:
+            return
+        terminalreporter.section("performance regressions", red=True)
+        for regression in self.regressions:
+            terminalreporter.write_line(str(regression))
+
+
+def pytest_configure(config):
+    if config.getoption("perf_store") and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(
+            PerfHistoryRecorder(config), "perf_history_recorder"
+        )
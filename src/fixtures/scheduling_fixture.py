@@ -0,0 +1,76 @@
+from collections import defaultdict
+
+import pytest
+
+from src.helpers.duration_history import DurationHistory
+
+# Expensive fixtures the suite's tests use; add others (e.g. browser) in the
+# expensive_fixtures ini option once tests depend on them
+DEFAULT_EXPENSIVE_FIXTURES = ["sample_seeded_object_to_bucket"]
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-duration-scheduling",
+        action="store_true",
+        default=False,
+        help="Use xdist's default load distribution instead of duration history.",
+    )
+    parser.addini(
+        "expensive_fixtures",
+        type="linelist",
+        default=DEFAULT_EXPENSIVE_FIXTURES,
+        help="Fixtures whose tests are grouped onto the same xdist worker.",
+    )
+
+
+class DurationRecorder:
+    """
+    Collects per-test durations on the controller (or in a non-xdist run)
+    and folds them into the duration history at session end.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.durations = defaultdict(float)
+        self.fixture_groups = {}
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] += report.duration
+        if report.when == "setup":
+            self.fixture_groups[report.nodeid] = getattr(report, "fixture_group", [])
+
+    def pytest_sessionfinish(self, session):
+        cache = getattr(self.config, "cache", None)
+        if cache is None or not self.durations:
+            return
+        history = DurationHistory.load(cache)
+        for nodeid, duration in self.durations.items():
+            history.record(nodeid, duration, self.fixture_groups.get(nodeid, []))
+        history.save(cache)
+
+
+def pytest_configure(config):
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(DurationRecorder(config), "duration_recorder")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Replace the default `--dist load` scheduler with the LPT scheduler."""
+    if config.getoption("no_duration_scheduling") or config.getvalue("dist") != "load":
+        return None
+    from src.helpers.duration_scheduler import DurationScheduling
+
+    history = DurationHistory.load(getattr(config, "cache", None))
+    return DurationScheduling(config, log, history=history)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Tag setup reports with the expensive fixtures the test uses."""
+    outcome = yield
+    if call.when == "setup":
+        expensive = set(item.config.getini("expensive_fixtures"))
+        report = outcome.get_result()
+        report.fixture_group = sorted(expensive.intersection(item.fixturenames))
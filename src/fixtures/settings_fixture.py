@@ -0,0 +1,54 @@
+import pytest
+
+from src.helpers.config_helper import (
+    Settings,
+    load_settings,
+    parse_overrides,
+    pin_settings,
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--setting",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Override a config.json value for this run, e.g. "
+        "--setting region=US-EAST1 (repeatable; GCS_TESTS_<KEY> variables "
+        "work too).",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """
+    Load the settings snapshot once on the controller; xdist workers get it
+    through workerinput and never read config.json.
+    """
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        settings = Settings.from_dict(workerinput["settings"])
+    else:
+        try:
+            overrides = parse_overrides(config.getoption("setting"))
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+        settings = load_settings(overrides=overrides)
+    config._settings = settings
+    pin_settings(settings)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["settings"] = node.config._settings.to_dict()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_unconfigure(config):
+    pin_settings(None)
+
+
+@pytest.fixture(scope="session")
+def settings(pytestconfig) -> Settings:
+    return pytestconfig._settings
@@ -0,0 +1,37 @@
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "stand_in_faults(operations, seed=0): fault plan for the stand_in fixture, "
+        'e.g. {"storage cat": {"errors": {"429": 0.2}}}',
+    )
+
+
+@pytest.fixture(scope="session")
+def stand_in_backend():
+    from src.stand_in.backend import StandInBackend
+
+    backend = StandInBackend()
+    yield backend
+    backend.cleanup()
+
+
+@pytest.fixture
+def stand_in(request, stand_in_backend):
+    """
+    Route gcloud commands of the test to the local stand-in, with the faults
+    of its stand_in_faults marker (or set later with stand_in.set_faults).
+    """
+    marker = request.node.get_closest_marker("stand_in_faults")
+    if marker:
+        operations = marker.args[0] if marker.args else marker.kwargs["operations"]
+        stand_in_backend.set_faults(
+            {"operations": operations, "seed": marker.kwargs.get("seed", 0)}
+        )
+    try:
+        with stand_in_backend.activate():
+            yield stand_in_backend
+    finally:
+        stand_in_backend.clear_faults()
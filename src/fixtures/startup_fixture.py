@@ -0,0 +1,111 @@
+import os
+import time
+
+import pytest
+
+from src.helpers.import_profiler import (
+    StartupReport,
+    format_importtime,
+    process_uptime,
+    startup_profiler,
+)
+
+LOCAL_WORKER = "local"
+STARTUP_TOP_MODULES = 15
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("startup profile")
+    group.addoption(
+        "--profile-startup",
+        action="store_true",
+        default=False,
+        help="Report boot time and the slowest imports of every worker.",
+    )
+    group.addoption(
+        "--startup-profile-dir",
+        metavar="DIR",
+        default=None,
+        help="Write each worker's imports in the 'python -X importtime' "
+        "layout to DIR/<worker>.importtime.txt.",
+    )
+
+
+def _worker_id(config) -> str:
+    workerinput = getattr(config, "workerinput", None)
+    return workerinput["workerid"] if workerinput else LOCAL_WORKER
+
+
+def _is_xdist_controller(config) -> bool:
+    return not hasattr(config, "workerinput") and (
+        getattr(config.option, "dist", "no") != "no"
+    )
+
+
+def pytest_configure(config):
+    config._startup_reports = {}
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session):
+    """
+    Close the startup profile once the process has collected its tests; the
+    xdist controller collects nothing and is not profiled.
+    """
+    started = time.perf_counter()
+    yield
+    startup_profiler.uninstall()
+    config = session.config
+    if _is_xdist_controller(config):
+        return
+    finished = time.perf_counter()
+    boot = process_uptime()
+    if boot is None:
+        boot = finished - (startup_profiler.installed_at or started)
+    report = StartupReport(
+        boot=boot,
+        imports=startup_profiler.total,
+        collection=finished - started,
+        modules=startup_profiler.slowest(STARTUP_TOP_MODULES),
+    )
+    worker_id = _worker_id(config)
+    config._startup_reports[worker_id] = report
+    workeroutput = getattr(config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["startup_report"] = report.to_dict()
+
+    profile_dir = config.getoption("startup_profile_dir")
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        path = os.path.join(profile_dir, f"{worker_id}.importtime.txt")
+        with open(path, "w") as profile_file:
+            profile_file.write(format_importtime(startup_profiler.timings))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect the startup report of an xdist worker."""
+    data = getattr(node, "workeroutput", {}).get("startup_report")
+    if data:
+        worker_id = node.workerinput["workerid"]
+        node.config._startup_reports[worker_id] = StartupReport.from_dict(data)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    reports = config._startup_reports
+    if not reports or not config.getoption("profile_startup"):
+        return
+    terminalreporter.section("startup profile")
+    for worker_id, report in sorted(reports.items()):
+        terminalreporter.write_line(
+            f"{worker_id}: boot={report.boot * 1000:.0f}ms "
+            f"imports={report.imports * 1000:.0f}ms "
+            f"collection={report.collection * 1000:.0f}ms"
+        )
+    slowest_id, slowest = max(reports.items(), key=lambda item: item[1].boot)
+    terminalreporter.write_line(f"slowest imports of {slowest_id} (self, cumulative):")
+    for timing in slowest.modules:
+        terminalreporter.write_line(
+            f"  {timing.self_time * 1000:7.1f}ms {timing.cumulative * 1000:7.1f}ms "
+            f"{timing.module}"
+        )
@@ -0,0 +1,114 @@
+import time
+
+import pytest
+
+from src.helpers.base_helpers import add_command_listener, remove_command_listener
+from src.helpers.trace_recorder import (
+    CONTROLLER,
+    TraceRecorder,
+    now_us,
+    set_active_recorder,
+    write_chrome_trace,
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--trace-timeline",
+        metavar="PATH",
+        default=None,
+        help="Write a Chrome Trace Event / Perfetto JSON timeline of the session.",
+    )
+
+
+class SessionTracer:
+    """
+    Records spans for fixtures, test bodies and gcloud commands of one process.
+    """
+
+    def __init__(self, recorder: TraceRecorder):
+        self.recorder = recorder
+        self._teardown_starts = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        start_us, timer = now_us(), time.perf_counter()
+        yield
+        self.recorder.add_span(
+            f"setup {fixturedef.argname}",
+            "fixture",
+            start_us,
+            int((time.perf_counter() - timer) * 1_000_000),
+            scope=fixturedef.scope,
+            test=request.node.nodeid,
+        )
+
+        def _mark_teardown_start():
+            self._teardown_starts[id(fixturedef)] = (now_us(), time.perf_counter())
+
+        # runs right before the fixture's own finalizers (LIFO order)
+        fixturedef.addfinalizer(_mark_teardown_start)
+
+    def pytest_fixture_post_finalizer(self, fixturedef, request):
+        started = self._teardown_starts.pop(id(fixturedef), None)
+        if started is None:
+            return
+        start_us, timer = started
+        self.recorder.add_span(
+            f"teardown {fixturedef.argname}",
+            "fixture",
+            start_us,
+            int((time.perf_counter() - timer) * 1_000_000),
+            scope=fixturedef.scope,
+        )
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        with self.recorder.span(item.nodeid, "test"):
+            yield
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Start tracing before other plugins run their preconditions."""
+    if not config.getoption("trace_timeline"):
+        return
+    worker_id = getattr(config, "workerinput", {}).get("workerid", CONTROLLER)
+    recorder = TraceRecorder(worker_id)
+    tracer = SessionTracer(recorder)
+    config._trace_recorder = recorder
+    config._trace_worker_events = []
+    set_active_recorder(recorder)
+    add_command_listener(recorder)
+    config.pluginmanager.register(tracer, "session_tracer")
+
+
+def pytest_sessionfinish(session):
+    """Hand worker spans to the xdist controller."""
+    config = session.config
+    recorder = getattr(config, "_trace_recorder", None)
+    if recorder is not None and hasattr(config, "workerinput"):
+        config.workeroutput["trace_events"] = recorder.events
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect spans reported by an xdist worker."""
+    events = getattr(node, "workeroutput", {}).get("trace_events")
+    if events and hasattr(node.config, "_trace_worker_events"):
+        node.config._trace_worker_events.extend(events)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_unconfigure(config):
+    """Write the merged timeline once teardown preconditions have run."""
+    recorder = getattr(config, "_trace_recorder", None)
+    if recorder is None:
+        return
+    set_active_recorder(None)
+    remove_command_listener(recorder)
+    if not hasattr(config, "workerinput"):
+        write_chrome_trace(
+            config.getoption("trace_timeline"),
+            recorder.events + config._trace_worker_events,
+        )
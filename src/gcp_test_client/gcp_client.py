@@ -1,8 +1,35 @@
-from typing import Optional
-
-from src.helpers.base_helpers import run_subprocess
-from src.helpers.config_helper import get_config_value
-from src.helpers.data_helper import GCPCommandResponse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from src.helpers.base_helpers import (
+    STREAM_CHUNK_SIZE,
+    iter_concurrently,
+    run_subprocess,
+    run_subprocess_with_input,
+    stream_subprocess,
+)
+from src.helpers.config_helper import get_settings
+from src.helpers.data_helper import (
+    GCPCommandError,
+    GCPCommandResponse,
+    ObjectRecord,
+    extract_object_urls,
+    has_wildcard,
+    iter_lines,
+    iter_payload_chunks,
+    parse_long_listing_line,
+)
+from src.helpers.sliced_download import (
+    DEFAULT_DOWNLOAD_PARALLELISM,
+    DEFAULT_SLICE_SIZE,
+    DownloadResult,
+    DownloadVerificationError,
+    download_to_paths,
+)
+
+DEFAULT_READ_PARALLELISM = 8
+NO_MATCHES_ERROR = "matched no objects"
 
 
 class GcpStorage:
@@ -25,6 +52,12 @@ class GcpStorage:
         response = run_subprocess(cmd)
         return response
 
+    @staticmethod
+    def gcloud_version() -> GCPCommandResponse:
+        cmd = ["gcloud", "version", "--format", 'value("Google Cloud SDK")']
+        response = run_subprocess(cmd)
+        return response
+
     @staticmethod
     def create_bucket(
         bucket: str,
@@ -160,7 +193,7 @@ class GcpStorage:
         region: str = None,
     ) -> GCPCommandResponse:
         if region is None:
-            region = get_config_value("region")
+            region = get_settings().region
         cmd = [
             "gcloud",
             "storage",
@@ -187,11 +220,66 @@ class GcpStorage:
         return response
 
     @staticmethod
-    def copy_file_to_bucket(local_file_path, bucket, file_name) -> GCPCommandResponse:
+    def _iter_listing(url: str, chunk_size: int) -> Iterator[ObjectRecord]:
+        cmd = ["gcloud", "storage", "ls", "--long", url]
+        try:
+            for line in iter_lines(stream_subprocess(cmd, chunk_size=chunk_size)):
+                record = parse_long_listing_line(line)
+                if record is not None:
+                    yield record
+        except GCPCommandError as e:
+            if NO_MATCHES_ERROR not in e.response.error:
+                raise
+
+    @staticmethod
+    def iter_objects(
+        bucket: str,
+        prefix: Union[str, Iterable[str]] = "",
+        glob: Optional[str] = None,
+        max_parallel: int = DEFAULT_READ_PARALLELISM,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[ObjectRecord]:
+        """
+        Yields the objects below `prefix` as gcloud pages through the
+        listing, without buffering it. `glob` is appended to the prefix
+        (`*` stays within one level, `**` crosses "/"); by default every
+        object below the prefix is listed. Several prefixes are listed
+        concurrently and their records interleave.
+        """
+        prefixes = [prefix] if isinstance(prefix, str) else list(prefix)
+        listings = [
+            GcpStorage._iter_listing(
+                f"gs://{bucket}/{prefix}{glob or '**'}", chunk_size
+            )
+            for prefix in prefixes
+        ]
+        if len(listings) == 1:
+            return listings[0]
+        return iter_concurrently(listings, max_parallel)
+
+    @staticmethod
+    def copy_file_to_bucket(
+        local_file_path, bucket, file_name, if_generation_match: Optional[str] = None
+    ) -> GCPCommandResponse:
         cmd = ["gcloud", "storage", "cp", local_file_path, f"gs://{bucket}/{file_name}"]
+        if if_generation_match:
+            cmd += ["--if-generation-match", if_generation_match]
         response = run_subprocess(cmd)
         return response
 
+    @staticmethod
+    def upload_stream_to_bucket(
+        payload: Union[str, bytes, Iterable[Union[str, bytes]]],
+        bucket: str,
+        file_name: str,
+        if_generation_match: Optional[str] = None,
+    ) -> GCPCommandResponse:
+        cmd = ["gcloud", "storage", "cp", "-", f"gs://{bucket}/{file_name}"]
+        if if_generation_match:
+            cmd += ["--if-generation-match", if_generation_match]
+        response = run_subprocess_with_input(cmd, iter_payload_chunks(payload))
+        return response
+
     @staticmethod
     def enable_credentials(project: str) -> GCPCommandResponse:
         cmd = [
@@ -207,7 +295,7 @@ class GcpStorage:
 
     @staticmethod
     def add_policy_binding(project_id, sa) -> tuple[GCPCommandResponse, str]:
-        user = get_config_value("user_with_billing_setup")
+        user = get_settings().user_with_billing_setup
         cmd = [
             "gcloud",
             "iam",
@@ -271,6 +359,165 @@ class GcpStorage:
         response = run_subprocess(cmd)
         return response
 
+    @staticmethod
+    def stream_file_from_url(
+        url: str,
+        range_value: Optional[str] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        cmd = ["gcloud", "storage", "cat", url]
+
+        if range_value:
+            cmd += ["--range", range_value]
+
+        return stream_subprocess(cmd, chunk_size=chunk_size)
+
+    @staticmethod
+    def expand_object_urls(
+        urls, max_parallel: int = DEFAULT_READ_PARALLELISM
+    ) -> Dict[str, Union[List[str], GCPCommandResponse]]:
+        """
+        Maps every URL to the object URLs it names, listing each wildcard
+        URL once; a listing that fails maps to its response instead.
+        """
+        if isinstance(urls, str):
+            urls = [urls]
+        patterns = [url for url in urls if has_wildcard(url)]
+        listings = {}
+        if patterns:
+            with ThreadPoolExecutor(min(max_parallel, len(patterns))) as pool:
+                responses = pool.map(
+                    lambda url: run_subprocess(["gcloud", "storage", "ls", url]),
+                    patterns,
+                )
+                listings = dict(zip(patterns, responses))
+        expanded = {}
+        for url in urls:
+            response = listings.get(url)
+            if response is None:
+                expanded[url] = [url]
+            elif response.status_code != 0:
+                expanded[url] = response
+            else:
+                expanded[url] = extract_object_urls(response.output)
+        return expanded
+
+    @staticmethod
+    def read_objects(
+        urls,
+        max_parallel: int = DEFAULT_READ_PARALLELISM,
+        stream: bool = False,
+        **cat_options,
+    ) -> Dict[str, Union[GCPCommandResponse, Iterator[bytes]]]:
+        """
+        Reads each object named by `urls` with its own `storage cat`, at most
+        `max_parallel` at a time, and returns {object URL: response} in
+        listing order. A wildcard URL whose listing fails maps to that
+        response. With stream=True the values are lazy byte streams
+        (`cat_options` then only accepts range_value and chunk_size).
+        """
+        results = {}
+        object_urls = []
+        for url, expansion in GcpStorage.expand_object_urls(
+            urls, max_parallel
+        ).items():
+            if isinstance(expansion, GCPCommandResponse):
+                results[url] = expansion
+                continue
+            for object_url in expansion:
+                if object_url not in results:
+                    results[object_url] = None
+                    object_urls.append(object_url)
+        if stream:
+            for object_url in object_urls:
+                results[object_url] = GcpStorage.stream_file_from_url(
+                    object_url, **cat_options
+                )
+        elif object_urls:
+            with ThreadPoolExecutor(min(max_parallel, len(object_urls))) as pool:
+                responses = pool.map(
+                    lambda object_url: GcpStorage.cat_file_from_url(
+                        object_url, **cat_options
+                    ),
+                    object_urls,
+                )
+                results.update(zip(object_urls, responses))
+        return results
+
+    @staticmethod
+    def download_object(
+        url: str,
+        destination: str,
+        slice_size: int = DEFAULT_SLICE_SIZE,
+        max_parallel: int = DEFAULT_DOWNLOAD_PARALLELISM,
+        verify: bool = True,
+    ) -> DownloadResult:
+        """
+        Downloads one object in concurrent byte-range slices into a
+        memory-mapped file. Raises GCPCommandError when a command fails and
+        DownloadVerificationError when the file does not match the object.
+        """
+        result = download_to_paths(
+            GcpStorage, {url: destination}, slice_size, max_parallel, verify
+        )[url]
+        if isinstance(result, GCPCommandResponse):
+            raise GCPCommandError(result)
+        if result.verified is False:
+            raise DownloadVerificationError(f"{destination} does not match {url}")
+        return result
+
+    @staticmethod
+    def download_objects(
+        urls,
+        destination_dir: str,
+        slice_size: int = DEFAULT_SLICE_SIZE,
+        max_parallel: int = DEFAULT_DOWNLOAD_PARALLELISM,
+        verify: bool = True,
+    ) -> Dict[str, Union[DownloadResult, GCPCommandResponse]]:
+        """
+        Downloads every object named by `urls` (wildcards included) below
+        `destination_dir`, keeping object paths, with at most `max_parallel`
+        slices in flight overall. Returns {object URL: result} in listing
+        order; failed listings and downloads map to their responses.
+        """
+        results = {}
+        destinations = {}
+        for url, expansion in GcpStorage.expand_object_urls(
+            urls, max_parallel
+        ).items():
+            if isinstance(expansion, GCPCommandResponse):
+                results[url] = expansion
+                continue
+            for object_url in expansion:
+                object_name = object_url.split("/", 3)[3]
+                path = os.path.join(destination_dir, *object_name.split("/"))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                results[object_url] = None
+                destinations[object_url] = path
+        results.update(
+            download_to_paths(
+                GcpStorage, destinations, slice_size, max_parallel, verify
+            )
+        )
+        return results
+
+    @staticmethod
+    def describe_object(
+        object_url: str,
+        raw: bool = False,
+        format: Optional[str] = None,
+    ) -> GCPCommandResponse:
+        cmd = ["gcloud", "storage", "objects", "describe", object_url]
+
+        if raw:
+            cmd.append("--raw")
+
+        if format:
+            cmd += ["--format", format]
+
+        response = run_subprocess(cmd)
+        return response
+
     @staticmethod
     def describe_bucket(
         bucket_url: str,
@@ -1,5 +1,6 @@
 from assertpy import assert_that
 
+from src.helpers.checksum_helper import ObjectChecksums
 from src.helpers.data_helper import GCPCommandResponse
 
 
@@ -13,3 +14,20 @@ class AssertHelper:
         """
         assert_that(response.status_code).is_equal_to(code)
         assert_that(response.output).contains(expected_message)
+
+    @staticmethod
+    def assert_checksums_match(
+        actual: ObjectChecksums, expected: ObjectChecksums
+    ) -> None:
+        """
+        Assert that streamed digests match the object's metadata hashes.
+        MD5 is only compared when the metadata has one (non-composite objects).
+        """
+        assert_that(expected.crc32c, description="Object has no CRC32C").is_not_none()
+        assert_that(actual.crc32c, description="CRC32C mismatch").is_equal_to(
+            expected.crc32c
+        )
+        if expected.md5 is not None:
+            assert_that(actual.md5, description="MD5 mismatch").is_equal_to(
+                expected.md5
+            )
@@ -1,12 +1,94 @@
+import os
+import queue
+import shlex
 import subprocess
-from typing import List, Union
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Union
 
-from src.helpers.data_helper import GCPCommandResponse
+from src.helpers.data_helper import CommandRecord, GCPCommandError, GCPCommandResponse
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Overrides the gcloud executable, e.g. "python -m src.stand_in.gcloud"
+GCLOUD_EXECUTABLE_ENV = "GCLOUD_EXECUTABLE"
+
+# gcloud command groups; the first token after them is the command verb
+GCLOUD_COMMAND_GROUPS = {
+    "storage",
+    "buckets",
+    "objects",
+    "projects",
+    "iam",
+    "service-accounts",
+    "services",
+    "billing",
+    "auth",
+    "config",
+}
+
+_command_listeners: List[Callable[[CommandRecord], None]] = []
+
+
+def add_command_listener(listener: Callable[[CommandRecord], None]) -> None:
+    """
+    Registers a callable invoked with a CommandRecord after every command.
+    """
+    _command_listeners.append(listener)
+
+
+def remove_command_listener(listener: Callable[[CommandRecord], None]) -> None:
+    if listener in _command_listeners:
+        _command_listeners.remove(listener)
+
+
+def command_label(command: Union[List[str], str]) -> str:
+    """
+    Short name of a gcloud command, e.g. 'storage buckets create'.
+    """
+    tokens = command.split() if isinstance(command, str) else list(command)
+    if tokens and tokens[0].endswith("gcloud"):
+        tokens = tokens[1:]
+    label = []
+    for token in tokens:
+        if token.startswith("-"):
+            break
+        label.append(token)
+        if token not in GCLOUD_COMMAND_GROUPS:
+            break
+    return " ".join(label)
+
+
+def resolve_command(command: Union[List[str], str]) -> Union[List[str], str]:
+    """
+    Replaces a leading 'gcloud' with the executable from GCLOUD_EXECUTABLE.
+    """
+    executable = os.environ.get(GCLOUD_EXECUTABLE_ENV)
+    if not executable or isinstance(command, str) or command[:1] != ["gcloud"]:
+        return command
+    return shlex.split(executable) + list(command[1:])
+
+
+def _notify_command_listeners(command, started, duration, status_code) -> None:
+    if not _command_listeners:
+        return
+    record = CommandRecord(
+        command=command if isinstance(command, list) else [command],
+        label=command_label(command),
+        started=started,
+        duration=duration,
+        status_code=status_code,
+    )
+    for listener in list(_command_listeners):
+        listener(record)
 
 
 def run_subprocess(command: Union[List[str], str]) -> GCPCommandResponse:
+    started, timer = time.time(), time.perf_counter()
     res = subprocess.run(
-        args=command,
+        args=resolve_command(command),
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
@@ -16,4 +98,147 @@ def run_subprocess(command: Union[List[str], str]) -> GCPCommandResponse:
         output=(res.stdout or "").strip(),
         error=(res.stderr or "").strip(),
     )
+    _notify_command_listeners(
+        command, started, time.perf_counter() - timer, res.returncode
+    )
     return response
+
+
+def run_subprocess_with_input(
+    command: Union[List[str], str], chunks: Iterable[bytes]
+) -> GCPCommandResponse:
+    """
+    Runs a command, writing `chunks` to its stdin as they are produced, so the
+    input is never materialized in memory or on disk.
+    """
+    started, timer = time.time(), time.perf_counter()
+    process = subprocess.Popen(
+        args=resolve_command(command),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    feed_errors = []
+
+    def _feed():
+        try:
+            for chunk in chunks:
+                process.stdin.write(chunk)
+        except BrokenPipeError:
+            pass  # the command exited early; its output says why
+        except Exception as e:
+            # never let a partial payload reach the command as a complete one
+            feed_errors.append(e)
+            process.kill()
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    feeder = threading.Thread(target=_feed, daemon=True)
+    feeder.start()
+    output = process.stdout.read()
+    process.wait()
+    feeder.join()
+    process.stdout.close()
+    _notify_command_listeners(
+        command, started, time.perf_counter() - timer, process.returncode
+    )
+    if feed_errors:
+        raise feed_errors[0]
+    return GCPCommandResponse(
+        status_code=process.returncode,
+        output=output.decode("utf-8", errors="replace").strip(),
+        error="",
+    )
+
+
+def stream_subprocess(
+    command: Union[List[str], str], chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Runs a command and yields its binary stdout in chunks as it arrives.
+    Raises GCPCommandError with the captured stderr if the command fails.
+    """
+    started, timer = time.time(), time.perf_counter()
+    # stderr goes to a file so a chatty command cannot block on a full pipe
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(
+            args=resolve_command(command), stdout=subprocess.PIPE, stderr=stderr_file
+        )
+        try:
+            while chunk := process.stdout.read(chunk_size):
+                yield chunk
+            process.wait()
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            _notify_command_listeners(
+                command, started, time.perf_counter() - timer, process.returncode
+            )
+        if process.returncode != 0:
+            stderr_file.seek(0)
+            raise GCPCommandError(
+                GCPCommandResponse(
+                    status_code=process.returncode,
+                    output="",
+                    error=stderr_file.read().decode("utf-8", errors="replace").strip(),
+                )
+            )
+
+
+def iter_concurrently(
+    iterables: List[Iterable], max_parallel: int, queue_depth: int = 256
+) -> Iterator:
+    """
+    Yields the items of several iterables as they are produced, consuming at
+    most `max_parallel` of them at once on worker threads. A bounded queue
+    keeps memory constant; closing the generator early stops the workers.
+    """
+    items = queue.Queue(maxsize=queue_depth)
+    stop = threading.Event()
+
+    def _put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _drain(iterable) -> None:
+        if stop.is_set():
+            return
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not _put((False, item)):
+                    return
+            _put((True, None))
+        except BaseException as e:
+            _put((True, e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    pool = ThreadPoolExecutor(max(1, min(max_parallel, len(iterables))))
+    try:
+        for iterable in iterables:
+            pool.submit(_drain, iterable)
+        finished = 0
+        while finished < len(iterables):
+            done, value = items.get()
+            if not done:
+                yield value
+                continue
+            finished += 1
+            if value is not None:
+                raise value
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
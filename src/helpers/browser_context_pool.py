@@ -0,0 +1,167 @@
+"""
+Pool of reusable Playwright browser contexts.
+
+Contexts are pre-warmed once per worker, reset between leases and recycled
+after a number of uses or when their JS heap grows beyond a threshold.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterator, Optional, Set
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, BrowserContext, Page, Request
+
+BLANK_PAGE = "about:blank"
+# every origin-scoped store: local/session storage, IndexedDB, caches,
+# service workers, file systems and the origin's cookies
+_CLEARED_STORAGE_TYPES = "all"
+_JS_HEAP_USED_JS = (
+    "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+)
+
+
+@dataclass
+class PooledContext:
+    """
+    A browser context with its primary page and usage bookkeeping.
+    """
+
+    context: "BrowserContext"
+    page: "Page"
+    uses: int = 0
+    origins: Set[str] = field(default_factory=set)
+
+    def record_origin(self, request: "Request") -> None:
+        """Remember the origin of a request, so its storage is cleared on reset."""
+        url = urlsplit(request.url)
+        if url.scheme in ("http", "https") and url.netloc:
+            self.origins.add(f"{url.scheme}://{url.netloc}")
+
+
+@dataclass
+class ContextPoolStats:
+    """
+    Lease and recycling statistics of a context pool.
+    """
+
+    leases: int = 0
+    created: int = 0
+    recycled: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "leases": self.leases,
+            "created": self.created,
+            "recycled": self.recycled,
+        }
+
+
+class BrowserContextPool:
+    """
+    Pre-warmed pool of browser contexts leased to tests one at a time.
+    """
+
+    def __init__(
+        self,
+        browser: "Browser",
+        size: int = 2,
+        max_uses: int = 20,
+        max_heap_bytes: Optional[int] = None,
+        default_timeout_ms: Optional[int] = None,
+        **context_options,
+    ):
+        self.browser = browser
+        self.size = size
+        self.max_uses = max_uses
+        self.max_heap_bytes = max_heap_bytes
+        self.default_timeout_ms = default_timeout_ms
+        self.context_options = context_options
+        self.stats = ContextPoolStats()
+        self._idle: deque = deque()
+
+    def warm_up(self) -> None:
+        """Create contexts until the pool holds `size` idle contexts."""
+        while len(self._idle) < self.size:
+            self._idle.append(self._new_context())
+
+    def _new_context(self) -> PooledContext:
+        context = self.browser.new_context(**self.context_options)
+        if self.default_timeout_ms is not None:
+            context.set_default_timeout(self.default_timeout_ms)
+        self.stats.created += 1
+        pooled = PooledContext(context=context, page=context.new_page())
+        context.on("request", pooled.record_origin)
+        return pooled
+
+    def _is_leaking(self, pooled: PooledContext) -> bool:
+        if self.max_heap_bytes is None:
+            return False
+        try:
+            heap_used = pooled.page.evaluate(_JS_HEAP_USED_JS)
+        except Exception:
+            return True
+        return heap_used > self.max_heap_bytes
+
+    def _reset(self, pooled: PooledContext) -> None:
+        """
+        Replace all pages with a blank one, which drops session storage, and
+        clear cookies, permissions and the storage of every origin the
+        context has requested.
+        """
+        old_pages = list(pooled.context.pages)
+        pooled.page = pooled.context.new_page()
+        for old_page in old_pages:
+            old_page.close()
+        cdp = pooled.context.new_cdp_session(pooled.page)
+        try:
+            for origin in sorted(pooled.origins):
+                cdp.send(
+                    "Storage.clearDataForOrigin",
+                    {"origin": origin, "storageTypes": _CLEARED_STORAGE_TYPES},
+                )
+        finally:
+            cdp.detach()
+        pooled.origins.clear()
+        pooled.context.clear_cookies()
+        pooled.context.clear_permissions()
+
+    def _retire(self, pooled: PooledContext) -> None:
+        self.stats.recycled += 1
+        try:
+            pooled.context.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def lease(self) -> Iterator[PooledContext]:
+        """Lease an idle context, returning it to the pool when done."""
+        pooled = self._idle.popleft() if self._idle else self._new_context()
+        self.stats.leases += 1
+        pooled.uses += 1
+        try:
+            yield pooled
+        finally:
+            self._release(pooled)
+
+    def _should_recycle(self, pooled: PooledContext) -> bool:
+        if pooled.page.is_closed() or pooled.uses >= self.max_uses:
+            return True
+        return self._is_leaking(pooled)
+
+    def _release(self, pooled: PooledContext) -> None:
+        if not self._should_recycle(pooled):
+            try:
+                self._reset(pooled)
+                self._idle.append(pooled)
+                return
+            except Exception:
+                pass
+        self._retire(pooled)
+        self._idle.append(self._new_context())
+
+    def close(self) -> None:
+        while self._idle:
+            self._idle.popleft().context.close()
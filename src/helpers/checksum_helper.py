@@ -0,0 +1,145 @@
+"""
+Streaming CRC32C / MD5 verification of object content.
+
+Bytes are hashed incrementally, so verifying an object of any size uses
+constant memory. Digests are encoded the way GCS reports them in object
+metadata (base64 of the big-endian CRC32C and of the MD5 digest).
+"""
+
+import base64
+import hashlib
+import json
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+try:
+    import google_crc32c
+except ImportError:  # pragma: no cover - pure Python fallback
+    google_crc32c = None
+
+_CRC32C_POLY = 0x82F63B78
+_CRC32C_TABLE = []
+for _byte in range(256):
+    _crc = _byte
+    for _ in range(8):
+        _crc = (_crc >> 1) ^ _CRC32C_POLY if _crc & 1 else _crc >> 1
+    _CRC32C_TABLE.append(_crc)
+
+_QUEUE_DEPTH = 8
+_END_OF_STREAM = object()
+
+
+class Crc32c:
+    """
+    Incremental CRC32C, backed by google-crc32c when it is installed.
+    """
+
+    def __init__(self):
+        self._checksum = google_crc32c.Checksum() if google_crc32c else None
+        self._crc = 0
+
+    def update(self, data: bytes) -> None:
+        if self._checksum is not None:
+            self._checksum.update(data)
+            return
+        crc = self._crc ^ 0xFFFFFFFF
+        for byte in data:
+            crc = _CRC32C_TABLE[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+        self._crc = crc ^ 0xFFFFFFFF
+
+    def digest(self) -> bytes:
+        if self._checksum is not None:
+            return self._checksum.digest()
+        return self._crc.to_bytes(4, "big")
+
+
+@dataclass(frozen=True)
+class ObjectChecksums:
+    """
+    Base64-encoded CRC32C and MD5 of an object. MD5 is None for composite objects.
+    """
+
+    crc32c: Optional[str]
+    md5: Optional[str]
+
+    @classmethod
+    def from_describe_output(cls, output: str) -> "ObjectChecksums":
+        """
+        Parses hashes from `gcloud storage objects describe --format=json`
+        output, with or without --raw.
+        """
+        metadata = json.loads(output)
+        return cls(
+            crc32c=metadata.get("crc32c_hash") or metadata.get("crc32c"),
+            md5=metadata.get("md5_hash") or metadata.get("md5Hash"),
+        )
+
+
+class StreamingDigests:
+    """
+    CRC32C and MD5 computed incrementally over a byte stream.
+    """
+
+    def __init__(self):
+        self._crc32c = Crc32c()
+        self._md5 = hashlib.md5()
+        self.size = 0
+
+    def update(self, chunk: bytes) -> None:
+        self._crc32c.update(chunk)
+        self._md5.update(chunk)
+        self.size += len(chunk)
+
+    def checksums(self) -> ObjectChecksums:
+        return ObjectChecksums(
+            crc32c=base64.b64encode(self._crc32c.digest()).decode("ascii"),
+            md5=base64.b64encode(self._md5.digest()).decode("ascii"),
+        )
+
+
+def compute_checksums(
+    chunks: Iterable[bytes], parallel: bool = True
+) -> ObjectChecksums:
+    """
+    Hashes a chunk stream. With `parallel`, chunks are read on a separate
+    thread so downloading and hashing overlap; a bounded queue keeps memory
+    constant.
+    """
+    digests = StreamingDigests()
+    if not parallel:
+        for chunk in chunks:
+            digests.update(chunk)
+        return digests.checksums()
+
+    pending = queue.Queue(maxsize=_QUEUE_DEPTH)
+    errors = []
+
+    def _read_chunks():
+        try:
+            for chunk in chunks:
+                pending.put(chunk)
+        except BaseException as error:
+            errors.append(error)
+        finally:
+            pending.put(_END_OF_STREAM)
+
+    reader = threading.Thread(target=_read_chunks, daemon=True)
+    reader.start()
+    while (chunk := pending.get()) is not _END_OF_STREAM:
+        digests.update(chunk)
+    reader.join()
+    if errors:
+        raise errors[0]
+    return digests.checksums()
+
+
+def get_object_checksums(gcp_client, object_url: str) -> ObjectChecksums:
+    """
+    Reads the CRC32C and MD5 hashes from the object's metadata.
+    """
+    response = gcp_client.describe_object(object_url=object_url, format="json")
+    if response.status_code != 0:
+        raise ValueError(f"Could not describe {object_url}: {response.output}")
+    return ObjectChecksums.from_describe_output(response.output)
@@ -0,0 +1,76 @@
+"""
+Latency aggregation for executed gcloud commands.
+"""
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class CommandStats:
+    """
+    Summary statistics of one command label.
+    """
+
+    label: str
+    count: int
+    total: float
+    p50: float
+    p95: float
+    p99: float
+
+
+class CommandMetrics:
+    """
+    Durations of executed commands grouped by command label.
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    def __bool__(self) -> bool:
+        return bool(self.durations)
+
+    def add(self, label: str, duration: float) -> None:
+        self.durations[label].append(duration)
+
+    def extend(self, timings: Iterable[Tuple[str, float]]) -> None:
+        for label, duration in timings:
+            self.add(label, duration)
+
+    @property
+    def total(self) -> float:
+        return sum(sum(values) for values in self.durations.values())
+
+    @property
+    def count(self) -> int:
+        return sum(len(values) for values in self.durations.values())
+
+    def stats(self) -> List[CommandStats]:
+        """Per-label statistics, slowest total first."""
+        rows = []
+        for label, values in self.durations.items():
+            ordered = sorted(values)
+            rows.append(
+                CommandStats(
+                    label=label,
+                    count=len(ordered),
+                    total=sum(ordered),
+                    p50=percentile(ordered, 50),
+                    p95=percentile(ordered, 95),
+                    p99=percentile(ordered, 99),
+                )
+            )
+        return sorted(rows, key=lambda row: -row.total)
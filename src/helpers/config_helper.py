@@ -1,27 +1,154 @@
+"""
+Typed settings loaded from config.json, environment variables and overrides.
+
+Settings are parsed once into an immutable snapshot. Without a pinned
+snapshot, get_settings() re-reads config.json only when its mtime changes,
+which keeps long-running tools current; a pytest session pins its snapshot
+on the controller and hands it to xdist workers, which never read the file.
+"""
+
 import json
+import os
+from dataclasses import dataclass, field, fields
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Tuple
 
+CONFIG_PATH = Path(__file__).parent.parent / "config.json"
+ENV_PREFIX = "GCS_TESTS_"
 
-def get_config():
+
+@dataclass(frozen=True)
+class Settings:
     """
-    Read the config.json file and return its contents as a dictionary.
+    Immutable configuration snapshot; keys without a field stay in `extra`.
     """
-    src_dir = Path(__file__).parent.parent
-    config_path = src_dir / "config.json"
 
+    user_with_billing_setup: Optional[str] = None
+    default_project: Optional[str] = None
+    default_bucket: Optional[str] = None
+    region: Optional[str] = None
+    extra: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Settings":
+        known = {f.name for f in fields(cls)} - {"extra"}
+        return cls(
+            **{key: value for key, value in data.items() if key in known},
+            extra=MappingProxyType(
+                {key: value for key, value in data.items() if key not in known}
+            ),
+        )
+
+    def to_dict(self) -> dict:
+        data = {
+            f.name: getattr(self, f.name) for f in fields(self) if f.name != "extra"
+        }
+        data.update(self.extra)
+        return data
+
+    def get(self, key: str, default=None):
+        if key in self.extra:
+            value = self.extra[key]
+        else:
+            value = getattr(self, key, None) if key != "extra" else None
+        return default if value is None else value
+
+    def get_flag(self, key: str, default: bool = False) -> bool:
+        """A boolean setting; "true"/"false" strings from overrides parse too."""
+        value = self.get(key)
+        if value is None:
+            return default
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "yes", "on")
+        return bool(value)
+
+    def with_overrides(self, overrides: Mapping[str, Any]) -> "Settings":
+        """A copy with `overrides` applied on top of this snapshot."""
+        if not overrides:
+            return self
+        return Settings.from_dict({**self.to_dict(), **overrides})
+
+
+def env_overrides(environ: Mapping[str, str] = os.environ) -> dict:
+    """Settings given as GCS_TESTS_<KEY> variables, e.g. GCS_TESTS_REGION."""
+    return {
+        name[len(ENV_PREFIX) :].lower(): value
+        for name, value in environ.items()
+        if name.startswith(ENV_PREFIX) and len(name) > len(ENV_PREFIX)
+    }
+
+
+def parse_overrides(items) -> dict:
+    """KEY=VALUE strings (e.g. from the command line) as a dict."""
+    overrides = {}
+    for item in items or ():
+        key, separator, value = item.partition("=")
+        if not separator or not key:
+            raise ValueError(f"Expected KEY=VALUE, got {item!r}")
+        overrides[key.strip()] = value
+    return overrides
+
+
+def load_settings(
+    config_path: Path = CONFIG_PATH,
+    environ: Mapping[str, str] = os.environ,
+    overrides: Optional[Mapping[str, Any]] = None,
+) -> Settings:
+    """
+    Parse config.json; environment variables override the file and
+    `overrides` override both.
+    """
     try:
         with open(config_path, "r") as config_file:
             config_data = json.load(config_file)
-        return config_data
     except FileNotFoundError:
         raise FileNotFoundError(f"Config file not found at {config_path}")
     except json.JSONDecodeError:
         raise ValueError(f"Invalid JSON in config file at {config_path}")
+    return (
+        Settings.from_dict(config_data)
+        .with_overrides(env_overrides(environ))
+        .with_overrides(overrides)
+    )
+
+
+_pinned: Optional[Settings] = None
+_cached: Optional[Tuple[Tuple[int, int], Settings]] = None
+
+
+def pin_settings(settings: Optional[Settings]) -> None:
+    """Serve `settings` from get_settings() (None resumes reading the file)."""
+    global _pinned
+    _pinned = settings
+
+
+def get_settings() -> Settings:
+    """
+    The pinned snapshot, or config.json cached until its mtime changes.
+    """
+    global _cached
+    if _pinned is not None:
+        return _pinned
+    try:
+        stat = os.stat(CONFIG_PATH)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found at {CONFIG_PATH}")
+    version = (stat.st_mtime_ns, stat.st_size)
+    if _cached is None or _cached[0] != version:
+        _cached = (version, load_settings())
+    return _cached[1]
+
+
+def get_config():
+    """
+    Return the current settings as a dictionary.
+    """
+    return get_settings().to_dict()
 
 
 def get_config_value(key, default=None):
     """
     Get a specific value from the config.
     """
-    config = get_config()
-    return config.get(key, default)
+    return get_settings().get(key, default)
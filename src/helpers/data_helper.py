@@ -10,6 +10,9 @@ import glob
 import os
 import re
 from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Union
+
+DEFAULT_SAMPLE_FILE_CONTENT = "Hey there!\nYou have access to the file!"
 
 
 @dataclass
@@ -30,6 +33,54 @@ class GCPCommandResponse:
         )
 
 
+@dataclass
+class CommandRecord:
+    """
+    Timing of a single executed command, passed to command listeners.
+    """
+
+    command: list
+    label: str
+    started: float
+    duration: float
+    status_code: int
+
+
+@dataclass(frozen=True)
+class ObjectRecord:
+    """
+    One object of a `gcloud storage ls --long` listing.
+    """
+
+    url: str
+    size: int
+    updated: str
+
+    @property
+    def name(self) -> str:
+        return self.url.split("/", 3)[3]
+
+
+class GCPCommandError(Exception):
+    """
+    Raised when a streamed GCP command exits with a non-zero status.
+    """
+
+    def __init__(self, response: GCPCommandResponse):
+        super().__init__(
+            f"Command failed with code {response.status_code}: "
+            f"{response.error or response.output}"
+        )
+        self.response = response
+
+
+def is_precondition_failed(response: GCPCommandResponse) -> bool:
+    """
+    Whether a conditional request failed its precondition (HTTP 412).
+    """
+    return response.status_code != 0 and "HTTPError 412" in response.output
+
+
 def extract_ids(output: str) -> list:
     """
     Extracts PROJECT_IDs from gcloud project list command output.
@@ -57,32 +108,109 @@ def extract_bucket_ids(output_data) -> list:
     return bucket_ids
 
 
-def create_sample_text_file(file_name, file_content: str = None):
+def has_wildcard(url: str) -> bool:
+    """
+    Whether a gs:// URL contains wildcard characters.
+    """
+    return any(char in url for char in "*?[")
+
+
+def extract_object_urls(output: str) -> list:
+    """
+    Extracts object URLs from gcloud storage ls output, skipping prefixes.
+    """
+    urls = []
+    for line in output.splitlines():
+        line = line.strip()
+        if line.startswith("gs://") and not line.endswith(("/", ":")):
+            urls.append(line)
+    return urls
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Splits a stream of byte chunks into decoded lines as they arrive.
+    """
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8", errors="replace")
+    if pending:
+        yield pending.decode("utf-8", errors="replace")
+
+
+def parse_long_listing_line(line: str) -> Optional[ObjectRecord]:
     """
-    Creates a temporary text file for testing purposes.
+    Parses an object line of `gcloud storage ls --long` output; prefix and
+    TOTAL lines give None.
     """
+    parts = line.split()
+    if len(parts) != 3 or not parts[0].isdigit() or not parts[2].startswith("gs://"):
+        return None
+    return ObjectRecord(url=parts[2], size=int(parts[0]), updated=parts[1])
+
+
+def _get_temp_dir() -> str:
+    """
+    Returns the temp directory used for test files: the temp_dir setting,
+    or temp/ at the project root.
+    """
+    from src.helpers.config_helper import get_settings
+
+    temp_dir = get_settings().get("temp_dir")
+    if temp_dir:
+        return os.path.abspath(temp_dir)
     # Use absolute path to project root for consistent file creation
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-    temp_dir = os.path.join(project_root, "temp")
+    return os.path.join(project_root, "temp")
+
+
+def create_sample_text_file(file_name, file_content: Union[str, bytes] = None):
+    """
+    Creates a temporary file for testing purposes; text is written as UTF-8,
+    bytes as they are.
+    """
+    temp_dir = _get_temp_dir()
 
     # Create temp directory if it doesn't exist
     os.makedirs(temp_dir, exist_ok=True)
 
     test_file_path = os.path.join(temp_dir, file_name)
-    with open(test_file_path, "w") as test_file:
-        if not file_content:
-            file_content = "Hey there!\nYou have access to the file!"
-        test_file.write(file_content)
+    if not file_content:
+        file_content = DEFAULT_SAMPLE_FILE_CONTENT
+    with open(test_file_path, "wb") as test_file:
+        test_file.writelines(iter_payload_chunks(file_content))
     return test_file_path
 
 
+def iter_payload_chunks(
+    payload: Union[str, bytes, Iterable[Union[str, bytes]]],
+) -> Iterator[bytes]:
+    """
+    Normalizes an upload payload (text, bytes or an iterable of either) into
+    a stream of byte chunks.
+    """
+    if isinstance(payload, (str, bytes)):
+        payload = [payload]
+    for chunk in payload:
+        yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+
+def create_seeded_sample_file(file_name, seeded_object) -> str:
+    """
+    Streams a SeededObject into a temporary file with constant memory.
+    """
+    return seeded_object.write_to(os.path.join(_get_temp_dir(), file_name))
+
+
 def delete_temp_files():
     """
     Cleans up temporary text files created during testing.
     """
     # Use the same temp directory path as create_sample_text_file
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-    temp_dir = os.path.join(project_root, "temp")
+    temp_dir = _get_temp_dir()
 
     if os.path.exists(temp_dir):
         txt_files = glob.glob(os.path.join(temp_dir, "*.txt"))
@@ -0,0 +1,88 @@
+"""
+Deferred check scheduling for time-based tests.
+
+Instead of sleeping until a wall-clock condition holds (e.g. a signed URL
+expiring), a test registers a check with a due time and returns. Checks are
+run once due, so several waiting tests overlap and cost max(wait) instead of
+sum(wait).
+"""
+
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List
+
+
+@dataclass(order=True)
+class DeferredCheck:
+    """
+    A check to run at or after `due` (epoch seconds) on behalf of `owner`.
+    """
+
+    due: float
+    seq: int
+    check: Callable[[], Any] = field(compare=False)
+    owner: Any = field(compare=False, default=None)
+    description: str = field(compare=False, default="")
+
+
+class DeferredCheckScheduler:
+    """
+    Min-heap of deferred checks ordered by due time.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._clock = clock
+        self._sleep = sleep
+        self._heap: List[DeferredCheck] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def pending_for(self, owner: Any) -> int:
+        """Number of checks of `owner` that have not run yet."""
+        return sum(1 for deferred in self._heap if deferred.owner is owner)
+
+    def schedule(
+        self,
+        check: Callable[[], Any],
+        *,
+        at: float = None,
+        delay: float = None,
+        owner: Any = None,
+        description: str = "",
+    ) -> DeferredCheck:
+        """
+        Register a check due at epoch time `at` or `delay` seconds from now.
+        """
+        if (at is None) == (delay is None):
+            raise ValueError("Exactly one of 'at' or 'delay' must be given")
+        due = at if at is not None else self._clock() + delay
+        deferred = DeferredCheck(
+            due=due,
+            seq=next(self._seq),
+            check=check,
+            owner=owner,
+            description=description or getattr(check, "__name__", ""),
+        )
+        heapq.heappush(self._heap, deferred)
+        return deferred
+
+    def pop_due(self, block: bool = False) -> Iterator[DeferredCheck]:
+        """
+        Yield checks that are due. With `block`, wait for and yield every
+        remaining check in due order.
+        """
+        while self._heap:
+            remaining = self._heap[0].due - self._clock()
+            if remaining > 0:
+                if not block:
+                    return
+                self._sleep(remaining)
+            yield heapq.heappop(self._heap)
@@ -0,0 +1,84 @@
+"""
+Per-test duration history kept in the pytest cache.
+
+Each entry holds a smoothed duration (setup + call + teardown) and the
+expensive fixtures the test uses, so a scheduler can order work
+longest-first and keep tests that share costly fixtures together.
+"""
+
+import statistics
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+CACHE_KEY = "gcs_cli_tests/durations"
+DEFAULT_SMOOTHING = 0.5
+DEFAULT_ESTIMATE_S = 1.0
+
+
+@dataclass
+class DurationRecord:
+    """
+    Smoothed duration and expensive fixture group of a single test.
+    """
+
+    duration: float
+    runs: int = 1
+    fixture_group: List[str] = field(default_factory=list)
+
+
+class DurationHistory:
+    """
+    Duration records keyed by test node id.
+    """
+
+    def __init__(
+        self,
+        records: Optional[Dict[str, DurationRecord]] = None,
+        smoothing: float = DEFAULT_SMOOTHING,
+    ):
+        self.records: Dict[str, DurationRecord] = records or {}
+        self.smoothing = smoothing
+
+    @classmethod
+    def load(cls, cache) -> "DurationHistory":
+        """Load history from a pytest cache; empty if there is no cache."""
+        if cache is None:
+            return cls()
+        raw = cache.get(CACHE_KEY, {})
+        return cls({nodeid: DurationRecord(**record) for nodeid, record in raw.items()})
+
+    def save(self, cache) -> None:
+        if cache is not None:
+            cache.set(
+                CACHE_KEY,
+                {nodeid: asdict(record) for nodeid, record in self.records.items()},
+            )
+
+    def record(
+        self, nodeid: str, duration: float, fixture_group: Iterable[str] = ()
+    ) -> None:
+        """Fold a new measurement into the exponentially smoothed duration."""
+        fixture_group = sorted(fixture_group)
+        previous = self.records.get(nodeid)
+        if previous is None:
+            self.records[nodeid] = DurationRecord(duration, 1, fixture_group)
+            return
+        previous.duration += self.smoothing * (duration - previous.duration)
+        previous.runs += 1
+        previous.fixture_group = fixture_group
+
+    def default_estimate(self) -> float:
+        """Estimate for tests without history: the median known duration."""
+        if not self.records:
+            return DEFAULT_ESTIMATE_S
+        return statistics.median(record.duration for record in self.records.values())
+
+    def estimate(self, nodeid: str, default: Optional[float] = None) -> float:
+        record = self.records.get(nodeid)
+        if record is not None:
+            return record.duration
+        return self.default_estimate() if default is None else default
+
+    def fixture_group(self, nodeid: str) -> List[str]:
+        record = self.records.get(nodeid)
+        return record.fixture_group if record is not None else []
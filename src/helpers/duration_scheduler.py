@@ -0,0 +1,73 @@
+"""
+xdist scheduler that hands out work longest-processing-time first.
+
+Tests sharing expensive fixtures are grouped into one work unit so the
+fixture is set up on a single worker; groups bigger than a fair share of
+the session are split so one unit cannot dominate the makespan.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List
+
+from xdist.scheduler import LoadScopeScheduling
+
+from src.helpers.duration_history import DurationHistory
+
+
+class DurationScheduling(LoadScopeScheduling):
+    """
+    LoadScopeScheduling with history-based scopes and LPT ordering.
+    """
+
+    def __init__(self, config, log=None, history: DurationHistory = None):
+        super().__init__(config, log)
+        self.history = history or DurationHistory()
+        self._scopes: Dict[str, str] = {}
+        self._workqueue_sorted = False
+
+    def _split_scope(self, nodeid: str) -> str:
+        return self._scopes.get(nodeid, nodeid)
+
+    def _build_scopes(self, collection: List[str]) -> None:
+        """Group tests by expensive fixture group, capped at a fair share."""
+        default = self.history.default_estimate()
+        costs = {
+            nodeid: self.history.estimate(nodeid, default) for nodeid in collection
+        }
+        fair_share = sum(costs.values()) / max(len(self.nodes), 1)
+
+        groups: Dict[str, List[str]] = OrderedDict()
+        for nodeid in collection:
+            fixture_group = self.history.fixture_group(nodeid)
+            if fixture_group:
+                groups.setdefault(",".join(fixture_group), []).append(nodeid)
+            else:
+                self._scopes[nodeid] = nodeid
+
+        for group, nodeids in groups.items():
+            chunk, chunk_cost = 0, 0.0
+            for nodeid in nodeids:
+                if chunk_cost and chunk_cost + costs[nodeid] > fair_share:
+                    chunk, chunk_cost = chunk + 1, 0.0
+                self._scopes[nodeid] = f"fixtures:{group}#{chunk}"
+                chunk_cost += costs[nodeid]
+
+    def _unit_cost(self, work_unit: Dict[str, bool]) -> float:
+        default = self.history.default_estimate()
+        return sum(self.history.estimate(nodeid, default) for nodeid in work_unit)
+
+    def schedule(self) -> None:
+        if self.collection is None and self.registered_collections:
+            self._build_scopes(next(iter(self.registered_collections.values())))
+        super().schedule()
+
+    def _assign_work_unit(self, node) -> None:
+        if not self._workqueue_sorted:
+            self.workqueue = OrderedDict(
+                sorted(
+                    self.workqueue.items(),
+                    key=lambda item: -self._unit_cost(item[1]),
+                )
+            )
+            self._workqueue_sorted = True
+        super()._assign_work_unit(node)
@@ -0,0 +1,80 @@
+"""
+Content-addressed fixture objects.
+
+Object names start with a digest of their content, so an existing object
+with the name is known to hold the same bytes. Uploads are a single
+conditional write (if-generation-match=0): a 412 means the content is
+already there, written by another worker or an earlier session. Objects
+live under FIXTURE_PREFIX, out of reach of the session-end `*.txt` cleanup of
+the sample bucket, so later sessions find them again.
+"""
+
+import hashlib
+import threading
+from typing import Callable, Dict, Optional, Union
+
+from src.helpers.data_helper import GCPCommandResponse, is_precondition_failed
+from src.helpers.large_object_generator import SeededObject
+
+DIGEST_LENGTH = 16
+FIXTURE_PREFIX = "fixtures/"
+
+Payload = Union[str, bytes, SeededObject]
+
+
+def content_digest(payload: Payload) -> str:
+    """
+    Hex digest of a payload. A SeededObject is a pure function of its
+    parameters, so those are hashed instead of its (possibly large) content.
+    """
+    if isinstance(payload, SeededObject):
+        data = (
+            f"seeded:{payload.seed}:{payload.size}:"
+            f"{payload.block_size}:{payload.text}"
+        ).encode()
+    elif isinstance(payload, str):
+        data = payload.encode("utf-8")
+    else:
+        data = payload
+    return hashlib.sha256(data).hexdigest()[:DIGEST_LENGTH]
+
+
+def content_address(payload: Payload, label: Optional[str] = None) -> str:
+    """Object name for a payload; `label` keeps a readable suffix."""
+    digest = content_digest(payload)
+    name = f"{digest}-{label}" if label else f"{digest}.txt"
+    return FIXTURE_PREFIX + name
+
+
+class FixtureObjectStore:
+    """
+    Per-session index of the content-addressed objects of one bucket.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        upload: Callable[[str, Payload, str], GCPCommandResponse],
+    ):
+        self.bucket = bucket
+        self._upload = upload
+        self._index: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def put(self, payload: Payload, label: Optional[str] = None) -> str:
+        """Ensure the payload is stored; returns its gs:// URL."""
+        name = content_address(payload, label)
+        with self._lock:
+            url = self._index.get(name)
+            if url is None:
+                response = self._upload(name, payload, "0")
+                if response.status_code != 0 and not is_precondition_failed(response):
+                    raise AssertionError(
+                        f"Upload of {name} failed with code "
+                        f"{response.status_code}: {response.output}"
+                    )
+                url = self._index[name] = f"gs://{self.bucket}/{name}"
+        return url
@@ -0,0 +1,158 @@
+"""
+Import timings of the running process, in the spirit of `python -X importtime`.
+
+The profiler wraps `builtins.__import__` and times each import statement that
+loads a module not yet in `sys.modules`; time spent in nested imports is
+subtracted from the importing module's self time. Only imports made by the
+thread that installed the profiler are timed.
+"""
+
+import builtins
+import importlib.util
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class ImportTiming:
+    """
+    Time spent loading one module, with and without its nested imports.
+    """
+
+    module: str
+    self_time: float
+    cumulative: float
+    depth: int = 0
+
+
+@dataclass
+class StartupReport:
+    """
+    Boot time of one pytest process and the imports that made it up.
+    """
+
+    boot: float
+    imports: float
+    collection: float
+    modules: List[ImportTiming] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StartupReport":
+        return cls(
+            boot=data["boot"],
+            imports=data["imports"],
+            collection=data["collection"],
+            modules=[ImportTiming(**module) for module in data["modules"]],
+        )
+
+
+def process_uptime() -> Optional[float]:
+    """Seconds since this process started, where /proc tells."""
+    try:
+        with open("/proc/self/stat") as stat_file:
+            stat = stat_file.read()
+        with open("/proc/uptime") as uptime_file:
+            uptime = float(uptime_file.read().split()[0])
+    except OSError:
+        return None
+    # Field 22 (starttime) counts clock ticks since boot; the command name in
+    # field 2 may contain spaces, so count from its closing parenthesis.
+    start_ticks = int(stat.rsplit(")", 1)[1].split()[19])
+    return max(uptime - start_ticks / os.sysconf("SC_CLK_TCK"), 0.0)
+
+
+def _resolve(name: str, globals: Optional[dict], level: int) -> str:
+    if level == 0:
+        return name
+    package = (globals or {}).get("__package__") or ""
+    try:
+        return importlib.util.resolve_name("." * level + name, package)
+    except (ImportError, ValueError):
+        return name
+
+
+def _missing_from(module_name: str, fromlist) -> Optional[str]:
+    """The name of the first module the import statement has yet to load."""
+    module = sys.modules.get(module_name)
+    if module is None:
+        return module_name
+    for item in fromlist or ():
+        if item != "*" and item not in module.__dict__:
+            return f"{module_name}.{item}"
+    return None
+
+
+class ImportProfiler:
+    """
+    Records fresh imports between install() and uninstall().
+    """
+
+    def __init__(self):
+        self.timings: List[ImportTiming] = []
+        self.installed_at: Optional[float] = None
+        self._original = None
+        self._thread: Optional[int] = None
+        self._child_time: List[float] = []
+        self._recording = False
+
+    def install(self) -> None:
+        if self._original is not None:
+            return
+        self._original = builtins.__import__
+        self._thread = threading.get_ident()
+        self.installed_at = time.perf_counter()
+        self._recording = True
+        builtins.__import__ = self._import
+
+    def uninstall(self) -> None:
+        """Stop timing; a later wrapper of `__import__` is left in place."""
+        self._recording = False
+        if builtins.__import__ == self._import:
+            builtins.__import__ = self._original
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if not self._recording or threading.get_ident() != self._thread:
+            return self._original(name, globals, locals, fromlist, level)
+        label = _missing_from(_resolve(name, globals, level), fromlist)
+        if label is None:
+            return self._original(name, globals, locals, fromlist, level)
+        depth = len(self._child_time)
+        self._child_time.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = self._child_time.pop()
+            if self._child_time:
+                self._child_time[-1] += elapsed
+            self.timings.append(ImportTiming(label, elapsed - children, elapsed, depth))
+
+    @property
+    def total(self) -> float:
+        """Time spent in top-level fresh imports."""
+        return sum(t.cumulative for t in self.timings if t.depth == 0)
+
+    def slowest(self, count: int) -> List[ImportTiming]:
+        return sorted(self.timings, key=lambda t: -t.self_time)[:count]
+
+
+def format_importtime(timings: List[ImportTiming]) -> str:
+    """Timings in the `python -X importtime` layout, in completion order."""
+    lines = ["import time: self [us] | cumulative | imported package"]
+    for timing in timings:
+        lines.append(
+            f"import time: {timing.self_time * 1e6:9.0f} | "
+            f"{timing.cumulative * 1e6:10.0f} | {'  ' * timing.depth}{timing.module}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+startup_profiler = ImportProfiler()
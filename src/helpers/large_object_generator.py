@@ -0,0 +1,118 @@
+"""
+Deterministic, streamable test objects of arbitrary size.
+
+Content is derived block by block from a seed, so any byte range can be
+computed in O(range) without materializing the object, and the same seed
+always yields the same bytes on every worker and run.
+"""
+
+import os
+import random
+from typing import Iterator, Optional, Tuple
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# 64 URL/shell-safe ASCII characters without whitespace, so content is valid
+# UTF-8 text and survives output stripping in run_subprocess.
+_ALPHABET = (
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+)
+_TEXT_TABLE = bytes(_ALPHABET[i % len(_ALPHABET)] for i in range(256))
+
+
+def parse_byte_range(range_value: str, size: int) -> Tuple[int, int]:
+    """
+    Resolve a gcloud `--range` value against an object size.
+
+    Supports `start-end` (inclusive), `start-` and `-N` (last N bytes).
+    Returns a half-open (start, stop) pair clamped to the object size.
+    """
+    start_str, sep, end_str = range_value.partition("-")
+    if not sep or (not start_str and not end_str):
+        raise ValueError(f"Invalid range value: {range_value!r}")
+    if not start_str:
+        return max(size - int(end_str), 0), size
+    start = min(int(start_str), size)
+    if not end_str:
+        return start, size
+    end = int(end_str)
+    if end < start:
+        raise ValueError(f"Invalid range value: {range_value!r}")
+    return start, min(end + 1, size)
+
+
+class SeededObject:
+    """
+    Virtual object of `size` bytes generated from `seed`.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        seed: int = 0,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        text: bool = True,
+    ):
+        if size < 0:
+            raise ValueError("size must be non-negative")
+        self.size = size
+        self.seed = seed
+        self.block_size = block_size
+        self.text = text
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return f"SeededObject(size={self.size}, seed={self.seed})"
+
+    def block(self, index: int) -> bytes:
+        """Bytes of block `index` (the last block may be short)."""
+        offset = index * self.block_size
+        length = min(self.block_size, self.size - offset)
+        if length <= 0:
+            return b""
+        data = random.Random(f"{self.seed}:{index}").randbytes(self.block_size)
+        if self.text:
+            data = data.translate(_TEXT_TABLE)
+        return data[:length]
+
+    def iter_range(
+        self, start: int = 0, stop: Optional[int] = None, chunk_size: int = None
+    ) -> Iterator[bytes]:
+        """
+        Stream bytes [start, stop) in block-aligned pieces, or in pieces of
+        `chunk_size` bytes when given.
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        if chunk_size:
+            for chunk_start in range(start, stop, chunk_size):
+                yield self.read(chunk_start, min(chunk_start + chunk_size, stop))
+            return
+        position = start
+        while position < stop:
+            index, block_offset = divmod(position, self.block_size)
+            piece = self.block(index)[block_offset : block_offset + stop - position]
+            yield piece
+            position += len(piece)
+
+    def read(self, start: int, stop: int) -> bytes:
+        """Bytes [start, stop) of the object."""
+        return b"".join(self.iter_range(start, stop))
+
+    def expected_range(self, range_value: str) -> bytes:
+        """Expected bytes for a gcloud `--range` value."""
+        return self.read(*parse_byte_range(range_value, self.size))
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Stream the whole object in chunks of `chunk_size` bytes."""
+        return self.iter_range(0, self.size, chunk_size=chunk_size)
+
+    def write_to(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+        """Stream the object to `path` with constant memory."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as target:
+            for chunk in self.iter_chunks(chunk_size):
+                target.write(chunk)
+        return path
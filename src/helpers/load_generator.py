@@ -0,0 +1,416 @@
+"""
+Open-loop load generation for GcpStorage operation mixes.
+
+Operations are started on a fixed schedule (uniform or Poisson arrivals at
+the target rate) regardless of how long earlier ones take, and latency is
+measured from the *intended* start time. When the worker pool falls behind,
+the queueing delay shows up in the latency instead of silently lowering the
+offered load (coordinated omission). Each started operation gets its own
+random.Random, seeded from the generator's on the dispatching thread, so a
+seed reproduces the schedule, the mix and the operations' own draws however
+the pool threads interleave.
+"""
+
+import math
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import uuid
+from bisect import bisect
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.gcp_test_client.gcp_client import GcpStorage
+from src.helpers.data_helper import GCPCommandResponse
+
+UNIFORM = "uniform"
+POISSON = "poisson"
+ARRIVALS = (UNIFORM, POISSON)
+
+DEFAULT_MIX = "upload=2,read=5,delete=1,describe=1,sign=1"
+REPORTED_PERCENTILES = (50, 90, 99, 99.9)
+HTTP_ERROR = re.compile(r"HTTPError (\d{3})")
+
+Operation = Callable[[random.Random], GCPCommandResponse]
+
+
+class NoObjectAvailable(Exception):
+    """
+    Raised when a delete finds no object uploaded by the run left to delete.
+    """
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """
+    Parses a weighted mix such as 'upload=2,read=5,delete=1'.
+    """
+    mix = {}
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+    if not mix or any(weight < 0 for weight in mix.values()):
+        raise ValueError(f"Invalid operation mix: {value!r}")
+    if sum(mix.values()) <= 0:
+        raise ValueError(f"Operation mix has no positive weight: {value!r}")
+    return mix
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram; values are kept to ~4% relative precision.
+    """
+
+    def __init__(self, buckets_per_doubling: int = 16, min_value: float = 1e-5):
+        self.buckets_per_doubling = buckets_per_doubling
+        self.min_value = min_value
+        self.buckets: Counter = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return math.ceil(math.log2(value / self.min_value) * self.buckets_per_doubling)
+
+    def upper_bound(self, index: int) -> float:
+        return self.min_value * 2 ** (index / self.buckets_per_doubling)
+
+    def record(self, value: float) -> None:
+        self.buckets[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the nearest-rank percentile."""
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(pct / 100 * self.count), 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    def rows(self, per_doubling: Optional[int] = None) -> List[Tuple[float, int]]:
+        """
+        (bucket upper bound, count) of non-empty buckets, ascending; buckets are
+        merged down to `per_doubling` per doubling when given.
+        """
+        step = self.buckets_per_doubling // (per_doubling or self.buckets_per_doubling)
+        merged: Counter = Counter()
+        for index, count in self.buckets.items():
+            merged[-(-index // step) * step] += count
+        return [(self.upper_bound(i), merged[i]) for i in sorted(merged)]
+
+
+class OperationStats:
+    """
+    Latency and error counts of one operation.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.errors: Counter = Counter()
+
+    @property
+    def count(self) -> int:
+        return self.latency.count
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors.values()) / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        latency = {
+            f"p{pct:g}": self.latency.percentile(pct) for pct in REPORTED_PERCENTILES
+        }
+        latency.update(mean=self.latency.mean, max=self.latency.max)
+        return {
+            "count": self.count,
+            "errors": dict(self.errors),
+            "error_rate": self.error_rate,
+            "latency": latency,
+            "service_time_p50": self.service_time.percentile(50),
+        }
+
+
+class LoadReport:
+    """
+    Result of a load run.
+    """
+
+    def __init__(self, target_rate: float, duration: float):
+        self.target_rate = target_rate
+        self.duration = duration
+        self.elapsed = 0.0
+        self.max_dispatch_lag = 0.0
+        self.operations: Dict[str, OperationStats] = {}
+
+    @property
+    def total(self) -> OperationStats:
+        total = OperationStats("total")
+        for stats in self.operations.values():
+            total.latency.merge(stats.latency)
+            total.service_time.merge(stats.service_time)
+            total.errors.update(stats.errors)
+        return total
+
+    def to_dict(self) -> dict:
+        return {
+            "target_rate": self.target_rate,
+            "duration": self.duration,
+            "elapsed": self.elapsed,
+            "max_dispatch_lag": self.max_dispatch_lag,
+            "operations": {
+                name: stats.to_dict() for name, stats in self.operations.items()
+            },
+            "total": self.total.to_dict(),
+            "histogram": self.total.latency.rows(),
+        }
+
+    def format(self) -> str:
+        total = self.total
+        completed = total.count / self.elapsed if self.elapsed else 0.0
+        percentiles = "".join(f" {f'p{pct:g}':>9}" for pct in REPORTED_PERCENTILES)
+        header = f"{'operation':<10} {'count':>7} {'errors':>7} {'err%':>6}"
+        lines = [
+            f"target {self.target_rate:g} ops/s for {self.duration:g} s, "
+            f"completed {completed:.2f} ops/s, "
+            f"max dispatch lag {self.max_dispatch_lag * 1000:.0f} ms",
+            "latency is measured from the scheduled start (ms)",
+            f"{header}{percentiles} {'max':>9}",
+        ]
+        for stats in [*self.operations.values(), total]:
+            lines.append(
+                f"{stats.name:<10} {stats.count:>7} {sum(stats.errors.values()):>7} "
+                f"{stats.error_rate:>6.1%}"
+                + "".join(
+                    f" {stats.latency.percentile(pct) * 1000:>9.1f}"
+                    for pct in REPORTED_PERCENTILES
+                )
+                + f" {stats.latency.max * 1000:>9.1f}"
+            )
+        errors = total.errors.most_common()
+        if errors:
+            lines.append(
+                "errors: " + ", ".join(f"{kind} x{count}" for kind, count in errors)
+            )
+        lines.append("latency histogram (ms):")
+        rows = total.latency.rows(per_doubling=2)
+        widest = max((count for _, count in rows), default=0)
+        for upper, count in rows:
+            bar = "#" * max(round(40 * count / widest), 1)
+            lines.append(f"  <= {upper * 1000:>9.1f} {count:>7} {bar}")
+        return "\n".join(lines)
+
+
+class LoadGenerator:
+    """
+    Drives a weighted operation mix through a worker pool at a target rate.
+    """
+
+    def __init__(
+        self,
+        operations: Dict[str, Operation],
+        mix: Dict[str, float],
+        rate: float,
+        duration: float,
+        workers: int = 16,
+        arrival: str = UNIFORM,
+        seed: Optional[int] = None,
+    ):
+        unknown = set(mix) - set(operations)
+        if unknown:
+            raise ValueError(
+                f"Unknown operations {sorted(unknown)}; "
+                f"available: {sorted(operations)}"
+            )
+        if rate <= 0 or duration <= 0:
+            raise ValueError("Rate and duration must be positive")
+        if arrival not in ARRIVALS:
+            raise ValueError(f"Arrival must be one of {ARRIVALS}")
+        self.operations = operations
+        self.names = [name for name, weight in mix.items() if weight > 0]
+        self.cumulative = list(accumulate(mix[name] for name in self.names))
+        self.rate = rate
+        self.duration = duration
+        self.workers = workers
+        self.arrival = arrival
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _pick(self) -> str:
+        point = self.rng.random() * self.cumulative[-1]
+        return self.names[bisect(self.cumulative, point)]
+
+    def _offsets(self):
+        """Scheduled start offsets, in seconds from the run start."""
+        offset, index = 0.0, 0
+        while offset < self.duration:
+            yield offset
+            index += 1
+            if self.arrival == POISSON:
+                offset += self.rng.expovariate(self.rate)
+            else:
+                offset = index / self.rate
+
+    def _execute(
+        self, report: LoadReport, name: str, scheduled: float, rng: random.Random
+    ) -> None:
+        started = time.perf_counter()
+        error = None
+        try:
+            response = self.operations[name](rng)
+            if response.status_code != 0:
+                match = HTTP_ERROR.search(response.output)
+                error = (
+                    f"HTTP {match.group(1)}" if match else f"exit {response.status_code}"
+                )
+        except Exception as e:
+            error = type(e).__name__
+        finished = time.perf_counter()
+        with self._lock:
+            stats = report.operations.setdefault(name, OperationStats(name))
+            stats.latency.record(finished - scheduled)
+            stats.service_time.record(finished - started)
+            if error:
+                stats.errors[error] += 1
+            report.max_dispatch_lag = max(report.max_dispatch_lag, started - scheduled)
+
+    def run(self) -> LoadReport:
+        report = LoadReport(self.rate, self.duration)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            start = time.perf_counter()
+            for offset in self._offsets():
+                scheduled = start + offset
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                name = self._pick()
+                rng = random.Random(self.rng.getrandbits(64))
+                pool.submit(self._execute, report, name, scheduled, rng)
+        report.elapsed = time.perf_counter() - start
+        return report
+
+
+class StorageOperations:
+    """
+    GcpStorage operations against one bucket, with the object bookkeeping a
+    mix needs: reads and signing use a prefilled set of objects, deletes only
+    remove objects uploaded during the run. Every operation takes the
+    random.Random it draws range offsets and read-set choices from.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        project: str,
+        service_account: str,
+        region: str,
+        object_size: int = 64 * 1024,
+        range_size: int = 4096,
+        prefix: Optional[str] = None,
+    ):
+        self.bucket = bucket
+        self.project = project
+        self.service_account = service_account
+        self.region = region
+        self.object_size = object_size
+        self.range_size = min(range_size, object_size)
+        self.prefix = prefix or f"load-{uuid.uuid4().hex[:8]}"
+        self.read_set: List[str] = []
+        self.deletable: deque = deque()
+        self._counter = 0
+        self._lock = threading.Lock()
+        self._temp_dir = tempfile.TemporaryDirectory(prefix="gcs-load-")
+        self.local_file = os.path.join(self._temp_dir.name, "payload.txt")
+        with open(self.local_file, "w") as payload:
+            payload.write("x" * object_size)
+
+    def _new_name(self) -> str:
+        with self._lock:
+            self._counter += 1
+            return f"{self.prefix}/object-{self._counter}.txt"
+
+    def _url(self, name: str) -> str:
+        return f"gs://{self.bucket}/{name}"
+
+    def prefill(self, count: int) -> None:
+        """Upload the objects read and signed during the run (untimed)."""
+        for _ in range(count):
+            name = self._new_name()
+            response = GcpStorage.copy_file_to_bucket(
+                self.local_file, self.bucket, name
+            )
+            if response.status_code != 0:
+                raise RuntimeError(f"Prefill upload failed: {response.output}")
+            self.read_set.append(name)
+
+    def upload(self, rng: random.Random) -> GCPCommandResponse:
+        name = self._new_name()
+        response = GcpStorage.copy_file_to_bucket(self.local_file, self.bucket, name)
+        if response.status_code == 0:
+            self.deletable.append(name)
+        return response
+
+    def read(self, rng: random.Random) -> GCPCommandResponse:
+        start = rng.randrange(self.object_size - self.range_size + 1)
+        return GcpStorage.cat_file_from_url(
+            self._url(rng.choice(self.read_set)),
+            range_value=f"{start}-{start + self.range_size - 1}",
+        )
+
+    def delete(self, rng: random.Random) -> GCPCommandResponse:
+        try:
+            name = self.deletable.popleft()
+        except IndexError:
+            raise NoObjectAvailable() from None
+        return GcpStorage.delete_object(self.bucket, name)
+
+    def describe(self, rng: random.Random) -> GCPCommandResponse:
+        return GcpStorage.describe_bucket(f"gs://{self.bucket}")
+
+    def sign(self, rng: random.Random) -> GCPCommandResponse:
+        return GcpStorage.sign_url(
+            self._url(rng.choice(self.read_set)),
+            self.project,
+            self.service_account,
+            region=self.region,
+        )
+
+    def as_dict(self) -> Dict[str, Operation]:
+        return {
+            "upload": self.upload,
+            "read": self.read,
+            "delete": self.delete,
+            "describe": self.describe,
+            "sign": self.sign,
+        }
+
+    def cleanup(self) -> None:
+        """Remove everything the run uploaded."""
+        GcpStorage.delete_object(self.bucket, pattern=f"{self.prefix}/**")
+        self._temp_dir.cleanup()
@@ -0,0 +1,182 @@
+"""
+Cloud Storage operation classes of executed gcloud commands.
+
+Cloud Storage bills Class A operations (writes and listings) at about ten
+times the price of Class B operations (reads and metadata gets); deletes are
+free. IAM, project and service calls are not billed per operation but count
+against API quotas. Counts are estimated from the command line alone: one
+operation per object URL, plus a listing for wildcard or recursive URLs.
+Pagination and retries inside gcloud are not visible.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from src.helpers.data_helper import has_wildcard
+
+CLASS_A = "class_a"
+CLASS_B = "class_b"
+IAM = "iam"
+FREE = "free"
+OPERATION_CLASSES = (CLASS_A, CLASS_B, IAM, FREE)
+
+# Operations run by one invocation of a command label
+COMMAND_OPERATIONS: Dict[str, Tuple[str, ...]] = {
+    "storage buckets create": (CLASS_A,),
+    "storage buckets list": (CLASS_A,),
+    "storage buckets update": (CLASS_A,),
+    "storage buckets describe": (CLASS_B,),
+    "storage buckets get-iam-policy": (CLASS_B,),
+    # read-modify-write of the bucket policy
+    "storage buckets add-iam-policy-binding": (CLASS_B, CLASS_A),
+    "storage buckets delete": (FREE,),
+    "storage ls": (CLASS_A,),
+    "storage objects list": (CLASS_A,),
+    "storage sign-url": (IAM,),
+    "projects create": (IAM,),
+    "projects list": (IAM,),
+    "projects get-iam-policy": (IAM,),
+    "projects add-iam-policy-binding": (IAM, IAM),
+    "iam service-accounts add-iam-policy-binding": (IAM, IAM),
+    "services enable": (IAM,),
+}
+
+# Commands running one operation per object URL operand
+PER_OBJECT_OPERATIONS: Dict[str, str] = {
+    "storage cat": CLASS_B,
+    "storage objects describe": CLASS_B,
+    "storage objects update": CLASS_A,
+    "storage rm": FREE,
+}
+
+# Flags followed by a separate value token
+VALUE_FLAGS = {
+    "--additional-headers",
+    "--default-storage-class",
+    "--duration",
+    "--folder",
+    "--format",
+    "--http-verb",
+    "--if-generation-match",
+    "--if-metageneration-match",
+    "--impersonate-service-account",
+    "--limit",
+    "--location",
+    "--member",
+    "--name",
+    "--organization",
+    "--project",
+    "--range",
+    "--region",
+    "--role",
+}
+RECURSIVE_FLAGS = {"-r", "-R", "--recursive"}
+
+
+def _operands(tokens: List[str]) -> Tuple[List[str], List[str]]:
+    """Positional arguments and flags of the tokens after a command label."""
+    operands, flags = [], []
+    expects_value = False
+    for token in tokens:
+        if expects_value:
+            expects_value = False
+        elif token.startswith("-") and token != "-":
+            flags.append(token)
+            expects_value = token in VALUE_FLAGS
+        else:
+            operands.append(token)
+    return operands, flags
+
+
+def classify_command(command: List[str], label: str) -> Dict[str, int]:
+    """{operation class: count} estimated for one executed command."""
+    operations: Dict[str, int] = defaultdict(int)
+    if label in COMMAND_OPERATIONS:
+        for operation_class in COMMAND_OPERATIONS[label]:
+            operations[operation_class] += 1
+        return dict(operations)
+
+    tokens = command[1:] if command and command[0].endswith("gcloud") else command
+    operands, flags = _operands(tokens[len(label.split()) :])
+    recursive = bool(RECURSIVE_FLAGS.intersection(flags))
+    if label in PER_OBJECT_OPERATIONS:
+        urls = [url for url in operands if url.startswith("gs://")]
+        for url in urls:
+            operations[PER_OBJECT_OPERATIONS[label]] += 1
+            if recursive or has_wildcard(url):
+                operations[CLASS_A] += 1
+    elif label in ("storage cp", "storage mv") and len(operands) >= 2:
+        *sources, destination = operands
+        for source in sources:
+            if destination.startswith("gs://"):
+                operations[CLASS_A] += 1
+            elif source.startswith("gs://"):
+                operations[CLASS_B] += 1
+            if source.startswith("gs://") and has_wildcard(source):
+                operations[CLASS_A] += 1
+            if label == "storage mv" and source.startswith("gs://"):
+                operations[FREE] += 1
+    return dict(operations)
+
+
+class OperationCounts:
+    """
+    Operation counts grouped by command label and operation class.
+    """
+
+    def __init__(self, counts: Optional[Mapping[str, Mapping[str, int]]] = None):
+        self.counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        if counts:
+            self.update(counts)
+
+    def __bool__(self) -> bool:
+        return bool(self.counts)
+
+    def __getitem__(self, operation_class: str) -> int:
+        return sum(
+            by_class.get(operation_class, 0) for by_class in self.counts.values()
+        )
+
+    def add(self, label: str, operations: Mapping[str, int]) -> None:
+        for operation_class, count in operations.items():
+            self.counts[label][operation_class] += count
+
+    def update(self, counts: Mapping[str, Mapping[str, int]]) -> None:
+        for label, operations in counts.items():
+            self.add(label, operations)
+
+    def totals(self) -> Dict[str, int]:
+        """{operation class: count} over all labels, in OPERATION_CLASSES order."""
+        return {
+            operation_class: self[operation_class]
+            for operation_class in OPERATION_CLASSES
+        }
+
+    def top_labels(self, operation_class: str, n: int = 5) -> List[Tuple[str, int]]:
+        """Labels contributing most operations of one class."""
+        rows = [
+            (label, by_class[operation_class])
+            for label, by_class in self.counts.items()
+            if by_class.get(operation_class)
+        ]
+        return sorted(rows, key=lambda row: -row[1])[:n]
+
+    def to_dict(self) -> Dict[str, Dict[str, int]]:
+        return {label: dict(by_class) for label, by_class in self.counts.items()}
+
+    def format_totals(self) -> str:
+        return " ".join(f"{key}={value}" for key, value in self.totals().items())
+
+
+def exceeded_budget(counts: OperationCounts, budget: Mapping[str, int]) -> List[str]:
+    """Descriptions of the budgeted classes `counts` exceeds."""
+    violations = []
+    for operation_class, limit in budget.items():
+        count = counts[operation_class]
+        if count > limit:
+            culprits = ", ".join(
+                f"{label} x{n}" for label, n in counts.top_labels(operation_class)
+            )
+            violations.append(f"{operation_class}: {count} > {limit} ({culprits})")
+    return violations
+
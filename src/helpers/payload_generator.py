@@ -0,0 +1,91 @@
+"""
+Seeded text and byte payloads, and collision-free object names.
+
+A cheap stand-in for Faker: payloads come from a small word list and a
+seeded random.Random, so the same seed always yields the same payloads and
+nothing heavy is loaded at import time.
+"""
+
+import itertools
+import random
+import threading
+
+WORDS = (
+    "access account archive bucket cache channel client cloud cluster commit "
+    "config content copy data delta digest disk domain edge entry event field "
+    "file filter folder format frame gateway global hash header host image "
+    "index input key label layer ledger level limit link list load local log "
+    "manifest map member message meta mirror mode model node object offset "
+    "origin output owner packet page path payload policy pool prefix project "
+    "proxy query queue quota range record region replica request resource "
+    "response role route sample scope segment server service session shard "
+    "signal source stage state storage stream suffix table tag target token "
+    "topic trace update upload value version volume window worker zone"
+).split()
+
+# 2-, 3- and 4-byte UTF-8 sequences, for byte ranges that split characters
+MULTIBYTE_WORDS = (
+    "żółw jaźń größe ñandú дані κόμβος 数据 存储桶 ☃ € 𝄞 🪣"
+).split()
+
+
+class PayloadGenerator:
+    """
+    Deterministic lorem-style text and random bytes for a seed.
+    """
+
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.random = random.Random(seed)
+
+    def words(self, count: int) -> list:
+        return self.random.choices(WORDS, k=count)
+
+    def sentence(self, min_words: int = 4, max_words: int = 12) -> str:
+        words = self.words(self.random.randint(min_words, max_words))
+        return " ".join(words).capitalize() + "."
+
+    def paragraph(self, sentences: int = 3) -> str:
+        """A paragraph of `sentences` sentences, give or take one."""
+        count = max(sentences + self.random.randint(-1, 1), 1)
+        return " ".join(self.sentence() for _ in range(count))
+
+    def text(self, max_chars: int = 200) -> str:
+        """Paragraphs joined by newlines, at most `max_chars` long."""
+        paragraphs = []
+        length = 0
+        while True:
+            paragraph = self.paragraph()
+            if paragraphs and length + len(paragraph) + 1 > max_chars:
+                break
+            paragraphs.append(paragraph[:max_chars])
+            length += len(paragraph) + 1
+        return "\n".join(paragraphs)
+
+    def multibyte_text(self, words: int = 60) -> str:
+        """Words mixing ASCII with multi-byte UTF-8 characters."""
+        return " ".join(
+            self.random.choice(MULTIBYTE_WORDS if self.random.random() < 0.4 else WORDS)
+            for _ in range(words)
+        )
+
+    def bytes(self, size: int) -> bytes:
+        return self.random.randbytes(size)
+
+
+class UniqueNames:
+    """
+    Object names unique per run and worker: <prefix>-<run>-<worker>-<n><suffix>.
+    """
+
+    def __init__(self, run_id: str, worker_id: str = "main"):
+        self.run_id = run_id
+        self.worker_id = worker_id
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __call__(self, prefix: str = "file", suffix: str = ".txt") -> str:
+        with self._lock:
+            number = next(self._counter)
+        token = f"{self.run_id}-{self.worker_id}-{number}"
+        return "-".join(filter(None, [prefix, token])) + suffix
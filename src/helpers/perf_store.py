@@ -0,0 +1,267 @@
+"""
+Historical performance store and regression detection.
+
+Every run's per-test and per-command durations are kept in a local SQLite
+database, keyed by git commit, gcloud version and config (project/region).
+A run is compared against a rolling baseline of earlier runs with the same
+config; a metric is flagged when it is both significantly slower (one-sided
+Mann-Whitney U, or a z-score when the run has too few samples) and slower
+by more than a relative threshold.
+"""
+
+import math
+import os
+import sqlite3
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_STORE_PATH = ".perf/history.sqlite"
+DEFAULT_BASELINE_RUNS = 10
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_ALPHA = 0.01
+MIN_SAMPLES = 3
+
+TEST_METRIC = "test"
+COMMAND_METRIC = "command"
+STARTUP_METRIC = "startup"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    git_commit TEXT,
+    gcloud_version TEXT,
+    project TEXT,
+    region TEXT
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_by_run ON samples(run_id, kind, name);
+"""
+
+
+@dataclass(frozen=True)
+class RunInfo:
+    """
+    Identity of a stored run.
+    """
+
+    id: int
+    started: float
+    git_commit: Optional[str]
+    gcloud_version: Optional[str]
+    project: Optional[str]
+    region: Optional[str]
+
+
+@dataclass(frozen=True)
+class Regression:
+    """
+    A metric that got slower than its baseline.
+    """
+
+    kind: str
+    name: str
+    baseline_median: float
+    current_median: float
+    p_value: float
+
+    @property
+    def slowdown(self) -> float:
+        if self.baseline_median <= 0:
+            return math.inf
+        return self.current_median / self.baseline_median - 1
+
+    def __str__(self):
+        return (
+            f"{self.kind} {self.name}: {self.baseline_median * 1000:.0f} ms -> "
+            f"{self.current_median * 1000:.0f} ms (+{self.slowdown:.0%}, "
+            f"p={self.p_value:.4f})"
+        )
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def _normal_sf(z: float) -> float:
+    """Survival function of the standard normal distribution."""
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def mann_whitney_greater(current: List[float], baseline: List[float]) -> float:
+    """
+    One-sided p-value that `current` tends to be larger than `baseline`
+    (normal approximation with tie correction).
+    """
+    n1, n2 = len(current), len(baseline)
+    ranked = sorted(
+        [(value, 0) for value in current] + [(value, 1) for value in baseline]
+    )
+    ranks = [0.0] * len(ranked)
+    tie_term = 0.0
+    i = 0
+    while i < len(ranked):
+        j = i
+        while j + 1 < len(ranked) and ranked[j + 1][0] == ranked[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_term += ties**3 - ties
+        i = j + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, ranked) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    return _normal_sf((u - n1 * n2 / 2 - 0.5) / math.sqrt(variance))
+
+
+def z_score_greater(current: List[float], baseline: List[float]) -> float:
+    """
+    One-sided p-value of the current median against the baseline spread.
+    """
+    deviation = statistics.stdev(baseline)
+    if deviation == 0:
+        return 0.0 if statistics.median(current) > baseline[0] else 1.0
+    z = (statistics.median(current) - statistics.mean(baseline)) / deviation
+    return _normal_sf(z)
+
+
+class PerfStore:
+    """
+    SQLite-backed run history.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "PerfStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add_run(
+        self,
+        samples: Iterable[Tuple[str, str, float]],
+        *,
+        git_commit: Optional[str] = None,
+        gcloud_version: Optional[str] = None,
+        project: Optional[str] = None,
+        region: Optional[str] = None,
+        started: Optional[float] = None,
+    ) -> int:
+        """Store a run's (kind, name, duration) samples; returns the run id."""
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs"
+                " (started, git_commit, gcloud_version, project, region)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (started or time.time(), git_commit, gcloud_version, project, region),
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO samples (run_id, kind, name, duration)"
+                " VALUES (?, ?, ?, ?)",
+                ((run_id, kind, name, duration) for kind, name, duration in samples),
+            )
+        return run_id
+
+    def runs(self, limit: Optional[int] = None) -> List[RunInfo]:
+        """Stored runs, newest first."""
+        query = "SELECT * FROM runs ORDER BY id DESC"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        return [RunInfo(*row) for row in self.connection.execute(query)]
+
+    def run(self, run_id: int) -> RunInfo:
+        row = self.connection.execute(
+            "SELECT * FROM runs WHERE id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"No run with id {run_id}")
+        return RunInfo(*row)
+
+    def baseline_runs(self, run: RunInfo, count: int) -> List[RunInfo]:
+        """Up to `count` runs before `run` with the same project and region."""
+        rows = self.connection.execute(
+            "SELECT * FROM runs WHERE id < ? AND project IS ? AND region IS ?"
+            " ORDER BY id DESC LIMIT ?",
+            (run.id, run.project, run.region, count),
+        )
+        return [RunInfo(*row) for row in rows]
+
+    def samples(self, run_ids: Iterable[int]) -> Dict[Tuple[str, str], List[float]]:
+        run_ids = list(run_ids)
+        if not run_ids:
+            return {}
+        placeholders = ",".join("?" * len(run_ids))
+        grouped: Dict[Tuple[str, str], List[float]] = {}
+        for kind, name, duration in self.connection.execute(
+            "SELECT kind, name, duration FROM samples"
+            f" WHERE run_id IN ({placeholders})",
+            run_ids,
+        ):
+            grouped.setdefault((kind, name), []).append(duration)
+        return grouped
+
+    def find_regressions(
+        self,
+        run_id: Optional[int] = None,
+        baseline_count: int = DEFAULT_BASELINE_RUNS,
+        threshold: float = DEFAULT_THRESHOLD,
+        alpha: float = DEFAULT_ALPHA,
+    ) -> List[Regression]:
+        """
+        Compare a run (the latest by default) with its rolling baseline.
+        """
+        if run_id is None:
+            latest = self.runs(limit=1)
+            if not latest:
+                return []
+            run = latest[0]
+        else:
+            run = self.run(run_id)
+        baseline = self.samples(r.id for r in self.baseline_runs(run, baseline_count))
+        regressions = []
+        for key, current in self.samples([run.id]).items():
+            previous = baseline.get(key, [])
+            if len(previous) < MIN_SAMPLES:
+                continue
+            if len(current) >= MIN_SAMPLES:
+                p_value = mann_whitney_greater(current, previous)
+            else:
+                p_value = z_score_greater(current, previous)
+            regression = Regression(
+                kind=key[0],
+                name=key[1],
+                baseline_median=statistics.median(previous),
+                current_median=statistics.median(current),
+                p_value=p_value,
+            )
+            if p_value < alpha and regression.slowdown > threshold:
+                regressions.append(regression)
+        return sorted(regressions, key=lambda r: -r.slowdown)
@@ -0,0 +1,152 @@
+"""
+Randomized `gcloud storage cat --range` checks against locally computed bytes.
+
+Ranges of every form gcloud accepts (start-end, start- and -N) are drawn
+from a seed, together with edge cases at the object boundaries and, for
+text, offsets inside multi-byte UTF-8 characters. The ranges are read
+concurrently as raw bytes, and all mismatches are reported at once.
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, List, Optional, Sequence, Union
+
+from src.helpers.data_helper import GCPCommandError
+from src.helpers.large_object_generator import SeededObject, parse_byte_range
+
+DEFAULT_RANGE_PARALLELISM = 16
+
+
+def expected_range_bytes(content: bytes, range_value: str) -> bytes:
+    """Bytes of `content` that gcloud returns for a `--range` value."""
+    start, stop = parse_byte_range(range_value, len(content))
+    return content[start:stop]
+
+
+def utf8_split_offsets(content: bytes) -> List[int]:
+    """Offsets of UTF-8 continuation bytes, i.e. inside a character."""
+    return [offset for offset, byte in enumerate(content) if byte & 0xC0 == 0x80]
+
+
+def generate_ranges(
+    size: int,
+    count: int,
+    seed=0,
+    split_offsets: Sequence[int] = (),
+    max_length: Optional[int] = None,
+) -> List[str]:
+    """
+    Up to `count` distinct range values over an object of `size` bytes:
+    boundary cases first, then random start-end, start- and -N ranges of at
+    most `max_length` bytes, half of them anchored at `split_offsets`.
+    """
+    if size <= 0 or count <= 0:
+        return []
+    rng = random.Random(seed)
+    last = size - 1
+    max_length = min(max_length or size, size)
+    ranges = [
+        "0-0",
+        f"{last}-{last}",
+        f"{last}-",
+        "-1",
+        f"0-{max_length - 1}",
+        f"{size - max_length}-",
+        f"-{max_length}",
+        f"{size - max_length}-{size + 16}",
+    ]
+    if max_length == size:
+        ranges.append(f"-{size + 1}")
+
+    def _offset() -> int:
+        if split_offsets and rng.random() < 0.5:
+            return rng.choice(split_offsets)
+        return rng.randrange(size)
+
+    attempts = 0
+    while len(set(ranges)) < count and attempts < count * 10:
+        attempts += 1
+        form = rng.choice(("span", "open", "suffix"))
+        if form == "span":
+            start = _offset()
+            end = min(start + rng.randrange(max_length), last)
+            if split_offsets and rng.random() < 0.5:
+                ends = [offset for offset in split_offsets if offset >= start]
+                end = min(rng.choice(ends), start + max_length - 1) if ends else end
+            ranges.append(f"{start}-{end}")
+        elif form == "open":
+            start = max(_offset(), size - max_length)
+            ranges.append(f"{start}-")
+        else:
+            start = max(_offset(), size - max_length)
+            ranges.append(f"-{size - start}")
+    return list(dict.fromkeys(ranges))[:count]
+
+
+@dataclass
+class RangeMismatch:
+    """
+    A range whose bytes differ from the expected ones, or whose read failed.
+    """
+
+    range_value: str
+    expected_size: int
+    actual_size: Optional[int] = None
+    first_difference: Optional[int] = None
+    error: Optional[str] = None
+
+    def __str__(self):
+        if self.error:
+            return f"--range {self.range_value}: {self.error}"
+        return (
+            f"--range {self.range_value}: expected {self.expected_size} bytes, "
+            f"got {self.actual_size}, first difference at {self.first_difference}"
+        )
+
+
+class RangeFuzzer:
+    """
+    Reads many ranges of one object concurrently and checks every result.
+    """
+
+    def __init__(self, gcp_client, max_parallel: int = DEFAULT_RANGE_PARALLELISM):
+        self.gcp_client = gcp_client
+        self.max_parallel = max_parallel
+
+    def check(
+        self,
+        url: str,
+        source: Union[bytes, SeededObject],
+        ranges: Sequence[str],
+    ) -> List[RangeMismatch]:
+        """Mismatches of `ranges` read from `url`, in range order."""
+        if isinstance(source, SeededObject):
+            expected_for: Callable[[str], bytes] = source.expected_range
+        else:
+            expected_for = partial(expected_range_bytes, source)
+
+        def _check(range_value: str) -> Optional[RangeMismatch]:
+            expected = expected_for(range_value)
+            try:
+                actual = b"".join(
+                    self.gcp_client.stream_file_from_url(url, range_value=range_value)
+                )
+            except GCPCommandError as e:
+                return RangeMismatch(range_value, len(expected), error=str(e))
+            if actual == expected:
+                return None
+            first_difference = next(
+                (i for i, (a, b) in enumerate(zip(actual, expected)) if a != b),
+                min(len(actual), len(expected)),
+            )
+            return RangeMismatch(
+                range_value, len(expected), len(actual), first_difference
+            )
+
+        if not ranges:
+            return []
+        with ThreadPoolExecutor(min(self.max_parallel, len(ranges))) as pool:
+            mismatches = pool.map(_check, ranges)
+            return [mismatch for mismatch in mismatches if mismatch is not None]
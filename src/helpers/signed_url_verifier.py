@@ -0,0 +1,110 @@
+import xml.etree.ElementTree as ET
+from typing import List, Optional
+
+import urllib3
+from assertpy import assert_that
+
+DEFAULT_TIMEOUT_S = 30
+
+
+class SignedUrlVerifier:
+    """
+    HTTP-level verifier for signed URLs.
+
+    Mirrors the assertion API of SignedUrlPage, but fetches the URL with a pooled
+    HTTP client and asserts on the raw response instead of a rendered page.
+    """
+
+    def __init__(self, http: urllib3.PoolManager, timeout: float = DEFAULT_TIMEOUT_S):
+        self.http = http
+        self.timeout = timeout
+        self.response: Optional[urllib3.BaseHTTPResponse] = None
+
+    # RESPONSE
+    @property
+    def status(self) -> int:
+        """HTTP status of the last fetched URL."""
+        return self._last_response().status
+
+    @property
+    def body(self) -> str:
+        """Decoded body of the last fetched URL."""
+        return self._last_response().data.decode("utf-8", errors="replace")
+
+    @property
+    def error_code(self) -> Optional[str]:
+        """<Code> value of an XML error body, if any."""
+        codes = self._xml_texts("Code")
+        return codes[0] if codes else None
+
+    def _last_response(self) -> urllib3.BaseHTTPResponse:
+        assert_that(
+            self.response, description="No signed URL has been fetched yet"
+        ).is_not_none()
+        return self.response
+
+    def _xml_texts(self, tag: str) -> List[str]:
+        """Texts of all elements named `tag` in the XML body, namespace ignored."""
+        try:
+            root = ET.fromstring(self._last_response().data)
+        except ET.ParseError:
+            return []
+        return [
+            (element.text or "").strip()
+            for element in root.iter()
+            if element.tag.rsplit("}", 1)[-1] == tag
+        ]
+
+    # ACTIONS
+    def navigate_to_signed_url(self, url: str) -> None:
+        """Fetch the signed URL."""
+        self.response = self.http.request(
+            "GET", url, timeout=self.timeout, retries=False
+        )
+
+    # ASSERTIONS
+    def assert_status(self, expected_status: int) -> None:
+        """Assert the HTTP status of the last response."""
+        assert_that(
+            self.status, description=f"Unexpected HTTP status, body: {self.body}"
+        ).is_equal_to(expected_status)
+
+    def assert_body_contains(self, *texts: str) -> None:
+        """Assert that the response body contains all given texts."""
+        assert_that(self.body).contains(*texts)
+
+    def assert_error_code(self, expected_code: str) -> None:
+        """Assert the <Code> of the XML error response."""
+        assert_that(
+            self.error_code, description=f"Unexpected error code, body: {self.body}"
+        ).is_equal_to(expected_code)
+
+    def assert_file_access_granted(self) -> None:
+        """Assert that file access is granted by checking for success messages."""
+        self.assert_status(200)
+        self.assert_body_contains("Hey there!", "You have access to the file!")
+
+    def assert_token_expired(self) -> None:
+        """Assert that the token has expired."""
+        self.assert_status(400)
+        self.assert_error_code("ExpiredToken")
+
+    def assert_bucket_access(self, bucket_name: str) -> None:
+        """Assert that the bucket listing is returned for the bucket."""
+        self.assert_status(200)
+        assert_that(
+            self._xml_texts("Name"),
+            description=f"Bucket name '{bucket_name}' not found - no access for bucket",
+        ).contains(bucket_name)
+
+    def assert_file_visible_in_bucket(self, filename: str) -> None:
+        """Assert that a specific file is present in the bucket listing."""
+        assert_that(
+            self._xml_texts("Key"),
+            description=f"File '{filename}' not found in bucket listing",
+        ).contains(filename)
+
+    def assert_bucket_and_file_access(self, bucket_name: str, filename: str) -> None:
+        """Assert both bucket access and file visibility."""
+        self.assert_bucket_access(bucket_name)
+        self.assert_file_visible_in_bucket(filename)
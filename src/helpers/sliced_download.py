@@ -0,0 +1,270 @@
+"""
+Sliced, parallel object downloads into memory-mapped files.
+
+Each object is split into byte ranges that are fetched concurrently; every
+slice is streamed straight into its place in a preallocated, memory-mapped
+destination file. The finished file is verified against the object's
+hashes by hashing the mapping itself: MD5 reads it without copies, CRC32C
+(for composite objects, which have no MD5) in bounded chunks.
+"""
+
+import base64
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from src.helpers.checksum_helper import Crc32c, ObjectChecksums
+from src.helpers.data_helper import GCPCommandError, GCPCommandResponse
+
+DEFAULT_SLICE_SIZE = 8 * 1024 * 1024
+DEFAULT_DOWNLOAD_PARALLELISM = 8
+_CRC32C_CHUNK_SIZE = 1024 * 1024
+
+
+class DownloadVerificationError(ValueError):
+    """
+    Raised when a downloaded file does not match the object's hashes.
+    """
+
+
+@dataclass
+class DownloadResult:
+    """
+    A finished download and whether its content matched the object hashes
+    (None when the object reported no hashes or verification was off).
+    """
+
+    url: str
+    path: str
+    size: int
+    slices: int
+    duration: float
+    verified: Optional[bool] = None
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second."""
+        return self.size / self.duration if self.duration > 0 else 0.0
+
+
+def plan_slices(
+    size: int, slice_size: int = DEFAULT_SLICE_SIZE
+) -> List[Tuple[int, int]]:
+    """(start, stop) byte ranges covering `size` bytes, stop exclusive."""
+    if slice_size <= 0:
+        raise ValueError("slice_size must be positive")
+    return [
+        (start, min(start + slice_size, size))
+        for start in range(0, size, slice_size)
+    ]
+
+
+class MappedFile:
+    """
+    Destination file preallocated to the object size and mapped into memory.
+    Slices write into disjoint regions, so threads need no locking.
+    """
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self.size = size
+        self._file = open(path, "w+b")
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size) if size else None
+
+    def write_slice(self, start: int, stop: int, chunks: Iterable[bytes]) -> int:
+        """Copy a chunk stream into [start, stop); returns the bytes written."""
+        position = start
+        for chunk in chunks:
+            end = position + len(chunk)
+            if end > stop:
+                raise ValueError(f"Slice {start}-{stop - 1} received extra bytes")
+            self._map[position:end] = chunk
+            position = end
+        return position - start
+
+    def matches(self, expected: ObjectChecksums) -> Optional[bool]:
+        if self._map is None:
+            view = memoryview(b"")
+        else:
+            view = memoryview(self._map)
+        try:
+            if expected.md5:
+                digest = hashlib.md5(view).digest()
+                return base64.b64encode(digest).decode("ascii") == expected.md5
+            if expected.crc32c:
+                crc32c = Crc32c()
+                for offset in range(0, self.size, _CRC32C_CHUNK_SIZE):
+                    # google-crc32c only accepts bytes, so this hash copies
+                    chunk = view[offset : offset + _CRC32C_CHUNK_SIZE]
+                    crc32c.update(chunk.tobytes())
+                return base64.b64encode(crc32c.digest()).decode("ascii") == (
+                    expected.crc32c
+                )
+            return None
+        finally:
+            view.release()
+
+    def close(self) -> None:
+        if self._map is not None and not self._map.closed:
+            self._map.flush()
+            self._map.close()
+        self._file.close()
+
+    def discard(self) -> None:
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+@dataclass
+class _ObjectDownload:
+    url: str
+    path: str
+    size: int
+    checksums: ObjectChecksums
+    slices: List[Tuple[int, int]]
+    started: float
+    target: Optional[MappedFile] = None
+    remaining: int = 0
+    failure: Optional[GCPCommandResponse] = None
+
+
+def _failure(error: Exception) -> GCPCommandResponse:
+    """An exception raised while downloading, as a failed command response."""
+    if isinstance(error, GCPCommandError):
+        return error.response
+    return GCPCommandResponse(status_code=1, output="", error=f"{type(error).__name__}: {error}")
+
+
+def _describe(
+    gcp_client, url: str
+) -> Union[Tuple[int, ObjectChecksums], GCPCommandResponse]:
+    try:
+        response = gcp_client.describe_object(object_url=url, format="json")
+        if response.status_code != 0:
+            return response
+        return (
+            int(json.loads(response.output)["size"]),
+            ObjectChecksums.from_describe_output(response.output),
+        )
+    except Exception as e:
+        return _failure(e)
+
+
+def download_to_paths(
+    gcp_client,
+    destinations: Dict[str, str],
+    slice_size: int = DEFAULT_SLICE_SIZE,
+    max_parallel: int = DEFAULT_DOWNLOAD_PARALLELISM,
+    verify: bool = True,
+) -> Dict[str, Union[DownloadResult, GCPCommandResponse]]:
+    """
+    Download {object URL: local path}, sharing one pool of `max_parallel`
+    slice fetches between all objects. Objects that fail map to the failed
+    command's response (or a response describing the exception) and leave no
+    file behind.
+    """
+    results: Dict[str, Union[DownloadResult, GCPCommandResponse]] = {}
+    lock = threading.Lock()
+    if not destinations:
+        return results
+
+    def _finish(download: _ObjectDownload) -> None:
+        if download.failure is None:
+            try:
+                verified = (
+                    download.target.matches(download.checksums) if verify else None
+                )
+                download.target.close()
+            except Exception as e:
+                download.failure = _failure(e)
+        if download.failure is not None:
+            download.target.discard()
+            results[download.url] = download.failure
+            return
+        results[download.url] = DownloadResult(
+            url=download.url,
+            path=download.path,
+            size=download.size,
+            slices=len(download.slices),
+            duration=time.perf_counter() - download.started,
+            verified=verified,
+        )
+
+    def _fetch(download: _ObjectDownload, start: int, stop: int) -> None:
+        failure = None
+        if download.failure is None:
+            try:
+                written = download.target.write_slice(
+                    start,
+                    stop,
+                    gcp_client.stream_file_from_url(
+                        download.url, range_value=f"{start}-{stop - 1}"
+                    ),
+                )
+                if written != stop - start:
+                    raise ValueError(
+                        f"Slice {start}-{stop - 1} returned {written} bytes"
+                    )
+            except Exception as e:
+                failure = _failure(e)
+        with lock:
+            if failure is not None and download.failure is None:
+                download.failure = failure
+            download.remaining -= 1
+            done = download.remaining == 0
+        if done:
+            _finish(download)
+
+    with ThreadPoolExecutor(min(max_parallel, len(destinations))) as pool:
+        described = dict(
+            zip(
+                destinations,
+                pool.map(lambda url: _describe(gcp_client, url), destinations),
+            )
+        )
+    downloads = []
+    try:
+        for url, path in destinations.items():
+            if isinstance(described[url], GCPCommandResponse):
+                results[url] = described[url]
+                continue
+            size, checksums = described[url]
+            download = _ObjectDownload(
+                url=url,
+                path=path,
+                size=size,
+                checksums=checksums,
+                slices=plan_slices(size, slice_size),
+                started=time.perf_counter(),
+            )
+            try:
+                download.target = MappedFile(path, size)
+            except Exception as e:
+                results[url] = _failure(e)
+                continue
+            download.remaining = len(download.slices)
+            downloads.append(download)
+            if not download.slices:
+                _finish(download)
+
+        slices = [(d, start, stop) for d in downloads for start, stop in d.slices]
+        if slices:
+            with ThreadPoolExecutor(min(max_parallel, len(slices))) as pool:
+                for future in [pool.submit(_fetch, *job) for job in slices]:
+                    future.result()
+    finally:
+        # objects left unfinished by an unexpected error keep no open file
+        for download in downloads:
+            if download.url not in results:
+                download.target.discard()
+    return {url: results[url] for url in destinations}
@@ -0,0 +1,314 @@
+"""
+Synthetic probe canaries and their Prometheus text exposition.
+
+A probe cycle uploads an object, reads it back fully and by range, signs a
+URL for it and fetches it over a pooled HTTP connection, then deletes it.
+Results are kept in a rolling window and rendered in the Prometheus text
+format (version 0.0.4): latency quantiles and success ratios cover the
+window, counters (including the latency summary's _sum and _count) the
+probe's lifetime.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import urllib3
+
+from src.gcp_test_client.gcp_client import GcpStorage
+from src.helpers.command_metrics import percentile
+from src.helpers.data_helper import GCPCommandResponse, extract_url
+from src.helpers.large_object_generator import SeededObject
+from src.helpers.signed_url_verifier import SignedUrlVerifier
+
+CANARIES = ("upload", "read", "range_read", "sign_url", "delete")
+QUANTILES = (0.5, 0.9, 0.99)
+
+SUCCESS = "success"
+FAILURE = "failure"
+SKIPPED = "skipped"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+MAX_ERROR_OUTPUT = 200
+
+
+class ProbeFailure(Exception):
+    """
+    Raised when a canary gets an unexpected response.
+    """
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """
+    Outcome of one canary run.
+    """
+
+    canary: str
+    finished: float
+    duration: float
+    result: str
+    error: Optional[str] = None
+
+
+def _checked(response: GCPCommandResponse) -> GCPCommandResponse:
+    if response.status_code != 0:
+        output = response.output.strip()
+        if len(output) > MAX_ERROR_OUTPUT:
+            output = output[:MAX_ERROR_OUTPUT] + "..."
+        raise ProbeFailure(f"exit {response.status_code}: {output}")
+    return response
+
+
+class ProbeMetrics:
+    """
+    Rolling window of probe results plus lifetime counters.
+    """
+
+    def __init__(self, window: float = 600.0):
+        self.window = window
+        self.results: Deque[ProbeResult] = deque()
+        self.totals: Counter = Counter()
+        self.latency_sum: Counter = Counter()
+        self.last_success: Dict[str, float] = {}
+        self.cycles = 0
+        self._lock = threading.Lock()
+
+    def record(self, result: ProbeResult) -> None:
+        with self._lock:
+            self.results.append(result)
+            self.totals[(result.canary, result.result)] += 1
+            if result.result == SUCCESS:
+                self.latency_sum[result.canary] += result.duration
+                self.last_success[result.canary] = result.finished
+            self._expire(result.finished)
+
+    def record_cycle(self) -> None:
+        with self._lock:
+            self.cycles += 1
+
+    def _expire(self, now: float) -> None:
+        while self.results and self.results[0].finished < now - self.window:
+            self.results.popleft()
+
+    def _windowed(self) -> Dict[str, List[ProbeResult]]:
+        grouped: Dict[str, List[ProbeResult]] = {canary: [] for canary in CANARIES}
+        for result in self.results:
+            grouped.setdefault(result.canary, []).append(result)
+        return grouped
+
+    def render(self, now: Optional[float] = None) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        with self._lock:
+            self._expire(now or time.time())
+            windowed = self._windowed()
+            totals = dict(self.totals)
+            latency_sum = dict(self.latency_sum)
+            last_success = dict(self.last_success)
+            cycles = self.cycles
+
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                if label_text:
+                    label_text = f"{{{label_text}}}"
+                value_text = "NaN" if value != value else repr(value)
+                lines.append(f"{name}{suffix}{label_text} {value_text}")
+
+        metric(
+            "gcs_probe_cycles_total",
+            "counter",
+            "Completed probe cycles.",
+            [("", (), cycles)],
+        )
+        metric(
+            "gcs_probe_runs_total",
+            "counter",
+            "Canary runs by result.",
+            [
+                (
+                    "",
+                    (("canary", canary), ("result", result)),
+                    totals.get((canary, result), 0),
+                )
+                for canary in windowed
+                for result in (SUCCESS, FAILURE, SKIPPED)
+            ],
+        )
+        latency_samples = []
+        ratio_samples = []
+        for canary, results in windowed.items():
+            ran = [r for r in results if r.result != SKIPPED]
+            durations = sorted(r.duration for r in ran if r.result == SUCCESS)
+            for quantile in QUANTILES:
+                latency_samples.append(
+                    (
+                        "",
+                        (("canary", canary), ("quantile", quantile)),
+                        (
+                            percentile(durations, quantile * 100)
+                            if durations
+                            else float("nan")
+                        ),
+                    )
+                )
+            # _sum and _count are cumulative counters, as summaries require
+            latency_samples.append(
+                ("_sum", (("canary", canary),), latency_sum.get(canary, 0.0))
+            )
+            latency_samples.append(
+                ("_count", (("canary", canary),), totals.get((canary, SUCCESS), 0))
+            )
+            successes = sum(1 for r in ran if r.result == SUCCESS)
+            ratio_samples.append(
+                ("", (("canary", canary),), successes / len(ran) if ran else 0)
+            )
+        metric(
+            "gcs_probe_latency_seconds",
+            "summary",
+            f"Latency of successful canary runs; quantiles over the last "
+            f"{self.window:g} s.",
+            latency_samples,
+        )
+        metric(
+            "gcs_probe_success_ratio",
+            "gauge",
+            f"Share of successful canary runs over the last {self.window:g} s.",
+            ratio_samples,
+        )
+        metric(
+            "gcs_probe_last_success_timestamp_seconds",
+            "gauge",
+            "Unix time of the last successful run.",
+            [
+                ("", (("canary", canary),), last_success[canary])
+                for canary in windowed
+                if canary in last_success
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+
+class SyntheticProbe:
+    """
+    Runs probe cycles with a warm HTTP pool and a pre-generated payload.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        project: str,
+        service_account: str,
+        region: str,
+        metrics: ProbeMetrics,
+        payload: SeededObject,
+        http: Optional[urllib3.PoolManager] = None,
+        fetch_signed_url: bool = True,
+        range_size: int = 1024,
+    ):
+        self.bucket = bucket
+        self.project = project
+        self.service_account = service_account
+        self.region = region
+        self.metrics = metrics
+        self.payload = payload
+        self.content = payload.read(0, payload.size).decode()
+        self._temp_dir = tempfile.TemporaryDirectory(prefix="gcs-probe-")
+        self.local_file = payload.write_to(
+            os.path.join(self._temp_dir.name, "payload.txt")
+        )
+        self.verifier = SignedUrlVerifier(http or urllib3.PoolManager())
+        self.fetch_signed_url = fetch_signed_url
+        self.range_size = min(range_size, payload.size)
+
+    def _upload(self, name: str) -> None:
+        _checked(GcpStorage.copy_file_to_bucket(self.local_file, self.bucket, name))
+
+    def _read(self, name: str) -> None:
+        response = _checked(GcpStorage.cat_file_from_url(f"gs://{self.bucket}/{name}"))
+        if response.output != self.content:
+            raise ProbeFailure("Object content does not match the uploaded payload")
+
+    def _range_read(self, name: str) -> None:
+        start = self.payload.size // 2
+        range_value = f"{start}-{start + self.range_size - 1}"
+        response = _checked(
+            GcpStorage.cat_file_from_url(
+                f"gs://{self.bucket}/{name}", range_value=range_value
+            )
+        )
+        expected = self.payload.expected_range(range_value).decode()
+        if response.output != expected:
+            raise ProbeFailure(f"Range {range_value} does not match the payload")
+
+    def _sign_url(self, name: str) -> None:
+        response = _checked(
+            GcpStorage.sign_url(
+                f"gs://{self.bucket}/{name}",
+                self.project,
+                self.service_account,
+                region=self.region,
+            )
+        )
+        url = extract_url(response.output)
+        if not url:
+            raise ProbeFailure("No signed URL in sign-url output")
+        if self.fetch_signed_url:
+            self.verifier.navigate_to_signed_url(url)
+            self.verifier.assert_status(200)
+
+    def _delete(self, name: str) -> None:
+        _checked(GcpStorage.delete_object(self.bucket, name))
+
+    def _steps(self) -> List[Tuple[str, Callable[[str], None]]]:
+        return [
+            ("upload", self._upload),
+            ("read", self._read),
+            ("range_read", self._range_read),
+            ("sign_url", self._sign_url),
+            ("delete", self._delete),
+        ]
+
+    def run_cycle(self) -> List[ProbeResult]:
+        """
+        Run every canary once; canaries after a failed upload are skipped,
+        and delete always runs once the object exists.
+        """
+        name = f"probe/{uuid.uuid4().hex}.txt"
+        uploaded = False
+        results = []
+        for canary, step in self._steps():
+            if not uploaded and canary != "upload":
+                result = ProbeResult(canary, time.time(), 0.0, SKIPPED)
+            else:
+                started = time.perf_counter()
+                try:
+                    step(name)
+                except Exception as e:
+                    outcome, error = FAILURE, f"{type(e).__name__}: {e}"
+                else:
+                    outcome, error = SUCCESS, None
+                    uploaded = uploaded or canary == "upload"
+                result = ProbeResult(
+                    canary,
+                    time.time(),
+                    time.perf_counter() - started,
+                    outcome,
+                    error,
+                )
+            self.metrics.record(result)
+            results.append(result)
+        self.metrics.record_cycle()
+        return results
+
+    def close(self) -> None:
+        self._temp_dir.cleanup()
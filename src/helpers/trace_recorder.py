@@ -0,0 +1,108 @@
+"""
+Span recording in the Chrome Trace Event format (readable by Perfetto and
+chrome://tracing).
+
+Timestamps are wall-clock microseconds so spans recorded in different
+xdist workers line up on one timeline; each worker is a separate process
+lane.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+
+CONTROLLER = "controller"
+
+
+def now_us() -> int:
+    return time.time_ns() // 1000
+
+
+def worker_pid(worker_id: str) -> int:
+    """Process lane of a worker: 0 for the controller, N + 1 for gwN."""
+    if worker_id.startswith("gw") and worker_id[2:].isdigit():
+        return int(worker_id[2:]) + 1
+    return 0
+
+
+class TraceRecorder:
+    """
+    Collects complete ("X") trace events for one process.
+    """
+
+    def __init__(self, worker_id: str = CONTROLLER):
+        self.worker_id = worker_id
+        self.pid = worker_pid(worker_id)
+        self.events: List[dict] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": self.pid,
+                "args": {"name": worker_id},
+            }
+        ]
+
+    def add_span(
+        self, name: str, category: str, start_us: int, duration_us: int, **args
+    ) -> None:
+        self.events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start_us,
+                "dur": max(duration_us, 0),
+                "pid": self.pid,
+                "tid": threading.get_native_id(),
+                "args": {"worker": self.worker_id, **args},
+            }
+        )
+
+    @contextmanager
+    def span(self, name: str, category: str, **args) -> Iterator[None]:
+        start_us, timer = now_us(), time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_us = int((time.perf_counter() - timer) * 1_000_000)
+            self.add_span(name, category, start_us, duration_us, **args)
+
+    def __call__(self, record) -> None:
+        """Command listener: record a span per executed command."""
+        self.add_span(
+            record.label,
+            "gcloud",
+            int(record.started * 1_000_000),
+            int(record.duration * 1_000_000),
+            command=" ".join(record.command),
+            status_code=record.status_code,
+        )
+
+
+_active_recorder: Optional[TraceRecorder] = None
+
+
+def set_active_recorder(recorder: Optional[TraceRecorder]) -> None:
+    global _active_recorder
+    _active_recorder = recorder
+
+
+@contextmanager
+def trace_span(name: str, category: str = "step", **args) -> Iterator[None]:
+    """
+    Span on the active recorder; a no-op when tracing is disabled.
+    """
+    if _active_recorder is None:
+        yield
+        return
+    with _active_recorder.span(name, category, **args):
+        yield
+
+
+def write_chrome_trace(path: str, events: Iterable[dict]) -> None:
+    with open(path, "w") as trace_file:
+        json.dump(
+            {"traceEvents": list(events), "displayTimeUnit": "ms"}, trace_file
+        )
@@ -0,0 +1,75 @@
+"""
+Activation of the local gcloud stand-in.
+"""
+
+import os
+import shlex
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+from src.helpers.base_helpers import GCLOUD_EXECUTABLE_ENV
+from src.stand_in.faults import FaultPlan, save_plan
+from src.stand_in.gcloud import ROOT_ENV
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+class StandInBackend:
+    """
+    A stand-in storage root plus the environment that points GcpStorage at it.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self._temp_dir = None
+        if root is None:
+            self._temp_dir = tempfile.TemporaryDirectory(prefix="gcs-stand-in-")
+            root = self._temp_dir.name
+        self.root = root
+
+    @property
+    def executable(self) -> str:
+        return shlex.join([sys.executable, "-m", "src.stand_in.gcloud"])
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables routing gcloud commands to the stand-in."""
+        python_path = os.pathsep.join(
+            filter(None, [str(PROJECT_ROOT), os.environ.get("PYTHONPATH")])
+        )
+        return {
+            GCLOUD_EXECUTABLE_ENV: self.executable,
+            ROOT_ENV: self.root,
+            "PYTHONPATH": python_path,
+        }
+
+    @contextmanager
+    def activate(self) -> Iterator["StandInBackend"]:
+        """Route gcloud commands to the stand-in for the duration of the block."""
+        previous = {key: os.environ.get(key) for key in self.env()}
+        os.environ.update(self.env())
+        try:
+            yield self
+        finally:
+            for key, value in previous.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    def set_faults(self, plan: Union[FaultPlan, dict, None]) -> None:
+        """
+        Inject faults into subsequent commands; a dict is read with
+        FaultPlan.from_dict. None removes the plan and its counters.
+        """
+        if isinstance(plan, dict):
+            plan = FaultPlan.from_dict(plan)
+        save_plan(self.root, plan)
+
+    def clear_faults(self) -> None:
+        self.set_faults(None)
+
+    def cleanup(self) -> None:
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
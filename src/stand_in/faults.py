@@ -0,0 +1,296 @@
+"""
+Fault and latency injection for the gcloud stand-in.
+
+A fault plan maps stand-in commands ("storage cat", "storage cp", ... or "*"
+for any other command) to the faults injected into every invocation:
+
+    {
+        "seed": 7,
+        "operations": {
+            "storage cat": {
+                "latency": {"distribution": "lognormal", "median": 0.05,
+                            "sigma": 0.8},
+                "bandwidth": 1048576,
+                "errors": {"429": 0.2, "503": 0.05},
+                "stall": {"probability": 0.01, "seconds": 30,
+                          "within_bytes": 1048576}
+            },
+            "*": {"latency": {"distribution": "fixed", "value": 0.01}}
+        }
+    }
+
+Latency is slept before the command starts. A stall pauses the transfer
+itself: the object stream (cat output or cp input) stops for `seconds` once
+a random number of bytes below `within_bytes` has passed, so readers see a
+partial response that goes quiet. Transfers shorter than the drawn offset
+do not stall.
+
+The plan is stored in the stand-in root, so it applies to every process
+using that root. Random draws come from the seed, the command and the
+command's invocation number, so a plan replays the same sequence of
+faults for each command on every run.
+"""
+
+import fcntl
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, Optional
+
+PLAN_FILE = ".stand-in-faults.json"
+COUNTER_FILE = ".stand-in-fault-counters.json"
+ANY_COMMAND = "*"
+DEFAULT_STALL_WITHIN_BYTES = 1024 * 1024
+
+ERROR_MESSAGES = {
+    429: "The rate of requests exceeds the rate limit. Please reduce the rate "
+    "of requests and retry with exponential backoff.",
+    503: "We encountered an internal error. Please try again.",
+}
+
+
+def sample_latency(spec: Optional[dict], rng: random.Random) -> float:
+    """
+    Draws a delay in seconds from a latency spec:
+    fixed(value), uniform(low, high), normal(mean, stddev),
+    lognormal(median, sigma), exponential(mean) or pareto(scale, alpha).
+    """
+    if not spec:
+        return 0.0
+    distribution = spec.get("distribution", "fixed")
+    if distribution == "fixed":
+        value = spec["value"]
+    elif distribution == "uniform":
+        value = rng.uniform(spec["low"], spec["high"])
+    elif distribution == "normal":
+        value = rng.gauss(spec["mean"], spec["stddev"])
+    elif distribution == "lognormal":
+        value = rng.lognormvariate(math.log(spec["median"]), spec["sigma"])
+    elif distribution == "exponential":
+        value = rng.expovariate(1 / spec["mean"])
+    elif distribution == "pareto":
+        value = spec["scale"] * rng.paretovariate(spec["alpha"])
+    else:
+        raise ValueError(f"Unknown latency distribution: {distribution}")
+    return max(value, 0.0)
+
+
+@dataclass
+class OperationFaults:
+    """
+    Faults injected into one command.
+    """
+
+    latency: Optional[dict] = None
+    bandwidth: Optional[float] = None
+    errors: Dict[int, float] = field(default_factory=dict)
+    stall_probability: float = 0.0
+    stall_seconds: float = 0.0
+    stall_within_bytes: int = DEFAULT_STALL_WITHIN_BYTES
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "OperationFaults":
+        stall = data.get("stall") or {}
+        return cls(
+            latency=data.get("latency"),
+            bandwidth=data.get("bandwidth"),
+            errors={
+                int(status): rate for status, rate in data.get("errors", {}).items()
+            },
+            stall_probability=stall.get("probability", 0.0),
+            stall_seconds=stall.get("seconds", 0.0),
+            stall_within_bytes=stall.get("within_bytes", DEFAULT_STALL_WITHIN_BYTES),
+        )
+
+    def to_dict(self) -> dict:
+        data = {}
+        if self.latency:
+            data["latency"] = self.latency
+        if self.bandwidth:
+            data["bandwidth"] = self.bandwidth
+        if self.errors:
+            data["errors"] = {str(status): rate for status, rate in self.errors.items()}
+        if self.stall_probability:
+            data["stall"] = {
+                "probability": self.stall_probability,
+                "seconds": self.stall_seconds,
+                "within_bytes": self.stall_within_bytes,
+            }
+        return data
+
+
+@dataclass
+class Injection:
+    """
+    Faults drawn for one invocation.
+    """
+
+    delay: float = 0.0
+    stall_at: Optional[int] = None
+    stall_seconds: float = 0.0
+    error_status: Optional[int] = None
+    bandwidth: Optional[float] = None
+
+
+@dataclass
+class FaultPlan:
+    """
+    Per-command faults plus the seed their random draws derive from.
+    """
+
+    operations: Dict[str, OperationFaults] = field(default_factory=dict)
+    seed: int = 0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FaultPlan":
+        return cls(
+            operations={
+                command: OperationFaults.from_dict(spec)
+                for command, spec in data.get("operations", {}).items()
+            },
+            seed=data.get("seed", 0),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "seed": self.seed,
+            "operations": {
+                command: faults.to_dict() for command, faults in self.operations.items()
+            },
+        }
+
+    def faults_for(self, command: str) -> Optional[OperationFaults]:
+        return self.operations.get(command) or self.operations.get(ANY_COMMAND)
+
+    def draw(self, command: str, invocation: int) -> Injection:
+        faults = self.faults_for(command)
+        if faults is None:
+            return Injection()
+        rng = random.Random(f"{self.seed}:{command}:{invocation}")
+        injection = Injection(
+            delay=sample_latency(faults.latency, rng), bandwidth=faults.bandwidth
+        )
+        if faults.stall_probability and rng.random() < faults.stall_probability:
+            injection.stall_at = rng.randrange(max(faults.stall_within_bytes, 1))
+            injection.stall_seconds = faults.stall_seconds
+        point = rng.random()
+        for status, rate in sorted(faults.errors.items()):
+            if point < rate:
+                injection.error_status = status
+                break
+            point -= rate
+        return injection
+
+
+def save_plan(root: Path, plan: Optional[FaultPlan]) -> None:
+    """
+    Store (or with None, remove) the plan of a stand-in root; invocation
+    counters restart so the plan replays from its first draw.
+    """
+    path = Path(root) / PLAN_FILE
+    (Path(root) / COUNTER_FILE).unlink(missing_ok=True)
+    if plan is None:
+        path.unlink(missing_ok=True)
+        return
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(plan.to_dict()))
+    temp_path.replace(path)
+
+
+def load_plan(root: Path) -> Optional[FaultPlan]:
+    try:
+        data = json.loads((Path(root) / PLAN_FILE).read_text())
+    except FileNotFoundError:
+        return None
+    return FaultPlan.from_dict(data)
+
+
+def next_invocation(root: Path, command: str) -> int:
+    """Per-command invocation number, shared by concurrent processes."""
+    with open(Path(root) / COUNTER_FILE, "a+") as counter_file:
+        fcntl.flock(counter_file, fcntl.LOCK_EX)
+        counter_file.seek(0)
+        counters = json.loads(counter_file.read() or "{}")
+        invocation = counters.get(command, 0)
+        counters[command] = invocation + 1
+        counter_file.seek(0)
+        counter_file.truncate()
+        counter_file.write(json.dumps(counters))
+    return invocation
+
+
+def error_message(command: str, status: int) -> str:
+    message = ERROR_MESSAGES.get(status)
+    if message is None:
+        try:
+            message = HTTPStatus(status).phrase
+        except ValueError:
+            message = "Injected error"
+    return f"ERROR: (gcloud.{command.replace(' ', '.')}) HTTPError {status}: {message}"
+
+
+class Throttle:
+    """
+    Paces a byte stream to a bandwidth cap, and pauses it once for
+    `stall_seconds` when `stall_at` bytes have passed.
+    """
+
+    def __init__(
+        self,
+        bytes_per_second: Optional[float] = None,
+        stall_at: Optional[int] = None,
+        stall_seconds: float = 0.0,
+    ):
+        self.bytes_per_second = bytes_per_second
+        self.stall_at = stall_at
+        self.stall_seconds = stall_seconds
+        self.started = time.monotonic()
+        self.transferred = 0
+
+    def consume(self, size: int) -> None:
+        self.transferred += size
+        if self.stall_at is not None and self.transferred > self.stall_at:
+            self.stall_at = None
+            time.sleep(self.stall_seconds)
+            # the pause is not bandwidth to catch up on
+            self.started += self.stall_seconds
+        if not self.bytes_per_second:
+            return
+        delay = self.started + self.transferred / self.bytes_per_second
+        delay -= time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ThrottledReader:
+    def __init__(self, stream, throttle: Throttle):
+        self.stream = stream
+        self.throttle = throttle
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.stream.read(size)
+        self.throttle.consume(len(chunk))
+        return chunk
+
+
+class ThrottledWriter:
+    SLICE = 64 * 1024
+
+    def __init__(self, stream, throttle: Throttle):
+        self.stream = stream
+        self.throttle = throttle
+
+    def write(self, data: bytes) -> int:
+        for offset in range(0, len(data), self.SLICE):
+            piece = data[offset : offset + self.SLICE]
+            self.stream.write(piece)
+            self.stream.flush()
+            self.throttle.consume(len(piece))
+        return len(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
@@ -0,0 +1,642 @@
+"""
+Local stand-in for the gcloud CLI.
+
+Implements the subset of `gcloud` used by GcpStorage on top of a directory
+tree (GCS_STAND_IN_ROOT), so the client, benchmarks and load tools can run
+without real GCS. Output and error messages follow the real CLI closely
+enough for the suite's parsers and assertions.
+
+Run as `python -m src.stand_in.gcloud ...`; see src.stand_in.backend.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.helpers.checksum_helper import Crc32c
+from src.helpers.large_object_generator import parse_byte_range
+from src.stand_in.faults import (
+    Throttle,
+    ThrottledReader,
+    ThrottledWriter,
+    error_message,
+    load_plan,
+    next_invocation,
+)
+
+ROOT_ENV = "GCS_STAND_IN_ROOT"
+VERSION = "999.0.0"
+
+COMMAND_GROUPS = {
+    "storage",
+    "buckets",
+    "objects",
+    "projects",
+    "iam",
+    "service-accounts",
+    "services",
+}
+VALUE_FLAGS = {
+    "--project",
+    "--location",
+    "--default-storage-class",
+    "--additional-headers",
+    "--if-generation-match",
+    "--if-metageneration-match",
+    "--range",
+    "--decryption-keys",
+    "--format",
+    "--duration",
+    "--impersonate-service-account",
+    "--http-verb",
+    "--region",
+    "--member",
+    "--role",
+    "--name",
+    "--organization",
+    "--folder",
+    "--limit",
+    "--sort-by",
+    "--page-size",
+    "--page-token",
+}
+PRECONDITION_FAILED = (
+    "ERROR: HTTPError 412: At least one of the pre-conditions you specified "
+    "did not hold."
+)
+
+
+# bandwidth cap and stall of the running command, set by main() from the
+# fault plan
+_throttle: Optional[Throttle] = None
+
+
+class CommandError(Exception):
+    """
+    A gcloud-style error: printed to stderr, exit code 1.
+    """
+
+
+class Arguments:
+    """
+    Positional arguments and flags of a command line.
+    """
+
+    def __init__(self, tokens: List[str]):
+        self.positional: List[str] = []
+        self.flags: Dict[str, List[str]] = {}
+        tokens = list(tokens)
+        while tokens:
+            token = tokens.pop(0)
+            if token.startswith("-") and token != "-":
+                name, sep, value = token.partition("=")
+                if not sep and name in VALUE_FLAGS and tokens:
+                    value = tokens.pop(0)
+                self.flags.setdefault(name, []).append(value)
+            else:
+                self.positional.append(token)
+
+    def has(self, *names: str) -> bool:
+        return any(name in self.flags for name in names)
+
+    def value(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        values = self.flags.get(name)
+        return values[-1] if values else default
+
+
+def _root() -> Path:
+    root = os.environ.get(ROOT_ENV)
+    if not root:
+        raise CommandError(f"ERROR: {ROOT_ENV} is not set")
+    return Path(root)
+
+
+def _output():
+    """Binary stdout, paced to the injected bandwidth cap and stall."""
+    if _throttle is None:
+        return sys.stdout.buffer
+    return ThrottledWriter(sys.stdout.buffer, _throttle)
+
+
+def _input(stream):
+    """An upload source, paced to the injected bandwidth cap and stall."""
+    if _throttle is None:
+        return stream
+    return ThrottledReader(stream, _throttle)
+
+
+def _buckets_dir() -> Path:
+    return _root() / "buckets"
+
+
+def _projects_dir() -> Path:
+    return _root() / "projects"
+
+
+def split_url(url: str) -> Tuple[str, str]:
+    """Split gs://bucket/object into (bucket, object)."""
+    if not url.startswith("gs://"):
+        raise ValueError(url)
+    bucket, _, name = url[len("gs://") :].partition("/")
+    return bucket, name
+
+
+def _bucket_path(bucket: str) -> Path:
+    return _buckets_dir() / bucket
+
+
+def _object_path(bucket: str, name: str) -> Path:
+    return _bucket_path(bucket) / name
+
+
+def _list_objects(bucket: str) -> List[str]:
+    bucket_path = _bucket_path(bucket)
+    names = []
+    for directory, _, files in os.walk(bucket_path):
+        for file_name in files:
+            if file_name.startswith(".stand-in-"):
+                continue
+            path = Path(directory) / file_name
+            names.append(path.relative_to(bucket_path).as_posix())
+    return sorted(names)
+
+
+def _wildcard_regex(pattern: str) -> "re.Pattern":
+    parts = re.split(r"(\*\*|\*|\?)", pattern)
+    regex = "".join(
+        {"**": ".*", "*": "[^/]*", "?": "[^/]"}.get(part, re.escape(part))
+        for part in parts
+    )
+    return re.compile(f"^{regex}$")
+
+
+def _has_wildcard(value: str) -> bool:
+    return any(char in value for char in "*?")
+
+
+def expand_url(url: str) -> List[Tuple[str, str]]:
+    """Objects (bucket, name) matched by a URL, wildcards included."""
+    bucket, name = split_url(url)
+    if not _bucket_path(bucket).is_dir():
+        return []
+    if not _has_wildcard(name):
+        return [(bucket, name)] if _object_path(bucket, name).is_file() else []
+    regex = _wildcard_regex(name)
+    return [(bucket, obj) for obj in _list_objects(bucket) if regex.match(obj)]
+
+
+def _generation(path: Path) -> int:
+    return path.stat().st_mtime_ns // 1000
+
+
+def _check_preconditions(path: Path, args: Arguments) -> None:
+    """Each of --if-generation-match and --if-metageneration-match on its own."""
+    exists = path.is_file()
+    expected = args.value("--if-generation-match")
+    if expected is not None and int(expected) != (_generation(path) if exists else 0):
+        raise CommandError(PRECONDITION_FAILED)
+    # the stand-in has no metadata updates, so an object stays at metageneration 1
+    expected = args.value("--if-metageneration-match")
+    if expected is not None and int(expected) != (1 if exists else 0):
+        raise CommandError(PRECONDITION_FAILED)
+
+
+def _object_metadata(bucket: str, name: str) -> dict:
+    path = _object_path(bucket, name)
+    crc32c, md5 = Crc32c(), hashlib.md5()
+    with open(path, "rb") as source:
+        while chunk := source.read(1024 * 1024):
+            crc32c.update(chunk)
+            md5.update(chunk)
+    return {
+        "bucket": bucket,
+        "name": name,
+        "size": path.stat().st_size,
+        "generation": str(_generation(path)),
+        "metageneration": "1",
+        "crc32c_hash": base64.b64encode(crc32c.digest()).decode("ascii"),
+        "md5_hash": base64.b64encode(md5.digest()).decode("ascii"),
+        "storage_url": f"gs://{bucket}/{name}",
+        "content_type": "text/plain",
+    }
+
+
+def _bucket_metadata(bucket: str) -> dict:
+    path = _bucket_path(bucket)
+    created = time.strftime("%Y-%m-%dT%H:%M:%S+0000", time.gmtime(path.stat().st_ctime))
+    return {
+        "creation_time": created,
+        "default_storage_class": "STANDARD",
+        "location": "EUROPE-WEST1",
+        "name": bucket,
+        "storage_url": f"gs://{bucket}/",
+    }
+
+
+def _format_yaml(metadata: dict) -> str:
+    return "".join(f"{key}: {value}\n" for key, value in metadata.items())
+
+
+def _format_output(metadata: dict, output_format: Optional[str]) -> str:
+    """Render metadata for --format json, json(field,...) or the yaml default."""
+    if not output_format:
+        return _format_yaml(metadata)
+    match = re.fullmatch(r"json(?:\((.*)\))?", output_format)
+    if not match:
+        raise CommandError(f"ERROR: Unsupported format [{output_format}]")
+    if match.group(1):
+        fields = [field.strip() for field in match.group(1).split(",")]
+        metadata = {field: metadata[field] for field in fields if field in metadata}
+    return json.dumps(metadata, indent=2) + "\n"
+
+
+def _write_object(bucket: str, name: str, source) -> None:
+    """Atomically write a stream into an object."""
+    target = _object_path(bucket, name)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(prefix=".stand-in-", dir=_bucket_path(bucket))
+    with os.fdopen(handle, "wb") as temp_file:
+        while chunk := source.read(1024 * 1024):
+            temp_file.write(chunk)
+    os.replace(temp_path, target)
+
+
+def _remove_empty_parents(bucket: str, name: str) -> None:
+    bucket_path = _bucket_path(bucket)
+    parent = _object_path(bucket, name).parent
+    while parent != bucket_path:
+        try:
+            parent.rmdir()
+        except OSError:
+            return
+        parent = parent.parent
+
+
+# Commands
+
+
+def buckets_create(args: Arguments) -> str:
+    bucket, _ = split_url(args.positional[0])
+    path = _bucket_path(bucket)
+    if path.exists():
+        raise CommandError(
+            "ERROR: (gcloud.storage.buckets.create) HTTPError 409: Your previous "
+            "request to create the named bucket succeeded and you already own it."
+        )
+    path.mkdir(parents=True)
+    sys.stderr.write(f"Creating gs://{bucket}/...\n")
+    return ""
+
+
+def buckets_list(args: Arguments) -> str:
+    if not _buckets_dir().is_dir():
+        return ""
+    return "".join(
+        "---\n" + _format_yaml(_bucket_metadata(path.name))
+        for path in sorted(_buckets_dir().iterdir())
+        if path.is_dir()
+    )
+
+
+def buckets_describe(args: Arguments) -> str:
+    url = args.positional[0]
+    bucket, _ = split_url(url)
+    if not _bucket_path(bucket).is_dir():
+        raise CommandError(
+            f"ERROR: (gcloud.storage.buckets.describe) {url} not found: 404."
+        )
+    return _format_output(_bucket_metadata(bucket), args.value("--format"))
+
+
+def buckets_delete(args: Arguments) -> str:
+    for url in args.positional:
+        bucket, _ = split_url(url)
+        path = _bucket_path(bucket)
+        if not path.is_dir():
+            raise CommandError(
+                f"ERROR: (gcloud.storage.buckets.delete) {url} not found: 404."
+            )
+        if _list_objects(bucket):
+            raise CommandError(
+                "ERROR: (gcloud.storage.buckets.delete) HTTPError 409: The bucket "
+                "you tried to delete is not empty."
+            )
+        for directory, _, _ in sorted(os.walk(path), reverse=True):
+            os.rmdir(directory)
+    return ""
+
+
+def _delete_bucket_recursively(bucket: str) -> None:
+    for directory, _, files in sorted(os.walk(_bucket_path(bucket)), reverse=True):
+        for file_name in files:
+            os.unlink(os.path.join(directory, file_name))
+        os.rmdir(directory)
+
+
+def rm(args: Arguments) -> str:
+    recursive = args.has("--recursive", "-r", "-R")
+    unmatched = []
+    for url in args.positional:
+        bucket, name = split_url(url)
+        if not name and recursive and _bucket_path(bucket).is_dir():
+            _delete_bucket_recursively(bucket)
+            continue
+        matches = expand_url(url)
+        if not matches:
+            unmatched.append(url)
+            continue
+        for match_bucket, match_name in matches:
+            path = _object_path(match_bucket, match_name)
+            _check_preconditions(path, args)
+            path.unlink()
+            _remove_empty_parents(match_bucket, match_name)
+            sys.stderr.write(f"Removing gs://{match_bucket}/{match_name}...\n")
+    if unmatched and not args.has("--continue-on-error"):
+        raise CommandError(
+            "ERROR: (gcloud.storage.rm) The following URLs matched no objects or "
+            "files:\n" + "\n".join(f"-{url}" for url in unmatched)
+        )
+    return ""
+
+
+def _list_children(bucket: str, prefix: str, recursive: bool) -> List[str]:
+    entries = []
+    for name in _list_objects(bucket):
+        if not name.startswith(prefix):
+            continue
+        rest = name[len(prefix) :]
+        if not recursive and "/" in rest:
+            entry = f"gs://{bucket}/{prefix}{rest.split('/', 1)[0]}/"
+        else:
+            entry = f"gs://{bucket}/{name}"
+        if entry not in entries:
+            entries.append(entry)
+    return entries
+
+
+def ls(args: Arguments) -> str:
+    recursive = args.has("--recursive", "-r", "-R")
+    lines = []
+    for url in args.positional:
+        bucket, name = split_url(url)
+        if not _bucket_path(bucket).is_dir():
+            raise CommandError(f"ERROR: (gcloud.storage.ls) {url} not found: 404.")
+        if not name or name.endswith("/"):
+            lines += _list_children(bucket, name, recursive)
+        else:
+            lines += [f"gs://{b}/{n}" for b, n in expand_url(url)]
+    if not lines:
+        raise CommandError(
+            "ERROR: (gcloud.storage.ls) One or more URLs matched no objects."
+        )
+    if args.has("--long", "-l"):
+        return _long_listing(lines)
+    return "".join(f"{line}\n" for line in lines)
+
+
+def _long_listing(urls: List[str]) -> str:
+    """`ls --long` layout: size, update time and URL; prefixes only a URL."""
+    lines, objects, total = [], 0, 0
+    for url in urls:
+        if url.endswith("/"):
+            lines.append(f"{'':>10}  {'':20}  {url}")
+            continue
+        path = _object_path(*split_url(url))
+        size = path.stat().st_size
+        updated = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(path.stat().st_mtime))
+        lines.append(f"{size:>10}  {updated}  {url}")
+        objects += 1
+        total += size
+    lines.append(f"TOTAL: {objects} objects, {total} bytes")
+    return "".join(f"{line}\n" for line in lines)
+
+
+def cp(args: Arguments) -> str:
+    source, destination = args.positional[:2]
+    if destination.startswith("gs://"):
+        bucket, name = split_url(destination)
+        if not _bucket_path(bucket).is_dir():
+            raise CommandError(
+                f"ERROR: (gcloud.storage.cp) gs://{bucket} bucket does not exist."
+            )
+        if not name or name.endswith("/"):
+            name += os.path.basename(source)
+        _check_preconditions(_object_path(bucket, name), args)
+        if source == "-":
+            _write_object(bucket, name, _input(sys.stdin.buffer))
+        else:
+            with open(source, "rb") as source_file:
+                _write_object(bucket, name, _input(source_file))
+        sys.stderr.write(f"Copying {source} to gs://{bucket}/{name}\n")
+        return ""
+    matches = expand_url(source)
+    if not matches:
+        raise CommandError(
+            "ERROR: (gcloud.storage.cp) The following URLs matched no objects or "
+            f"files:\n-{source}"
+        )
+    bucket, name = matches[0]
+    with open(_object_path(bucket, name), "rb") as source_file:
+        if destination == "-":
+            out = _output()
+            while chunk := source_file.read(1024 * 1024):
+                out.write(chunk)
+        else:
+            with open(destination, "wb") as target:
+                while chunk := source_file.read(1024 * 1024):
+                    target.write(chunk)
+    return ""
+
+
+def cat(args: Arguments) -> str:
+    for url in args.positional:
+        if not url.startswith("gs://"):
+            raise CommandError(
+                "ERROR: (gcloud.storage.cat) cat only works for valid cloud URLs. "
+                f"Failed for: {url}"
+            )
+    out = _output()
+    for url in args.positional:
+        matches = expand_url(url)
+        if not matches:
+            raise CommandError(
+                "ERROR: (gcloud.storage.cat) The following URLs matched no objects "
+                f"or files:\n-{url}"
+            )
+        for bucket, name in matches:
+            path = _object_path(bucket, name)
+            if args.has("--display-url"):
+                out.write(f"==> gs://{bucket}/{name} <==\n".encode())
+            start, stop = 0, path.stat().st_size
+            if args.value("--range"):
+                start, stop = parse_byte_range(args.value("--range"), stop)
+            with open(path, "rb") as source:
+                source.seek(start)
+                remaining = stop - start
+                while remaining > 0 and (chunk := source.read(min(remaining, 1 << 20))):
+                    out.write(chunk)
+                    remaining -= len(chunk)
+    return ""
+
+
+def objects_describe(args: Arguments) -> str:
+    url = args.positional[0]
+    bucket, name = split_url(url)
+    if not _object_path(bucket, name).is_file():
+        raise CommandError(
+            f"ERROR: (gcloud.storage.objects.describe) {url} not found: 404."
+        )
+    metadata = _object_metadata(bucket, name)
+    if args.has("--raw"):
+        metadata = {
+            "bucket": bucket,
+            "name": name,
+            "size": str(metadata["size"]),
+            "generation": metadata["generation"],
+            "crc32c": metadata["crc32c_hash"],
+            "md5Hash": metadata["md5_hash"],
+        }
+    return _format_output(metadata, args.value("--format"))
+
+
+def sign_url(args: Arguments) -> str:
+    url = args.positional[0]
+    account = args.value("--impersonate-service-account", "")
+    if not url.startswith("gs://"):
+        raise CommandError(
+            "ERROR: gcloud crashed (AttributeError): 'FileUrl' object has no "
+            "attribute 'is_provider'"
+        )
+    if "@" not in account:
+        raise CommandError(
+            f"ERROR: (gcloud.storage.sign-url) INVALID_ARGUMENT: Invalid form of "
+            f"account ID {account}. Should be [Gaia ID |Email |Unique ID |] of the "
+            f"account"
+        )
+    bucket, name = split_url(url)
+    duration = int(args.value("--duration", "3600"))
+    expires = time.strftime(
+        "%Y-%m-%d %H:%M:%S", time.gmtime(time.time() + duration)
+    )
+    signature = hashlib.sha256(f"{url}:{account}:{expires}".encode()).hexdigest()
+    return (
+        "---\n"
+        f"expiration: '{expires}'\n"
+        f"http_verb: {args.value('--http-verb', 'GET')}\n"
+        f"resource: {url}\n"
+        f"signed_url: https://storage.googleapis.com/{bucket}/{name}"
+        f"?x-goog-signature={signature}\n"
+    )
+
+
+def projects_list(args: Arguments) -> str:
+    projects = (
+        sorted(path.name for path in _projects_dir().iterdir())
+        if _projects_dir().is_dir()
+        else []
+    )
+    if args.value("--limit"):
+        projects = projects[: int(args.value("--limit"))]
+    rows = [f"{project:<30} {project:<30} 000000000000" for project in projects]
+    return "\n".join(["PROJECT_ID NAME PROJECT_NUMBER"] + rows) + "\n"
+
+
+def projects_create(args: Arguments) -> str:
+    _projects_dir().mkdir(parents=True, exist_ok=True)
+    (_projects_dir() / args.positional[0]).mkdir(exist_ok=True)
+    return ""
+
+
+def no_op(args: Arguments) -> str:
+    return ""
+
+
+def version(args: Arguments) -> str:
+    if args.value("--format"):
+        return f"{VERSION}\n"
+    return f"Google Cloud SDK {VERSION} (stand-in)\n"
+
+
+COMMANDS = {
+    "storage buckets create": buckets_create,
+    "storage buckets list": buckets_list,
+    "storage buckets describe": buckets_describe,
+    "storage buckets delete": buckets_delete,
+    "storage buckets add-iam-policy-binding": no_op,
+    "storage rm": rm,
+    "storage ls": ls,
+    "storage cp": cp,
+    "storage cat": cat,
+    "storage objects describe": objects_describe,
+    "storage sign-url": sign_url,
+    "projects list": projects_list,
+    "projects create": projects_create,
+    "services enable": no_op,
+    "iam service-accounts add-iam-policy-binding": no_op,
+    "version": version,
+}
+
+
+def split_command(argv: List[str]) -> Tuple[str, List[str]]:
+    """Split argv into the command path and its arguments."""
+    path = []
+    for index, token in enumerate(argv):
+        if token.startswith("-"):
+            return " ".join(path), argv[index:]
+        path.append(token)
+        if token not in COMMAND_GROUPS:
+            return " ".join(path), argv[index + 1 :]
+    return " ".join(path), []
+
+
+def _inject_faults(command: str) -> bool:
+    """
+    Apply the root's fault plan to this invocation: sleep for the drawn
+    latency, set the bandwidth cap and stall of the object stream, and
+    report an injected HTTP error. Returns False when the command must fail.
+    """
+    global _throttle
+    root = os.environ.get(ROOT_ENV)
+    plan = load_plan(root) if root else None
+    if plan is None or plan.faults_for(command) is None:
+        return True
+    injection = plan.draw(command, next_invocation(root, command))
+    if injection.delay:
+        time.sleep(injection.delay)
+    if injection.error_status:
+        sys.stderr.write(error_message(command, injection.error_status) + "\n")
+        return False
+    if injection.bandwidth or injection.stall_at is not None:
+        _throttle = Throttle(
+            injection.bandwidth, injection.stall_at, injection.stall_seconds
+        )
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    command, rest = split_command(argv)
+    handler = COMMANDS.get(command)
+    if handler is None:
+        sys.stderr.write(f"ERROR: (gcloud) Invalid choice: '{command}'.\n")
+        return 2
+    try:
+        if not _inject_faults(command):
+            return 1
+        sys.stdout.write(handler(Arguments(rest)))
+    except CommandError as error:
+        sys.stdout.flush()
+        sys.stderr.write(f"{error}\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,45 +1,51 @@
+from typing import TYPE_CHECKING
+
 import pytest
-from playwright.sync_api import Playwright, sync_playwright
 
-from src.gcp_test_client.gcp_client import GcpStorage
+from src.helpers.import_profiler import startup_profiler
+
+# Installed before the remaining imports so the startup profile covers the
+# whole plugin layer and the collected test modules.
+startup_profiler.install()
+
+from src.gcp_test_client.gcp_client import GcpStorage  # noqa: E402
+
+if TYPE_CHECKING:
+    from src.helpers.signed_url_verifier import SignedUrlVerifier
 
-DEFAULT_TIMEOUT_MS = 30000
+HTTP_POOL_SIZE = 4
 
 pytest_plugins = [
     "src.fixtures.gsp_fixture",
+    "src.fixtures.browser_fixture",
+    "src.fixtures.deferred_fixture",
+    "src.fixtures.scheduling_fixture",
+    "src.fixtures.metrics_fixture",
+    "src.fixtures.operations_fixture",
+    "src.fixtures.tracing_fixture",
+    "src.fixtures.perf_history_fixture",
+    "src.fixtures.stand_in_fixture",
+    "src.fixtures.settings_fixture",
+    "src.fixtures.payload_fixture",
+    "src.fixtures.startup_fixture",
 ]
 
 
 @pytest.fixture(scope="session")
-def pw():
-    p = sync_playwright().start()
-    yield p
-    p.stop()
+def http_pool():
+    # urllib3 and the verifier load with the first test that needs them.
+    import urllib3
 
-
-@pytest.fixture(scope="session")
-def browser(pw: Playwright):
-    browser = pw.chromium.launch(
-        headless=True,
-        args=["--disable-web-security"],
-    )
-    yield browser
-    browser.close()
+    pool = urllib3.PoolManager(maxsize=HTTP_POOL_SIZE)
+    yield pool
+    pool.clear()
 
 
 @pytest.fixture()
-def context(browser):
-    context = browser.new_context(ignore_https_errors=True)
-    context.set_default_timeout(DEFAULT_TIMEOUT_MS)
-    yield context
-    context.close()
+def signed_url_verifier(http_pool) -> "SignedUrlVerifier":
+    from src.helpers.signed_url_verifier import SignedUrlVerifier
 
-
-@pytest.fixture()
-def page(context):
-    page = context.new_page()
-    yield page
-    page.close()
+    return SignedUrlVerifier(http_pool)
 
 
 @pytest.fixture(scope="session")
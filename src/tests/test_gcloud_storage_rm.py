@@ -2,13 +2,8 @@ import random
 
 import pytest
 from assertpy import assert_that
-from faker import Faker
 
 from src.helpers.assert_helper import AssertHelper
-from src.helpers.data_helper import create_sample_text_file
-from src.helpers.time_helper import get_current_epoch_time
-
-fake = Faker()
 
 
 class TestGcloudStorageRm:
@@ -18,38 +13,41 @@ class TestGcloudStorageRm:
     patterns, headers, and error scenarios.
     """
 
-    test_file_content = fake.paragraph()
-    test_file2_content = fake.paragraph()
-
     @pytest.fixture(autouse=True)
-    def setup_test(self, sample_project, sample_bucket, gcp_client, assert_helper):
+    def setup_test(
+        self,
+        sample_project,
+        sample_bucket,
+        gcp_client,
+        assert_helper,
+        upload_to_bucket,
+        payloads,
+        unique_name,
+    ):
         self.client = gcp_client
         self.project = sample_project
         self.bucket = sample_bucket
         self.assert_helper: AssertHelper = assert_helper
+        self.upload_to_bucket = upload_to_bucket
+        self.payloads = payloads
+        self.unique_name = unique_name
 
     def _create_and_upload_file(
         self, file_name=None, file_content=None, bucket=None
     ) -> tuple:
         """
-        Helper method to create a local file and upload it to the bucket.
+        Helper method to upload a file with the given content to the bucket.
         """
         if not file_name:
-            file_name = f"file-{get_current_epoch_time()}.txt"
+            file_name = self.unique_name()
         if not file_content:
-            file_content = fake.paragraph()
+            file_content = self.payloads.paragraph()
         if bucket is None:
             bucket = self.bucket
 
-        local_file_path = create_sample_text_file(
-            file_name=file_name, file_content=file_content
-        )
-        upload_response = self.client.copy_file_to_bucket(
-            local_file_path=local_file_path, bucket=bucket, file_name=file_name
-        )
-        assert_that(upload_response.status_code).is_equal_to(0)
+        object_url = self.upload_to_bucket(file_name, file_content, bucket=bucket)
 
-        return local_file_path, file_name, file_content
+        return object_url, file_name, file_content
 
     def _verify_file_exists(self, file_name, bucket=None):
         """
@@ -115,24 +113,14 @@ class TestGcloudStorageRm:
         if bucket is None:
             bucket = self.bucket
         if file_contents is None:
-            file_contents = [fake.text() for _ in file_names]
+            file_contents = [self.payloads.text() for _ in file_names]
 
-        local_file_paths = []
-
-        for file_name, file_content in zip(file_names, file_contents):
-            local_file_path = create_sample_text_file(
-                file_name=f"pattern_test_{random.randint(1000, 9999)}_{file_name}",
-                file_content=file_content,
-            )
-            local_file_paths.append(local_file_path)
-
-            upload_response = self.client.copy_file_to_bucket(
-                local_file_path=local_file_path, bucket=bucket, file_name=file_name
-            )
-            assert_that(upload_response.status_code).is_equal_to(0)
-
-        return local_file_paths
+        return [
+            self.upload_to_bucket(file_name, file_content, bucket=bucket)
+            for file_name, file_content in zip(file_names, file_contents)
+        ]
 
+    @pytest.mark.operation_budget(class_a=6, class_b=2)
     def test_delete_single_file_from_bucket(self):
         """
         Test deletion of a single file from bucket.
@@ -149,6 +137,7 @@ class TestGcloudStorageRm:
 
         self._verify_file_deleted(file_name)
 
+    @pytest.mark.operation_budget(class_a=8, class_b=2)
     def test_delete_entire_bucket_with_recursive_flag(self):
         """
         Test deletion of an entire bucket using recursive flag.
@@ -169,31 +158,35 @@ class TestGcloudStorageRm:
         """
         Test deletion of all objects in bucket using wildcard pattern.
         Verifies multiple file upload, wildcard deletion, and confirmation all files are removed.
+        Runs in its own bucket, so objects of concurrent tests survive.
         """
-        test_file_name = f"file-{get_current_epoch_time()}.txt"
-        test_file_content = fake.paragraph()
-        test_file2_name = f"file2-{get_current_epoch_time()}.txt"
-        test_file2_content = fake.paragraph()
+        test_bucket_name = self._create_bucket()
+        test_file_name = self.unique_name("file")
+        test_file_content = self.payloads.paragraph()
+        test_file2_name = self.unique_name("file2")
+        test_file2_content = self.payloads.paragraph()
         file_names = [test_file_name, test_file2_name]
         file_contents = [test_file_content, test_file2_content]
 
-        self._upload_multiple_files(file_names, file_contents)
+        self._upload_multiple_files(file_names, file_contents, bucket=test_bucket_name)
 
         for file_name in file_names:
-            self._verify_file_exists(file_name)
+            self._verify_file_exists(file_name, bucket=test_bucket_name)
 
-        delete_response = self.client.delete_object(bucket=self.bucket, pattern="**")
+        delete_response = self.client.delete_object(
+            bucket=test_bucket_name, pattern="**"
+        )
         assert_that(delete_response.status_code).is_equal_to(0)
 
         for file_name in file_names:
-            self._verify_file_deleted(file_name)
+            self._verify_file_deleted(file_name, bucket=test_bucket_name)
 
     def test_delete_bucket_and_contents_recursively(self):
         """
         Test recursive deletion of bucket containing files.
         Verifies bucket with content creation, recursive deletion, and complete bucket removal.
         """
-        local_file_path, file_name, file_content = self._create_and_upload_file()
+        _, file_name, file_content = self._create_and_upload_file()
 
         test_bucket_name = f"test-bucket-recursive-{random.randint(10000, 99999)}"
 
@@ -202,17 +195,7 @@ class TestGcloudStorageRm:
         )
         assert_that(create_response.status_code).is_equal_to(0)
 
-        local_file_path = create_sample_text_file(
-            file_name=f"recursive_test_{random.randint(1000, 9999)}.txt",
-            file_content=file_content,
-        )
-
-        upload_response = self.client.copy_file_to_bucket(
-            local_file_path=local_file_path,
-            bucket=test_bucket_name,
-            file_name=file_name,
-        )
-        assert_that(upload_response.status_code).is_equal_to(0)
+        self.upload_to_bucket(file_name, file_content, bucket=test_bucket_name)
 
         delete_response = self.client.delete_object(
             bucket=test_bucket_name, recursive=True
@@ -221,19 +204,19 @@ class TestGcloudStorageRm:
 
         self._verify_bucket_deleted(test_bucket_name)
 
+    @pytest.mark.operation_budget(class_a=16, class_b=4)
     def test_delete_files_by_extension_pattern(self):
         """
         Test selective deletion of files using file extension pattern.
         Verifies pattern-based deletion affects only matching files while preserving others.
         """
-        time = get_current_epoch_time()
         txt_file_names = [
-            f"1{time}test-extension.txt",
-            f"2{time}test-extension.txt",
-            f"{time}document.txt",
+            self.unique_name("1", "-test-extension.txt"),
+            self.unique_name("2", "-test-extension.txt"),
+            self.unique_name("", "-document.txt"),
         ]
 
-        txt_file_contents = [fake.text() for _ in txt_file_names]
+        txt_file_contents = [self.payloads.text() for _ in txt_file_names]
         self._upload_multiple_files(txt_file_names, txt_file_contents)
 
         delete_response = self.client.delete_object(
@@ -242,6 +225,10 @@ class TestGcloudStorageRm:
         assert_that(delete_response.status_code).is_equal_to(0)
         for txt_file in txt_file_names[:2]:
             self._verify_file_deleted(txt_file)
+        remaining = next(
+            self.client.iter_objects(self.bucket, glob="**test-extension.txt"), None
+        )
+        assert_that(remaining).is_none()
 
         self._verify_file_exists(txt_file_names[2])
 
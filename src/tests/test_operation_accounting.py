@@ -0,0 +1,133 @@
+import pytest
+from assertpy import assert_that
+
+from src.helpers.operation_accounting import (
+    OperationCounts,
+    classify_command,
+    exceeded_budget,
+)
+
+
+class TestOperationAccounting:
+    """
+    Test cases for the operation classes estimated from gcloud command lines.
+    """
+
+    @pytest.mark.parametrize(
+        "command, label, expected",
+        [
+            (
+                ["gcloud", "storage", "buckets", "create", "gs://b"],
+                "storage buckets create",
+                {"class_a": 1},
+            ),
+            (
+                ["gcloud", "storage", "buckets", "add-iam-policy-binding", "gs://b"],
+                "storage buckets add-iam-policy-binding",
+                {"class_b": 1, "class_a": 1},
+            ),
+            (
+                ["gcloud", "storage", "sign-url", "gs://b/x", "--duration", "1m"],
+                "storage sign-url",
+                {"iam": 1},
+            ),
+            (
+                ["gcloud", "storage", "cat", "gs://b/a", "gs://b/c"],
+                "storage cat",
+                {"class_b": 2},
+            ),
+            (
+                ["gcloud", "storage", "cat", "gs://b/a", "gs://b/c*", "--range", "1-3"],
+                "storage cat",
+                {"class_b": 2, "class_a": 1},
+            ),
+            (
+                ["gcloud", "storage", "rm", "gs://b/x"],
+                "storage rm",
+                {"free": 1},
+            ),
+            (
+                ["gcloud", "storage", "rm", "gs://b", "--quiet", "--recursive"],
+                "storage rm",
+                {"free": 1, "class_a": 1},
+            ),
+            (
+                ["gcloud", "storage", "rm", "gs://b/**"],
+                "storage rm",
+                {"free": 1, "class_a": 1},
+            ),
+            (
+                ["gcloud", "storage", "cp", "/tmp/a", "gs://b/a"],
+                "storage cp",
+                {"class_a": 1},
+            ),
+            (
+                [
+                    "gcloud",
+                    "storage",
+                    "cp",
+                    "-",
+                    "gs://b/x",
+                    "--if-generation-match",
+                    "0",
+                ],
+                "storage cp",
+                {"class_a": 1},
+            ),
+            (
+                ["gcloud", "storage", "cp", "gs://b/a", "/tmp/a"],
+                "storage cp",
+                {"class_b": 1},
+            ),
+            (
+                ["gcloud", "storage", "cp", "gs://b/*", "/tmp/d"],
+                "storage cp",
+                {"class_b": 1, "class_a": 1},
+            ),
+            (
+                ["gcloud", "storage", "mv", "gs://b/a", "gs://b/c"],
+                "storage mv",
+                {"class_a": 1, "free": 1},
+            ),
+            (
+                ["gcloud", "storage", "cp", "gs://b/a"],
+                "storage cp",
+                {},
+            ),
+            (
+                ["gcloud", "config", "list"],
+                "config list",
+                {},
+            ),
+        ],
+    )
+    def test_classify_command(self, command, label, expected):
+        """
+        Test the operation classes of one command line.
+        Verifies per-command, per-object and copy estimates, flag values
+        not counted as URLs, and listings for wildcard or recursive URLs.
+        """
+        assert_that(classify_command(command, label)).is_equal_to(expected)
+
+    @pytest.mark.parametrize(
+        "budget, expected",
+        [
+            ({"class_a": 3}, []),
+            ({"class_a": 2}, ["class_a: 3 > 2 (storage cp x2, storage ls x1)"]),
+            ({"class_b": 0, "free": 5}, ["class_b: 1 > 0 (storage cat x1)"]),
+        ],
+    )
+    def test_exceeded_budget(self, budget, expected):
+        """
+        Test budget checks over counts of several command labels.
+        Verifies that only exceeded classes are reported, with their labels.
+        """
+        counts = OperationCounts(
+            {
+                "storage cp": {"class_a": 2},
+                "storage ls": {"class_a": 1},
+                "storage cat": {"class_b": 1},
+            }
+        )
+
+        assert_that(exceeded_budget(counts, budget)).is_equal_to(expected)
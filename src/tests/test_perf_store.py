@@ -0,0 +1,155 @@
+import pytest
+from assertpy import assert_that
+
+from src.helpers.perf_store import COMMAND_METRIC, TEST_METRIC, PerfStore
+
+
+class TestPerfStore:
+    """
+    Test cases for baseline selection and regression detection of the
+    performance history store.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_test(self, tmp_path):
+        self.store = PerfStore(str(tmp_path / "history.sqlite"))
+        yield
+        self.store.close()
+
+    def _add_run(self, durations, name="storage cat", project="p1", region="r1"):
+        samples = [(COMMAND_METRIC, name, duration) for duration in durations]
+        return self.store.add_run(samples, project=project, region=region)
+
+    def _add_baseline(self, runs=5, **kwargs):
+        return [
+            self._add_run([1.0 + 0.01 * i, 1.02 + 0.01 * i, 0.98 + 0.01 * i], **kwargs)
+            for i in range(runs)
+        ]
+
+    def test_baseline_runs_match_config_and_precede_run(self):
+        """
+        Test baseline selection for a run.
+        Verifies that only earlier runs with the same project and region are
+        chosen, newest first and at most `count` of them.
+        """
+        first, second, third = self._add_baseline(runs=3)
+        self._add_run([1.0], project="p2")
+        self._add_run([1.0], region="r2")
+        current = self.store.run(self._add_run([1.0]))
+        later = self._add_run([1.0])
+
+        baseline_ids = [run.id for run in self.store.baseline_runs(current, 10)]
+
+        assert_that(baseline_ids).is_equal_to([third, second, first])
+        assert_that(baseline_ids).does_not_contain(later)
+        limited = self.store.baseline_runs(current, 2)
+        assert_that([run.id for run in limited]).is_equal_to([third, second])
+
+    def test_baseline_runs_match_missing_region(self):
+        """
+        Test baseline selection for runs without a region.
+        Verifies that runs without a region only match each other.
+        """
+        unset = self._add_run([1.0], region=None)
+        self._add_run([1.0], region="r1")
+        current = self.store.run(self._add_run([1.0], region=None))
+
+        baseline_ids = [run.id for run in self.store.baseline_runs(current, 10)]
+
+        assert_that(baseline_ids).is_equal_to([unset])
+
+    def test_find_regressions_flags_significant_slowdown(self):
+        """
+        Test a run whose samples are twice as slow as the baseline.
+        Verifies that the metric is reported with both medians.
+        """
+        self._add_baseline()
+        run_id = self._add_run([2.0, 2.1, 1.9, 2.05, 1.95])
+
+        regressions = self.store.find_regressions(run_id)
+
+        assert_that(regressions).is_length(1)
+        regression = regressions[0]
+        assert_that(regression.kind).is_equal_to(COMMAND_METRIC)
+        assert_that(regression.name).is_equal_to("storage cat")
+        assert_that(regression.current_median).is_equal_to(2.0)
+        assert_that(regression.slowdown).is_greater_than(0.9)
+        assert_that(regression.p_value).is_less_than(0.01)
+
+    def test_find_regressions_uses_z_score_for_few_samples(self):
+        """
+        Test a run with fewer samples than a rank test needs.
+        Verifies that a single slow sample is still flagged.
+        """
+        self._add_baseline()
+
+        regressions = self.store.find_regressions(self._add_run([3.0]))
+
+        assert_that([r.name for r in regressions]).is_equal_to(["storage cat"])
+
+    @pytest.mark.parametrize(
+        "current, baseline_runs",
+        [
+            # significant, but below the 20% threshold
+            ([1.1, 1.11, 1.12, 1.13, 1.14], 5),
+            # slower, but the baseline has too few samples
+            ([2.0, 2.1, 1.9], 0),
+            # faster than the baseline
+            ([0.5, 0.5, 0.5], 5),
+        ],
+    )
+    def test_find_regressions_ignores_unflagged_metrics(self, current, baseline_runs):
+        """
+        Test runs that must not be reported as regressions.
+        Verifies the relative threshold, the minimum baseline size and the
+        one-sided comparison.
+        """
+        self._add_baseline(runs=baseline_runs)
+        self._add_run([1.0])
+
+        regressions = self.store.find_regressions(self._add_run(current))
+
+        assert_that(regressions).is_empty()
+
+    def test_find_regressions_ignores_other_configs(self):
+        """
+        Test a slow run whose only history is from another region.
+        Verifies that no baseline is borrowed across configs.
+        """
+        self._add_baseline(region="r2")
+
+        regressions = self.store.find_regressions(self._add_run([3.0, 3.0, 3.0]))
+
+        assert_that(regressions).is_empty()
+
+    def test_find_regressions_defaults_to_latest_run_and_sorts(self):
+        """
+        Test comparing without a run id.
+        Verifies that the latest run is used and regressions are ordered by
+        slowdown, largest first.
+        """
+        for _ in range(4):
+            self.store.add_run(
+                [(COMMAND_METRIC, "storage cat", 1.0), (TEST_METRIC, "test_a", 1.0)]
+                * 3,
+                project="p1",
+                region="r1",
+            )
+        self.store.add_run(
+            [(COMMAND_METRIC, "storage cat", 2.0), (TEST_METRIC, "test_a", 4.0)] * 3,
+            project="p1",
+            region="r1",
+        )
+
+        regressions = self.store.find_regressions()
+
+        assert_that([r.name for r in regressions]).is_equal_to(
+            ["test_a", "storage cat"]
+        )
+
+    def test_find_regressions_of_empty_store(self):
+        """
+        Test comparing when no run is stored.
+        Verifies that nothing is reported.
+        """
+        assert_that(self.store.find_regressions()).is_empty()
@@ -2,12 +2,16 @@ import random
 
 import pytest
 from assertpy import assert_that
-from faker import Faker
 
 from src.helpers.assert_helper import AssertHelper
-from src.helpers.time_helper import get_current_epoch_time
-
-fake = Faker()
+from src.helpers.checksum_helper import compute_checksums, get_object_checksums
+from src.helpers.large_object_generator import SeededObject
+from src.helpers.range_fuzzer import (
+    RangeFuzzer,
+    expected_range_bytes,
+    generate_ranges,
+    utf8_split_offsets,
+)
 
 
 class TestReadBucketFiles:
@@ -17,25 +21,35 @@ class TestReadBucketFiles:
     pattern matching, byte ranges, headers, and error scenarios.
     """
 
-    file_1_content = fake.paragraph()
-    file_2_content = fake.paragraph()
+    large_object_size = 16 * 1024 * 1024
+    # one gcloud process per range, so fuzzing stays at a few parallel waves
+    text_fuzz_range_count = 32
+    large_object_fuzz_range_count = 16
 
     @pytest.fixture(autouse=True)
-    def setup_test(self, sample_project, sample_bucket, gcp_client, assert_helper):
+    def setup_test(
+        self,
+        sample_project,
+        sample_bucket,
+        gcp_client,
+        assert_helper,
+        upload_to_bucket,
+        payloads,
+        unique_name,
+    ):
         self.client = gcp_client
         self.project = sample_project
         self.bucket = sample_bucket
         self.assert_helper: AssertHelper = assert_helper
+        self.upload_to_bucket = upload_to_bucket
+        self.payloads = payloads
+        self.unique_name = unique_name
 
-    @staticmethod
-    def _create_bucket_file(sample_file_to_bucket, file_name: str = None):
-        if not file_name:
-            file_name = f"file-{get_current_epoch_time()}.txt"
-        file_content = fake.paragraph()
-        bucket_file = sample_file_to_bucket(
-            file_name=file_name, file_content=file_content
-        )
-        return file_name, file_content, bucket_file
+    def _create_bucket_file(self, sample_file_to_bucket):
+        """Store generated content under its content address."""
+        file_content = self.payloads.paragraph()
+        bucket_file = sample_file_to_bucket(file_content=file_content)
+        return file_content, bucket_file
 
     @staticmethod
     def _assert_successful_response(response, expected_contents):
@@ -48,16 +62,13 @@ class TestReadBucketFiles:
             assert_that(response.output).contains(expected_contents)
 
     @staticmethod
-    def _get_expected_bytes_content(content, start=None, end=None):
-        """Helper method to extract expected content from bytes range."""
-        file_bytes = content.encode("utf-8")
-        if start is not None and end is not None:
-            expected_bytes = file_bytes[start:end]
-        elif end is not None:  # end is negative (last n bytes)
-            expected_bytes = file_bytes[end:]
-        else:
-            expected_bytes = file_bytes
-        return expected_bytes.decode("utf-8", errors="ignore")
+    def _get_expected_bytes_content(content, range_value):
+        """Helper method to extract expected bytes for a --range value."""
+        return expected_range_bytes(content.encode("utf-8"), range_value)
+
+    def _read_range_bytes(self, url, range_value):
+        """Raw bytes of a range read, without the stripping of captured output."""
+        return b"".join(self.client.stream_file_from_url(url, range_value=range_value))
 
     def _cat_file_and_assert_success(self, urls, expected_contents, **kwargs):
         """Helper method to call cat_file_from_url and assert successful response."""
@@ -70,34 +81,52 @@ class TestReadBucketFiles:
         Test reading a single file from bucket using cat command.
         Verifies that file content is correctly retrieved and displayed.
         """
-        _, file_content, bucket_file = self._create_bucket_file(sample_file_to_bucket)
+        file_content, bucket_file = self._create_bucket_file(sample_file_to_bucket)
         self._cat_file_and_assert_success([bucket_file], file_content)
 
-    def test_read_multiple_files_with_pattern(self, sample_file_to_bucket):
+    def test_read_multiple_files_with_pattern(self):
         """
         Test reading multiple files using wildcard pattern.
-        Verifies that all matching files are read and their contents are displayed.
+        Verifies that every matching file is read and attributed its own content.
         """
-        time = get_current_epoch_time()
-        file1_name = f"1{time}-file-pattern.txt"
-        file2_name = f"2{time}-file-pattern.txt"
+        file1_name = self.unique_name("1", "-file-pattern.txt")
+        file2_name = self.unique_name("2", "-file-pattern.txt")
 
-        _, file_1_content, _ = self._create_bucket_file(
-            sample_file_to_bucket, file_name=file1_name
-        )
-        _, file_2_content, _ = self._create_bucket_file(
-            sample_file_to_bucket, file_name=file2_name
-        )
+        file_1_content = self.payloads.paragraph()
+        file_2_content = self.payloads.paragraph()
+        file_1_url = self.upload_to_bucket(file1_name, file_1_content)
+        file_2_url = self.upload_to_bucket(file2_name, file_2_content)
 
         pattern = f"gs://{self.bucket}/*file-pattern.txt"
-        self._cat_file_and_assert_success([pattern], [file_1_content, file_2_content])
+        results = self.client.read_objects([pattern])
+
+        assert_that(results).contains_key(file_1_url, file_2_url)
+        for url, response in results.items():
+            assert_that(response.status_code).described_as(url).is_equal_to(0)
+        assert_that(results[file_1_url].output).is_equal_to(file_1_content)
+        assert_that(results[file_2_url].output).is_equal_to(file_2_content)
+
+    @pytest.mark.parametrize("payload_type", ["text", "bytes"])
+    def test_read_file_uploaded_via_temp_files(self, payload_type):
+        """
+        Test reading a file uploaded through the --upload-via-temp-files path.
+        Verifies that text and raw multi-byte payloads keep their exact bytes.
+        """
+        file_content = self.payloads.multibyte_text()
+        payload = file_content if payload_type == "text" else file_content.encode()
+        file_name = self.unique_name(payload_type, "-temp-file.txt")
+
+        bucket_file = self.upload_to_bucket(file_name, payload, via_temp_files=True)
+
+        content = b"".join(self.client.stream_file_from_url(bucket_file))
+        assert_that(content).is_equal_to(file_content.encode("utf-8"))
 
     def test_read_file_with_display_url_header(self, sample_file_to_bucket):
         """
         Test reading file with display URL header enabled.
         Verifies that file content is shown along with URL header information.
         """
-        _, file_content, bucket_file = self._create_bucket_file(sample_file_to_bucket)
+        file_content, bucket_file = self._create_bucket_file(sample_file_to_bucket)
 
         self._cat_file_and_assert_success(
             [bucket_file], [file_content, bucket_file], display_url=True
@@ -110,12 +139,13 @@ class TestReadBucketFiles:
         """
         start = 1
         end = 30
-        _, file_content, bucket_file = self._create_bucket_file(sample_file_to_bucket)
+        file_content, bucket_file = self._create_bucket_file(sample_file_to_bucket)
 
-        expected_content = self._get_expected_bytes_content(file_content, start, end)
-        self._cat_file_and_assert_success(
-            [bucket_file], expected_content, range_value=f"{start}-{end}"
+        expected_content = self._get_expected_bytes_content(
+            file_content, f"{start}-{end}"
         )
+        content = self._read_range_bytes(bucket_file, f"{start}-{end}")
+        assert_that(content).is_equal_to(expected_content)
 
     def test_read_file_last_n_bytes(self, sample_file_to_bucket):
         """
@@ -123,14 +153,107 @@ class TestReadBucketFiles:
         Verifies that only the final N bytes of the file are returned.
         """
         n = 5
-        _, file_content, bucket_file = self._create_bucket_file(sample_file_to_bucket)
+        file_content, bucket_file = self._create_bucket_file(sample_file_to_bucket)
 
-        expected_content = self._get_expected_bytes_content(file_content, end=-n)
+        expected_content = self._get_expected_bytes_content(file_content, f"-{n}")
 
-        self._cat_file_and_assert_success(
-            [bucket_file], expected_content, range_value=f"-{n}"
+        content = self._read_range_bytes(bucket_file, f"-{n}")
+        assert_that(content).is_equal_to(expected_content)
+
+    @pytest.mark.parametrize("range_value", ["1048576-1049599", "16776000-", "-4096"])
+    def test_read_byte_range_of_large_object(
+        self, sample_seeded_object_to_bucket, range_value
+    ):
+        """
+        Test reading byte ranges from a large seeded object.
+        Verifies that the returned bytes exactly match the locally computed range.
+        """
+        seeded_object = SeededObject(size=self.large_object_size, seed=1)
+        bucket_file = sample_seeded_object_to_bucket(seeded_object)
+
+        content = self._read_range_bytes(bucket_file, range_value)
+        assert_that(content).is_equal_to(seeded_object.expected_range(range_value))
+
+    @pytest.mark.operation_budget(class_a=4, class_b=64)
+    def test_read_random_byte_ranges_of_multibyte_text(self, sample_file_to_bucket):
+        """
+        Test reading random byte ranges of text with multi-byte characters.
+        Verifies that every range, including ones splitting a character,
+        returns exactly the expected bytes.
+        """
+        file_content = self.payloads.multibyte_text().encode("utf-8")
+        bucket_file = sample_file_to_bucket(file_content=file_content)
+        ranges = generate_ranges(
+            len(file_content),
+            count=self.text_fuzz_range_count,
+            seed=self.payloads.seed,
+            split_offsets=utf8_split_offsets(file_content),
         )
 
+        mismatches = RangeFuzzer(self.client).check(bucket_file, file_content, ranges)
+
+        assert_that([str(mismatch) for mismatch in mismatches]).is_empty()
+
+    def test_read_random_byte_ranges_of_large_object(
+        self, sample_seeded_object_to_bucket
+    ):
+        """
+        Test reading random byte ranges of a large seeded object.
+        Verifies that every range returns exactly the locally generated bytes.
+        """
+        seeded_object = SeededObject(size=self.large_object_size, seed=1)
+        bucket_file = sample_seeded_object_to_bucket(seeded_object)
+        ranges = generate_ranges(
+            seeded_object.size,
+            count=self.large_object_fuzz_range_count,
+            seed=self.payloads.seed,
+            max_length=256 * 1024,
+        )
+
+        mismatches = RangeFuzzer(self.client).check(bucket_file, seeded_object, ranges)
+
+        assert_that([str(mismatch) for mismatch in mismatches]).is_empty()
+
+    def test_read_large_object_matches_metadata_checksums(
+        self, sample_seeded_object_to_bucket
+    ):
+        """
+        Test streaming a large object through CRC32C and MD5.
+        Verifies that streamed and local source digests match the object metadata.
+        """
+        seeded_object = SeededObject(size=self.large_object_size, seed=1)
+        bucket_file = sample_seeded_object_to_bucket(seeded_object)
+        expected_checksums = get_object_checksums(self.client, bucket_file)
+
+        streamed_checksums = compute_checksums(
+            self.client.stream_file_from_url(bucket_file)
+        )
+        source_checksums = compute_checksums(seeded_object.iter_chunks())
+
+        self.assert_helper.assert_checksums_match(
+            streamed_checksums, expected_checksums
+        )
+        self.assert_helper.assert_checksums_match(source_checksums, expected_checksums)
+
+    def test_download_large_object_in_slices(
+        self, sample_seeded_object_to_bucket, tmp_path
+    ):
+        """
+        Test downloading a large object in parallel byte-range slices.
+        Verifies that the memory-mapped file has the object's size and hashes.
+        """
+        seeded_object = SeededObject(size=self.large_object_size, seed=1)
+        bucket_file = sample_seeded_object_to_bucket(seeded_object)
+        destination = tmp_path / "large-object.txt"
+
+        result = self.client.download_object(
+            bucket_file, str(destination), slice_size=4 * 1024 * 1024
+        )
+
+        assert_that(result.slices).is_equal_to(4)
+        assert_that(result.verified).is_true()
+        assert_that(destination.stat().st_size).is_equal_to(seeded_object.size)
+
     def test_read_nonexistent_file_returns_error(self):
         """
         Test reading a non-existent file from bucket.
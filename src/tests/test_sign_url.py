@@ -1,16 +1,9 @@
-import time
-
 import pytest
 from assertpy import assert_that
-from faker import Faker
-from playwright.sync_api import Page
 
 from src.helpers.assert_helper import AssertHelper
 from src.helpers.data_helper import extract_url
-from src.helpers.signed_url_page import SignedUrlPage
-from src.helpers.time_helper import get_current_epoch_time
-
-fake = Faker()
+from src.helpers.signed_url_verifier import SignedUrlVerifier
 
 
 class TestSignUrlCommand:
@@ -20,8 +13,6 @@ class TestSignUrlCommand:
     time-based access control, and error scenarios.
     """
 
-    file_name = f"file-{get_current_epoch_time()}.txt"
-
     @pytest.fixture(autouse=True)
     def setup_test(
         self,
@@ -29,15 +20,14 @@ class TestSignUrlCommand:
         sample_bucket,
         service_account,
         gcp_client,
-        page,
+        signed_url_verifier,
         assert_helper,
     ):
         self.client = gcp_client
         self.project = sample_project
         self.bucket = sample_bucket
         self.sa = service_account
-        self.page: Page = page
-        self.signed_url_page = SignedUrlPage(page)
+        self.signed_url_verifier: SignedUrlVerifier = signed_url_verifier
         self.assert_helper: AssertHelper = assert_helper
 
     @staticmethod
@@ -52,8 +42,7 @@ class TestSignUrlCommand:
         Test generation of signed URL for file access.
         Verifies that signed URL is generated and provides valid file access.
         """
-        file_name = f"file-{get_current_epoch_time()}.txt"
-        bucket_file_path = sample_file_to_bucket(file_name=file_name)
+        bucket_file_path = sample_file_to_bucket()
         response = self.client.sign_url(
             bucket_file_path=bucket_file_path,
             project=self.project,
@@ -61,17 +50,17 @@ class TestSignUrlCommand:
         )
         url = self._assert_sign_up_url(response=response)
         assert_that(url).is_not_empty()
-        self.signed_url_page.navigate_to_signed_url(url)
-        self.signed_url_page.assert_file_access_granted()
+        self.signed_url_verifier.navigate_to_signed_url(url)
+        self.signed_url_verifier.assert_file_access_granted()
 
-    def test_signed_url_expires_after_duration(self, sample_file_to_bucket):
+    def test_signed_url_expires_after_duration(self, sample_file_to_bucket, defer):
         """
         Test time-limited access with signed URL expiration.
         Verifies that signed URL becomes invalid after specified duration.
+        The expiry check is deferred so the worker keeps running other tests.
         """
         expected_duration = 5
-        file_name = f"file-{get_current_epoch_time()}.txt"
-        bucket_file_path = sample_file_to_bucket(file_name=file_name)
+        bucket_file_path = sample_file_to_bucket()
         response = self.client.sign_url(
             bucket_file_path=bucket_file_path,
             project=self.project,
@@ -81,18 +70,20 @@ class TestSignUrlCommand:
         url = self._assert_sign_up_url(response=response)
 
         assert_that(url).is_not_empty()
-        time.sleep(expected_duration)
+        verifier = self.signed_url_verifier
+
+        def _check_token_expired():
+            verifier.navigate_to_signed_url(url)
+            verifier.assert_token_expired()
 
-        self.signed_url_page.navigate_to_signed_url(url)
-        self.signed_url_page.assert_token_expired()
+        defer(_check_token_expired, delay=expected_duration)
 
     def test_generate_signed_url_for_bucket_access(self, sample_file_to_bucket):
         """
         Test generation of signed URL for bucket-level access.
         Verifies that signed URL provides access to bucket and its contents.
         """
-        file_name = f"file-{get_current_epoch_time()}.txt"
-        bucket_file_path = sample_file_to_bucket(file_name=file_name)
+        bucket_file_path = sample_file_to_bucket()
 
         response = self.client.sign_url(
             bucket_file_path=f"gs://{self.bucket}",
@@ -102,10 +93,10 @@ class TestSignUrlCommand:
         url = self._assert_sign_up_url(response=response)
 
         assert_that(url).is_not_empty()
-        self.signed_url_page.navigate_to_signed_url(url)
+        self.signed_url_verifier.navigate_to_signed_url(url)
 
         filename = bucket_file_path.split("/")[-1]
-        self.signed_url_page.assert_bucket_and_file_access(self.bucket, filename)
+        self.signed_url_verifier.assert_bucket_and_file_access(self.bucket, filename)
 
     def test_invalid_service_account_returns_error(self, sample_file_to_bucket):
         """
@@ -113,8 +104,7 @@ class TestSignUrlCommand:
         Verifies that appropriate error is returned for malformed account ID.
         """
         random_name = "random-sa"
-        file_name = f"file-{get_current_epoch_time()}.txt"
-        bucket_file_path = sample_file_to_bucket(file_name=file_name)
+        bucket_file_path = sample_file_to_bucket()
 
         response = self.client.sign_url(
             bucket_file_path=bucket_file_path,
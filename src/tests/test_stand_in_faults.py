@@ -0,0 +1,113 @@
+import time
+
+import pytest
+from assertpy import assert_that
+
+from src.gcp_test_client.gcp_client import GcpStorage
+
+STAND_IN_PROJECT = "stand-in-faults"
+STAND_IN_BUCKET = "stand-in-faults-bucket"
+
+
+class TestStandInFaults:
+    """
+    Test cases for faults injected through the stand_in fixture.
+    Commands of the plan fail or slow down as planned; other commands
+    keep working.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_test(self, stand_in, tmp_path):
+        self.stand_in = stand_in
+        local_file = tmp_path / "object.txt"
+        local_file.write_text("stand-in content")
+        GcpStorage.create_gcp_project(STAND_IN_PROJECT)
+        GcpStorage.create_bucket(STAND_IN_BUCKET, STAND_IN_PROJECT)
+        response = GcpStorage.copy_file_to_bucket(
+            str(local_file), STAND_IN_BUCKET, "object.txt"
+        )
+        assert_that(response.status_code).is_equal_to(0)
+        self.object_url = f"gs://{STAND_IN_BUCKET}/object.txt"
+
+    @pytest.mark.stand_in_faults({"storage cat": {"errors": {"503": 1.0}}})
+    def test_injected_error_fails_planned_command(self):
+        """
+        Test an error rate of 1 on 'storage cat'.
+        Verifies that reads fail with the injected HTTP status while
+        commands outside the plan still succeed.
+        """
+        response = GcpStorage.cat_file_from_url(self.object_url)
+
+        assert_that(response.status_code).is_not_equal_to(0)
+        assert_that(response.output).contains("HTTPError 503")
+
+        describe_response = GcpStorage.describe_bucket(f"gs://{STAND_IN_BUCKET}")
+        assert_that(describe_response.status_code).is_equal_to(0)
+
+    @pytest.mark.stand_in_faults(
+        {"storage cat": {"latency": {"distribution": "fixed", "value": 0.5}}}
+    )
+    def test_injected_latency_delays_planned_command(self):
+        """
+        Test a fixed latency on 'storage cat'.
+        Verifies that the read takes at least the injected delay and still
+        returns the object content.
+        """
+        started = time.perf_counter()
+        response = GcpStorage.cat_file_from_url(self.object_url)
+        elapsed = time.perf_counter() - started
+
+        assert_that(response.status_code).is_equal_to(0)
+        assert_that(response.output).is_equal_to("stand-in content")
+        assert_that(elapsed).is_greater_than_or_equal_to(0.5)
+
+    @pytest.mark.stand_in_faults({"storage cat": {"errors": {"429": 0.5}}}, seed=7)
+    def test_seeded_plan_replays_the_same_faults(self):
+        """
+        Test that a seeded plan draws the same faults when replayed.
+        Verifies that re-applying the plan restarts its draws.
+        """
+        plan = {"operations": {"storage cat": {"errors": {"429": 0.5}}}, "seed": 7}
+
+        first = [GcpStorage.cat_file_from_url(self.object_url) for _ in range(8)]
+        self.stand_in.set_faults(plan)
+        second = [GcpStorage.cat_file_from_url(self.object_url) for _ in range(8)]
+
+        outcomes = [response.status_code == 0 for response in first]
+        assert_that([response.status_code == 0 for response in second]).is_equal_to(
+            outcomes
+        )
+        assert_that(outcomes).contains(True, False)
+
+    @pytest.mark.stand_in_faults(
+        {
+            "storage cat": {
+                "stall": {"probability": 1.0, "seconds": 1.5, "within_bytes": 65536}
+            }
+        }
+    )
+    def test_injected_stall_pauses_transfer_midway(self, tmp_path):
+        """
+        Test a stall on 'storage cat' of an object larger than the stall offset.
+        Verifies that the first bytes arrive before the pause and that the
+        whole object still arrives after it.
+        """
+        content = b"x" * (256 * 1024)
+        local_file = tmp_path / "large-object.txt"
+        local_file.write_bytes(content)
+        response = GcpStorage.copy_file_to_bucket(
+            str(local_file), STAND_IN_BUCKET, "large-object.txt"
+        )
+        assert_that(response.status_code).is_equal_to(0)
+
+        started = time.perf_counter()
+        chunks = GcpStorage.stream_file_from_url(
+            f"gs://{STAND_IN_BUCKET}/large-object.txt", chunk_size=1024
+        )
+        received = [next(chunks)]
+        first_chunk_at = time.perf_counter() - started
+        received.extend(chunks)
+        elapsed = time.perf_counter() - started
+
+        assert_that(b"".join(received)).is_equal_to(content)
+        assert_that(elapsed - first_chunk_at).is_greater_than_or_equal_to(1.5)
@@ -0,0 +1,125 @@
+"""
+Drive a weighted GcpStorage operation mix at a target rate.
+
+Usage:
+    python -m src.tools.load_generator --rate 10 --duration 60
+    python -m src.tools.load_generator --stand-in --mix upload=1,read=4 --rate 20
+    python -m src.tools.load_generator --stand-in --faults faults.json --rate 20
+"""
+
+import argparse
+import json
+import sys
+
+from src.gcp_test_client.gcp_client import GcpStorage
+from src.helpers.config_helper import get_settings
+from src.helpers.load_generator import (
+    ARRIVALS,
+    DEFAULT_MIX,
+    UNIFORM,
+    LoadGenerator,
+    StorageOperations,
+    parse_mix,
+)
+from src.stand_in.backend import StandInBackend
+
+STAND_IN_PROJECT = "load-project"
+STAND_IN_BUCKET = "load-bucket"
+
+
+def _run(args, backend=None) -> int:
+    if args.stand_in:
+        GcpStorage.create_gcp_project(STAND_IN_PROJECT)
+        GcpStorage.create_bucket(STAND_IN_BUCKET, STAND_IN_PROJECT)
+    project = args.project or (
+        STAND_IN_PROJECT if args.stand_in else get_settings().default_project
+    )
+    bucket = args.bucket or (
+        STAND_IN_BUCKET if args.stand_in else get_settings().default_bucket
+    )
+    operations = StorageOperations(
+        bucket=bucket,
+        project=project,
+        service_account=args.service_account
+        or f"url-signer@{project}.iam.gserviceaccount.com",
+        region=args.region or get_settings().region or "us-central1",
+        object_size=args.object_size,
+        range_size=args.range_size,
+    )
+    generator = LoadGenerator(
+        operations.as_dict(),
+        parse_mix(args.mix),
+        rate=args.rate,
+        duration=args.duration,
+        workers=args.workers,
+        arrival=args.arrival,
+        seed=args.seed,
+    )
+    try:
+        operations.prefill(args.prefill)
+        if args.faults:
+            # setup and prefill run without faults
+            with open(args.faults) as plan_file:
+                backend.set_faults(json.load(plan_file))
+        report = generator.run()
+    finally:
+        if args.faults:
+            backend.clear_faults()
+        operations.cleanup()
+
+    print(report.format())
+    if args.json:
+        with open(args.json, "w") as report_file:
+            json.dump(report.to_dict(), report_file, indent=2)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help="Weighted operations out of upload, read (range), delete, "
+        f"describe, sign (default: {DEFAULT_MIX}).",
+    )
+    parser.add_argument("--rate", type=float, default=5.0, help="Target ops/sec.")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds.")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--arrival", choices=ARRIVALS, default=UNIFORM)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--object-size", type=int, default=64 * 1024)
+    parser.add_argument("--range-size", type=int, default=4096)
+    parser.add_argument(
+        "--prefill", type=int, default=10, help="Objects uploaded before the run."
+    )
+    parser.add_argument("--project", help="Defaults to default_project.")
+    parser.add_argument("--bucket", help="Defaults to default_bucket.")
+    parser.add_argument("--service-account", help="Defaults to url-signer@project.")
+    parser.add_argument("--region", help="Defaults to region.")
+    parser.add_argument(
+        "--stand-in",
+        action="store_true",
+        help="Run against the local gcloud stand-in instead of GCS.",
+    )
+    parser.add_argument(
+        "--faults",
+        metavar="PATH",
+        help="Stand-in fault plan (JSON, see src.stand_in.faults).",
+    )
+    parser.add_argument("--json", metavar="PATH", help="Write the report as JSON.")
+    args = parser.parse_args(argv)
+    if args.faults and not args.stand_in:
+        parser.error("--faults requires --stand-in")
+
+    if not args.stand_in:
+        return _run(args)
+    backend = StandInBackend()
+    try:
+        with backend.activate():
+            return _run(args, backend)
+    finally:
+        backend.cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
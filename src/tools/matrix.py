@@ -0,0 +1,312 @@
+"""
+Run the suite against several project/bucket/region targets concurrently.
+
+Usage:
+    python -m src.tools.matrix \\
+        --target default_project=p1,default_bucket=b1,region=us-east1 \\
+        --target default_project=p2,default_bucket=b2,region=europe-west1 \\
+        -- src/tests -n 4
+    python -m src.tools.matrix --targets targets.json --out .matrix
+
+Each target is a separate pytest session with its settings passed as
+--setting overrides, so preconditions, session fixtures and temp files are
+isolated per target. Pass/fail results come back through JUnit XML and gcloud
+latency through --command-metrics-json; both are combined into one report.
+Without --target/--targets, the matrix_targets list of config.json is used.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.helpers.config_helper import get_settings, parse_overrides
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_OUT_DIR = ".matrix"
+DEFAULT_PYTEST_ARGS = ["src/tests"]
+OUTCOMES = ("passed", "failed", "skipped", "error")
+
+
+@dataclass
+class Target:
+    """
+    One project/bucket/region combination and its setting overrides.
+    """
+
+    name: str
+    settings: Dict[str, str]
+
+    @classmethod
+    def from_dict(cls, data: dict, index: int = 0) -> "Target":
+        settings = {key: str(value) for key, value in data.items() if key != "name"}
+        name = data.get("name") or "-".join(
+            filter(None, [settings.get("default_project"), settings.get("region")])
+        )
+        return cls(name=name or f"target-{index}", settings=settings)
+
+
+@dataclass
+class TargetResult:
+    """
+    Outcome of one target's session: exit code, per-test outcomes and
+    per-command latency statistics.
+    """
+
+    name: str
+    settings: Dict[str, str]
+    exit_code: int
+    duration: float
+    outcomes: Dict[str, str] = field(default_factory=dict)
+    commands: List[dict] = field(default_factory=list)
+
+    def count(self, outcome: str) -> int:
+        return sum(1 for value in self.outcomes.values() if value == outcome)
+
+
+def parse_target(value: str) -> dict:
+    """A --target value: comma-separated KEY=VALUE settings."""
+    return parse_overrides(item for item in value.split(",") if item)
+
+
+def load_targets(path: str) -> List[dict]:
+    with open(path) as targets_file:
+        return json.load(targets_file)
+
+
+def effective_setting(target: Target, key: str):
+    """A target's value of `key`, falling back to config.json."""
+    return target.settings.get(key) or get_settings().get(key)
+
+
+def validate_targets(targets: List[Target]) -> None:
+    """
+    Reject targets that would share state: names (output directories) and
+    sample buckets, whose objects every session removes when it ends.
+    """
+    if not targets:
+        raise ValueError("No targets given")
+    names = [target.name for target in targets]
+    buckets = [effective_setting(target, "default_bucket") for target in targets]
+    for key, values in (("name", names), ("default_bucket", buckets)):
+        duplicates = {str(value) for value in values if values.count(value) > 1}
+        if duplicates:
+            raise ValueError(f"Targets share {key}: {', '.join(sorted(duplicates))}")
+
+
+def read_junit(path: str) -> Dict[str, str]:
+    """{test id: outcome} of a JUnit XML report."""
+    outcomes = {}
+    for case in ElementTree.parse(path).iter("testcase"):
+        test_id = f"{case.get('classname')}::{case.get('name')}"
+        outcome = "passed"
+        for child in case:
+            if child.tag in ("failure", "error"):
+                outcome = "failed" if child.tag == "failure" else "error"
+                break
+            if child.tag == "skipped":
+                outcome = "skipped"
+        outcomes[test_id] = outcome
+    return outcomes
+
+
+def _pytest_command(
+    target: Target, pytest_args: List[str], target_dir: Path, shared_project: bool
+) -> List[str]:
+    settings = dict(target.settings)
+    settings["temp_dir"] = str(target_dir / "temp")
+    if shared_project:
+        settings["cleanup_test_buckets"] = "false"
+    cmd = [sys.executable, "-m", "pytest", *pytest_args]
+    for key, value in settings.items():
+        cmd += ["--setting", f"{key}={value}"]
+    cmd += [
+        f"--junitxml={target_dir / 'junit.xml'}",
+        f"--command-metrics-json={target_dir / 'commands.json'}",
+    ]
+    return cmd
+
+
+def run_target(
+    target: Target, pytest_args: List[str], out_dir: Path, shared_project: bool
+) -> TargetResult:
+    """Run one target's session, logging its output to <out>/<name>/pytest.log."""
+    target_dir = out_dir / target.name
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for stale in ("junit.xml", "commands.json"):
+        (target_dir / stale).unlink(missing_ok=True)
+    cmd = _pytest_command(target, pytest_args, target_dir, shared_project)
+    started = time.perf_counter()
+    with open(target_dir / "pytest.log", "w") as log_file:
+        exit_code = subprocess.run(
+            cmd, cwd=PROJECT_ROOT, stdout=log_file, stderr=subprocess.STDOUT
+        ).returncode
+    result = TargetResult(
+        name=target.name,
+        settings=target.settings,
+        exit_code=exit_code,
+        duration=time.perf_counter() - started,
+    )
+    if (target_dir / "junit.xml").exists():
+        result.outcomes = read_junit(str(target_dir / "junit.xml"))
+    if (target_dir / "commands.json").exists():
+        with open(target_dir / "commands.json") as metrics_file:
+            result.commands = json.load(metrics_file)["commands"]
+    return result
+
+
+def run_matrix(
+    targets: List[Target],
+    pytest_args: List[str],
+    out_dir: Path,
+    max_parallel: Optional[int] = None,
+) -> List[TargetResult]:
+    """
+    Run all targets concurrently. Projects shared by several targets have
+    their test buckets cleaned once, after every target finished.
+    """
+    validate_targets(targets)
+    projects = [effective_setting(target, "default_project") for target in targets]
+    shared = {project for project in projects if projects.count(project) > 1}
+    with ThreadPoolExecutor(max_parallel or len(targets)) as pool:
+        results = list(
+            pool.map(
+                lambda target: run_target(
+                    target,
+                    pytest_args,
+                    out_dir,
+                    effective_setting(target, "default_project") in shared,
+                ),
+                targets,
+            )
+        )
+    if shared:
+        from src.fixtures.gsp_fixture import cleanup_buckets_after_test
+        from src.gcp_test_client.gcp_client import GcpStorage
+
+        for project in sorted(shared):
+            cleanup_buckets_after_test(GcpStorage(), project)
+    return results
+
+
+def differing_outcomes(results: List[TargetResult]) -> Dict[str, Dict[str, str]]:
+    """Tests whose outcome is not the same on every target."""
+    test_ids = sorted({test_id for result in results for test_id in result.outcomes})
+    rows = {}
+    for test_id in test_ids:
+        per_target = {
+            result.name: result.outcomes.get(test_id, "missing") for result in results
+        }
+        if len(set(per_target.values())) > 1:
+            rows[test_id] = per_target
+    return rows
+
+
+def format_report(results: List[TargetResult]) -> str:
+    width = max(len("target"), *(len(result.name) for result in results))
+    lines = [
+        f"{'target':<{width}} {'exit':>4} "
+        + " ".join(f"{outcome:>7}" for outcome in OUTCOMES)
+        + f" {'duration':>9}"
+    ]
+    for result in results:
+        lines.append(
+            f"{result.name:<{width}} {result.exit_code:>4} "
+            + " ".join(f"{result.count(outcome):>7}" for outcome in OUTCOMES)
+            + f" {result.duration:>8.1f}s"
+        )
+
+    differing = differing_outcomes(results)
+    if differing:
+        lines.append("")
+        lines.append("tests with differing outcomes:")
+        for test_id, per_target in differing.items():
+            lines.append(f"  {test_id}")
+            cells = [f"{name}={value}" for name, value in per_target.items()]
+            lines.append("    " + ", ".join(cells))
+
+    p95 = {
+        result.name: {row["label"]: row["p95"] for row in result.commands}
+        for result in results
+    }
+    labels = sorted({label for by_label in p95.values() for label in by_label})
+    if labels:
+        lines.append("")
+        lines.append("gcloud command p95 (ms):")
+        label_width = max(len(label) for label in labels)
+        widths = {result.name: max(len(result.name), 7) for result in results}
+        header = [f"{name:>{width}}" for name, width in widths.items()]
+        lines.append(f"  {'command':<{label_width}} " + " ".join(header))
+        for label in labels:
+            cells = []
+            for name, width in widths.items():
+                value = p95[name].get(label)
+                cell = f"{value * 1000:.0f}" if value is not None else "-"
+                cells.append(f"{cell:>{width}}")
+            lines.append(f"  {label:<{label_width}} " + " ".join(cells))
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--target",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE,...",
+        help="Settings of one target, e.g. "
+        "name=east,default_project=p1,default_bucket=b1,region=us-east1.",
+    )
+    parser.add_argument(
+        "--targets", metavar="FILE", help="JSON list of target setting objects."
+    )
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR, help="Output directory.")
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=None,
+        help="Targets running at once (all of them by default).",
+    )
+    parser.add_argument(
+        "pytest_args",
+        nargs=argparse.REMAINDER,
+        help=f"Arguments for every pytest session after '--' "
+        f"(default: {' '.join(DEFAULT_PYTEST_ARGS)}).",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        target_data = [parse_target(value) for value in args.target]
+        if args.targets:
+            target_data += load_targets(args.targets)
+        if not target_data:
+            target_data = list(get_settings().get("matrix_targets", []))
+        targets = [Target.from_dict(data, i) for i, data in enumerate(target_data)]
+        validate_targets(targets)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    pytest_args = args.pytest_args
+    if pytest_args[:1] == ["--"]:
+        pytest_args = pytest_args[1:]
+    out_dir = Path(args.out).resolve()
+    results = run_matrix(
+        targets, pytest_args or DEFAULT_PYTEST_ARGS, out_dir, args.max_parallel
+    )
+
+    print(format_report(results))
+    with open(out_dir / "matrix.json", "w") as report_file:
+        json.dump([asdict(result) for result in results], report_file, indent=2)
+    print(f"\nLogs and reports: {out_dir}{os.sep}<target>")
+    return 0 if all(result.exit_code == 0 for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
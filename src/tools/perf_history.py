@@ -0,0 +1,74 @@
+"""
+Inspect the performance history store and flag regressions.
+
+Usage:
+    python -m src.tools.perf_history runs
+    python -m src.tools.perf_history compare --threshold 0.2 --fail
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from src.helpers.perf_store import (
+    DEFAULT_ALPHA,
+    DEFAULT_BASELINE_RUNS,
+    DEFAULT_STORE_PATH,
+    DEFAULT_THRESHOLD,
+    PerfStore,
+)
+
+
+def _list_runs(store: PerfStore, args) -> int:
+    for run in store.runs(limit=args.limit):
+        started = datetime.fromtimestamp(run.started).isoformat(timespec="seconds")
+        print(
+            f"{run.id:>5}  {started}  {(run.git_commit or '-')[:12]:<12}  "
+            f"gcloud {run.gcloud_version or '-':<10}  {run.project}/{run.region}"
+        )
+    return 0
+
+
+def _compare(store: PerfStore, args) -> int:
+    regressions = store.find_regressions(
+        run_id=args.run,
+        baseline_count=args.baseline_runs,
+        threshold=args.threshold,
+        alpha=args.alpha,
+    )
+    if not regressions:
+        print("No significant slowdowns.")
+        return 0
+    for regression in regressions:
+        print(regression)
+    return 1 if args.fail else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runs = commands.add_parser("runs", help="List stored runs, newest first.")
+    runs.add_argument("--limit", type=int, default=20)
+    runs.set_defaults(handler=_list_runs)
+
+    compare = commands.add_parser(
+        "compare", help="Compare a run with its rolling baseline."
+    )
+    compare.add_argument("--run", type=int, default=None, help="Run id (latest).")
+    compare.add_argument("--baseline-runs", type=int, default=DEFAULT_BASELINE_RUNS)
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare.add_argument("--alpha", type=float, default=DEFAULT_ALPHA)
+    compare.add_argument(
+        "--fail", action="store_true", help="Exit with 1 when slowdowns are found."
+    )
+    compare.set_defaults(handler=_compare)
+
+    args = parser.parse_args(argv)
+    with PerfStore(args.store) as store:
+        return args.handler(store, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
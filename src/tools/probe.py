@@ -0,0 +1,147 @@
+"""
+Run storage canaries on a schedule and serve their metrics to Prometheus.
+
+Usage:
+    python -m src.tools.probe --interval 60 --port 9108
+    python -m src.tools.probe --stand-in --once
+"""
+
+import argparse
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import urllib3
+
+from src.gcp_test_client.gcp_client import GcpStorage
+from src.helpers.config_helper import get_settings
+from src.helpers.large_object_generator import SeededObject
+from src.helpers.synthetic_probe import (
+    CONTENT_TYPE,
+    FAILURE,
+    ProbeMetrics,
+    SyntheticProbe,
+)
+from src.stand_in.backend import StandInBackend
+
+STAND_IN_PROJECT = "probe-project"
+STAND_IN_BUCKET = "probe-bucket"
+
+
+def _metrics_handler(metrics: ProbeMetrics):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def _log_failures(results) -> None:
+    for result in results:
+        if result.result == FAILURE:
+            stamp = datetime.fromtimestamp(result.finished)
+            print(
+                f"{stamp:%Y-%m-%dT%H:%M:%S} {result.canary} failed: {result.error}",
+                file=sys.stderr,
+            )
+
+
+def _run(args) -> int:
+    if args.stand_in:
+        GcpStorage.create_gcp_project(STAND_IN_PROJECT)
+        GcpStorage.create_bucket(STAND_IN_BUCKET, STAND_IN_PROJECT)
+    project = args.project or (
+        STAND_IN_PROJECT if args.stand_in else get_settings().default_project
+    )
+    metrics = ProbeMetrics(window=args.window)
+    probe = SyntheticProbe(
+        bucket=args.bucket
+        or (STAND_IN_BUCKET if args.stand_in else get_settings().default_bucket),
+        project=project,
+        service_account=args.service_account
+        or f"url-signer@{project}.iam.gserviceaccount.com",
+        region=args.region or get_settings().region or "us-central1",
+        metrics=metrics,
+        payload=SeededObject(args.object_size, seed=args.seed),
+        http=urllib3.PoolManager(),
+        # stand-in signed URLs are not served over HTTP
+        fetch_signed_url=not args.stand_in,
+    )
+    try:
+        if args.once:
+            _log_failures(probe.run_cycle())
+            print(metrics.render(), end="")
+            return 0
+
+        server = ThreadingHTTPServer((args.host, args.port), _metrics_handler(metrics))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"Serving metrics on http://{args.host}:{args.port}/metrics")
+
+        stopping = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+        try:
+            while not stopping.is_set():
+                started = time.monotonic()
+                _log_failures(probe.run_cycle())
+                stopping.wait(max(args.interval - (time.monotonic() - started), 0))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+        return 0
+    finally:
+        probe.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--interval", type=float, default=60.0, help="Seconds between cycles."
+    )
+    parser.add_argument(
+        "--window", type=float, default=600.0, help="Rolling metrics window, s."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9108)
+    parser.add_argument("--object-size", type=int, default=16 * 1024)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--project", help="Defaults to default_project.")
+    parser.add_argument("--bucket", help="Defaults to default_bucket.")
+    parser.add_argument("--service-account", help="Defaults to url-signer@project.")
+    parser.add_argument("--region", help="Defaults to region.")
+    parser.add_argument(
+        "--once", action="store_true", help="Run one cycle and print the metrics."
+    )
+    parser.add_argument(
+        "--stand-in",
+        action="store_true",
+        help="Run against the local gcloud stand-in instead of GCS.",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.stand_in:
+        return _run(args)
+    backend = StandInBackend()
+    try:
+        with backend.activate():
+            return _run(args)
+    finally:
+        backend.cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(main())